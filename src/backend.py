@@ -0,0 +1,50 @@
+import numpy as np
+
+from board import Board
+from bitboard import BitBoard
+from geometry import GEOMETRY
+
+"""
+    The board backends.
+    The NumPy Board and the BitBoard share the same public API, so the
+    game and the search can pick either of them by name, for any geometry:
+    the width, the height and the number of discs in a row that wins.
+"""
+BACKENDS : dict[str, type] = {
+    "numpy": Board,
+    "bitboard": BitBoard,
+}
+
+"""
+    Gets the board class of a backend.
+    @param backend: the name of the backend.
+    @param geometry: the width, the height and the connect length of the board.
+    @return: the board class.
+    @raises ValueError: if the backend doesn't exist or the geometry can't be played.
+"""
+def get_board_class(backend: str, geometry: tuple[int, int, int] = GEOMETRY) -> type:
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}")
+    return BACKENDS[backend].with_geometry(*geometry)
+
+"""
+    Creates an empty board.
+    @param backend: the name of the backend.
+    @param player_disc: the player's disc.
+    @param computer_disc: the computer's disc.
+    @param geometry: the width, the height and the connect length of the board.
+    @return: the empty board.
+"""
+def create_board(backend: str, player_disc: int, computer_disc: int, geometry: tuple[int, int, int] = GEOMETRY):
+    board_class = get_board_class(backend, geometry)
+    return board_class(np.zeros((board_class.HEIGHT, board_class.WIDTH), dtype=np.uint8), player_disc, computer_disc)
+
+"""
+    Converts a board to another backend, with the same geometry.
+    @param board: the board to convert.
+    @param backend: the name of the backend.
+    @return: a new board with the same discs.
+"""
+def convert_board(board, backend: str):
+    board_class = get_board_class(backend, (board.WIDTH, board.HEIGHT, board.CONNECT))
+    return board_class(np.array(board.board, dtype=np.uint8), board.player_disc, board.computer_disc)
@@ -0,0 +1,176 @@
+import os
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from backend import get_board_class
+from encoding import disc_to_move, load_keys
+from geometry import GEOMETRY
+from minimax import MiniMax
+from transposition import TranspositionTable
+from workers import preload_backend, worker_context
+
+"""
+    Analysis of many positions at once.
+
+    A position is either a move string, the columns played from the empty board
+    such as "3342" with the first disc playing first, a 6x7 array of discs such
+    as a slice of an (N, 6, 7) stack, a key such as an item of a uint64 array,
+    or the packed bytes of a board. The side to move of a position that isn't
+    a move string is the first disc if both discs have the same count, the
+    other disc otherwise. The positions of a batch share one geometry, the
+    standard 7x6 board with four in a row unless another one is given.
+
+    A file of keys is analysed without sending the keys to the workers: each
+    worker memory-maps the file and only gets the bounds of its chunks.
+"""
+
+# The settings of a worker process, made once by init_worker.
+worker_minimax : MiniMax = None
+worker_settings : dict = None
+# The keys of the file analysed by a worker process.
+worker_keys : np.array = None
+
+"""
+    Sets up the MiniMax of a worker process, or of this process without workers.
+    @param player_disc: the player's disc.
+    @param computer_disc: the computer's disc.
+    @param backend: the backend the positions are searched on.
+    @param depth: the depth of the search.
+    @param first_disc: the disc that plays first.
+    @param table_size: the number of slots of the transposition table, None for no table.
+    @param geometry: the width, the height and the connect length of the boards.
+"""
+def init_worker(player_disc: int, computer_disc: int, backend: str, depth: int, first_disc: int, table_size: int,
+                geometry: tuple[int, int, int] = GEOMETRY) -> None:
+    global worker_minimax, worker_settings
+    table = TranspositionTable(table_size) if table_size is not None else None
+    worker_minimax = MiniMax(player_disc, computer_disc, backend, table, geometry=geometry)
+    worker_settings = {"backend": backend, "depth": depth, "first_disc": first_disc, "geometry": geometry}
+
+"""
+    Builds the board of a position.
+    @param position: the move string, the array of discs, the key or the packed bytes.
+    @param player_disc: the player's disc.
+    @param computer_disc: the computer's disc.
+    @param backend: the backend of the board.
+    @param first_disc: the disc that plays first.
+    @param geometry: the width, the height and the connect length of the board.
+    @return: the board and the disc to move.
+    @raises ValueError: if a move of the string isn't valid or the bytes aren't a board.
+"""
+def parse_position(position, player_disc: int, computer_disc: int, backend: str, first_disc: int, geometry: tuple[int, int, int] = GEOMETRY):
+    board_class = get_board_class(backend, geometry)
+    if isinstance(position, str):
+        return board_class.from_moves(position, player_disc, computer_disc, first_disc)
+    if isinstance(position, (int, np.integer)):
+        board = board_class.from_key(int(position), player_disc, computer_disc)
+    elif isinstance(position, bytes):
+        board = board_class.from_bytes(position, player_disc, computer_disc)
+    else:
+        board = board_class(np.asarray(position, dtype=np.uint8), player_disc, computer_disc)
+    return board, disc_to_move(board.board, first_disc)
+
+"""
+    Analyses one position with the MiniMax of this process.
+    @param position: the move string or the array of discs.
+    @return: the best move and the score.
+"""
+def analyse_position(position) -> tuple[int, int]:
+    board, disc = parse_position(position, worker_minimax.player_disc, worker_minimax.computer_disc, worker_settings["backend"],
+                                 worker_settings["first_disc"], worker_settings["geometry"])
+    # The result doesn't depend on the positions the worker analysed before
+    worker_minimax.clear_history()
+    return worker_minimax.mini_max(board, -float('inf'), float('inf'), worker_settings["depth"], disc)
+
+"""
+    Analyses positions as they come and yields the results in the same order.
+    The positions are sent to the workers in chunks, so the call overhead is
+    paid per chunk rather than per position.
+    @param positions: the move strings or arrays of discs, any iterable.
+    @param depth: the depth of the search.
+    @param workers: the number of worker processes, 1 analyses in this process.
+    @param player_disc: the player's disc.
+    @param computer_disc: the computer's disc.
+    @param backend: the backend the positions are searched on.
+    @param first_disc: the disc that plays first.
+    @param chunksize: the number of positions sent to a worker at once.
+    @param table_size: the number of slots of the table of each worker, None for no table.
+    @param geometry: the width, the height and the connect length of the boards.
+    @return: the best move and the score of each position.
+"""
+def iter_analysis(positions: Iterable, depth: int, workers: int = None, player_disc: int = 1, computer_disc: int = 2,
+                  backend: str = "bitboard", first_disc: int = 1, chunksize: int = 16, table_size: int = None,
+                  geometry: tuple[int, int, int] = GEOMETRY) -> Iterator[tuple[int, int]]:
+    workers = workers or os.cpu_count() or 1
+    settings = (player_disc, computer_disc, backend, depth, first_disc, table_size, geometry)
+    if workers == 1:
+        init_worker(*settings)
+        for position in positions:
+            yield analyse_position(position)
+        return
+    preload_backend(backend)
+    with worker_context().Pool(workers, initializer=init_worker, initargs=settings) as pool:
+        yield from pool.imap(analyse_position, positions, chunksize)
+
+"""
+    Sets up a worker process that analyses a file of keys.
+    @param path: the .npy file of keys.
+    @param settings: the settings of init_worker.
+"""
+def init_file_worker(path: str, *settings) -> None:
+    global worker_keys
+    init_worker(*settings)
+    worker_keys = load_keys(path)
+
+"""
+    Analyses a chunk of the keys of the file of this process.
+    @param bounds: the first and the end index of the chunk.
+    @return: the best move and the score of each position of the chunk.
+"""
+def analyse_keys(bounds: tuple[int, int]) -> list[tuple[int, int]]:
+    start, end = bounds
+    return [analyse_position(int(key)) for key in worker_keys[start:end]]
+
+"""
+    Analyses a file of keys, saved by encoding.save_keys, and yields the
+    results in the same order. The workers memory-map the file, so only
+    the bounds of each chunk are sent to them.
+    @param path: the .npy file of keys.
+    @param depth: the depth of the search.
+    @param workers: the number of worker processes, 1 analyses in this process.
+    @param player_disc: the player's disc.
+    @param computer_disc: the computer's disc.
+    @param backend: the backend the positions are searched on.
+    @param first_disc: the disc that plays first.
+    @param chunksize: the number of positions of a chunk.
+    @param table_size: the number of slots of the table of each worker, None for no table.
+    @param geometry: the width, the height and the connect length of the boards.
+    @return: the best move and the score of each position.
+"""
+def iter_file_analysis(path: str, depth: int, workers: int = None, player_disc: int = 1, computer_disc: int = 2,
+                       backend: str = "bitboard", first_disc: int = 1, chunksize: int = 16, table_size: int = None,
+                       geometry: tuple[int, int, int] = GEOMETRY) -> Iterator[tuple[int, int]]:
+    workers = workers or os.cpu_count() or 1
+    settings = (player_disc, computer_disc, backend, depth, first_disc, table_size, geometry)
+    count = len(load_keys(path))
+    chunks = [(start, min(start + chunksize, count)) for start in range(0, count, chunksize)]
+    if workers == 1:
+        init_file_worker(path, *settings)
+        for bounds in chunks:
+            yield from analyse_keys(bounds)
+        return
+    preload_backend(backend)
+    with worker_context().Pool(workers, initializer=init_file_worker, initargs=(path,) + settings) as pool:
+        for results in pool.imap(analyse_keys, chunks):
+            yield from results
+
+"""
+    Analyses positions and returns all the results.
+    @param positions: the move strings or arrays of discs, such as an (N, 6, 7) stack.
+    @param depth: the depth of the search.
+    @param workers: the number of worker processes, 1 analyses in this process.
+    @return: the best move and the score of each position.
+"""
+def analyse_batch(positions: Iterable, depth: int, workers: int = None, **options) -> list[tuple[int, int]]:
+    return list(iter_analysis(positions, depth, workers, **options))
@@ -0,0 +1,516 @@
+import numpy as np
+
+from encoding import grid_from_key, grid_from_bytes, grid_to_bytes, grid_to_moves, play_moves
+from geometry import build_weights, geometry_class, new_board, weights_class
+
+"""
+    Builds the masks of every window of a given length on the bitboard.
+    Each column uses HEIGHT + 1 bits, the extra bit keeps the columns apart
+    so shifting a mask never wraps into the next column.
+    @param length: the number of cells in the window.
+    @param width: the width of the board.
+    @param height: the height of the board.
+    @param weight_id: if given, each mask is paired with the index of its weight.
+    @return: the masks of the windows.
+"""
+def build_windows(length: int, width: int, height: int, weight_id: int = None) -> list:
+    windows = []
+    for d_col, d_row in [(1, 0), (0, 1), (1, 1), (1, -1)]:
+        for col in range(width):
+            for row in range(height):
+                end_col = col + d_col * (length - 1)
+                end_row = row + d_row * (length - 1)
+                if end_col >= width or end_row < 0 or end_row >= height:
+                    continue
+                mask = 0
+                for i in range(length):
+                    mask |= 1 << ((col + d_col * i) * (height + 1) + row + d_row * i)
+                windows.append(mask if weight_id is None else (mask, weight_id))
+    return windows
+
+"""
+    Groups the windows by the bits they cover.
+    @param windows: the masks of the windows.
+    @param bits: the number of bits of the board.
+    @return: the windows through each bit.
+"""
+def build_cell_windows(windows: list[int], bits: int) -> list[list[int]]:
+    return [[mask for mask in windows if mask >> bit & 1] for bit in range(bits)]
+
+"""
+    Groups the scoring windows by the bits they cover.
+    @param windows: the masks of the windows with the index of their weight.
+    @param bits: the number of bits of the board.
+    @return: the index and the weight index of the windows through each bit.
+"""
+def build_cell_score_windows(windows: list[tuple[int, int]], bits: int) -> list[list[tuple[int, int]]]:
+    return [[(index, id) for index, (mask, id) in enumerate(windows) if mask >> bit & 1] for bit in range(bits)]
+
+"""
+    Gets the empty cells where a disc would complete a line of any length.
+    @param position: the mask of the discs.
+    @param mask: the mask of all discs.
+    @param h1: the number of bits of a column.
+    @param board_mask: the mask of every cell of the board.
+    @param connect: the number of discs in a row that wins.
+    @return: the mask of the cells.
+"""
+def connect_cells(position: int, mask: int, h1: int, board_mask: int, connect: int) -> int:
+    # Vertical, the discs right below the cell
+    cells = position << 1
+    for i in range(2, connect):
+        cells &= position << i
+    # Horizontal and both diagonals, with the empty cell at each place of the line:
+    # the cells with i discs in a row on one side and connect - 1 - i on the other
+    for shift in [h1, h1 - 1, h1 + 1]:
+        before, after = [-1], [-1]
+        for i in range(1, connect):
+            before.append(before[-1] & (position << i * shift))
+            after.append(after[-1] & (position >> i * shift))
+        for i in range(connect):
+            cells |= before[i] & after[connect - 1 - i]
+    return cells & (board_mask ^ mask)
+
+"""
+    Gets the empty cells where a disc would complete four in a row, unrolled
+    as the search calls it at each node, or a line of another length.
+    @param position: the mask of the discs.
+    @param mask: the mask of all discs.
+    @param h1: the number of bits of a column.
+    @param board_mask: the mask of every cell of the board.
+    @param connect: the number of discs in a row that wins.
+    @return: the mask of the cells.
+"""
+def winning_cells(position: int, mask: int, h1: int, board_mask: int, connect: int = 4) -> int:
+    if connect != 4:
+        return connect_cells(position, mask, h1, board_mask, connect)
+    # Vertical
+    cells = (position << 1) & (position << 2) & (position << 3)
+    # Horizontal and both diagonals, with the empty cell at each place of the line
+    for shift in [h1, h1 - 1, h1 + 1]:
+        pair = (position << shift) & (position << 2 * shift)
+        cells |= pair & (position << 3 * shift)
+        cells |= pair & (position >> shift)
+        pair = (position >> shift) & (position >> 2 * shift)
+        cells |= pair & (position << shift)
+        cells |= pair & (position >> 3 * shift)
+    return cells & (board_mask ^ mask)
+
+"""
+    The BitBoard class.
+    The class is a drop-in alternative to the NumPy Board. Each disc is stored
+    as a bit in one integer mask per disc, and the height of each column is
+    kept so dropping and removing a disc are O(1) integer operations.
+    The board also keeps the number of discs of each type in every scoring
+    window and the running score, which are updated on each drop and undo
+    through the windows of the cell, so evaluating the board is a read.
+    Column c is stored in bits c * (HEIGHT + 1) to c * (HEIGHT + 1) + HEIGHT - 1,
+    starting from the bottom row.
+
+    The class is the standard 7x6 board with four in a row, with_geometry
+    gets the class of another size or connect length, see geometry.py.
+    The state of a board is kept in slots, with no dictionary per board.
+"""
+class BitBoard:
+
+    __slots__ = ("player_disc", "computer_disc", "discs", "mirror_discs", "heights", "moves", "counts", "score")
+
+    # Dimensions of the board and the number of discs in a row that wins.
+    WIDTH : int = 7
+    HEIGHT : int = 6
+    CONNECT : int = 4
+
+    # The tables of the geometry, built by build_tables.
+    # Weights for the score.
+    weights : list[int]
+    H1 : int
+
+    # Masks of the cells of a column, of the bottom row and of every cell of the board.
+    column_bits : int
+    bottom_mask : int
+    board_mask : int
+
+    # Shifts to the next cell vertically, diagonally down, horizontally and diagonally up.
+    shifts : list[int]
+
+    # Windows of 2 to CONNECT cells with the index of their weight.
+    score_windows : list[tuple[int, int]]
+    winning_windows : list[int]
+    # The winning windows through each bit of the board.
+    cell_windows : list[list[int]]
+    cell_score_windows : list[list[tuple[int, int]]]
+
+    # Player's disc and computer's disc.
+    player_disc: int
+    computer_disc: int
+
+    # Mask of the discs indexed by the disc, the same masks with the columns
+    # mirrored around the middle column, and the number of discs in each column.
+    discs: list[int]
+    mirror_discs: list[int]
+    heights: list[int]
+    moves: int
+
+    # Number of discs in each scoring window indexed by the disc, and the running score.
+    counts: list[list[int]]
+    score: int
+
+    def __init__(self, board: np.array, player_disc: int, computer_disc: int):
+        self.player_disc = player_disc
+        self.computer_disc = computer_disc
+        self.discs = [0, 0, 0]
+        self.mirror_discs = [0, 0, 0]
+        self.heights = [0] * self.WIDTH
+        self.moves = 0
+        self.counts = [None, [0] * len(self.score_windows), [0] * len(self.score_windows)]
+        self.score = 0
+        if board is not None:
+            # The rows of the array go from the top to the bottom of the board.
+            for row in range(self.HEIGHT - 1, -1, -1):
+                for column in range(self.WIDTH):
+                    disc = int(board[row][column])
+                    if disc != 0:
+                        self.drop_disc(column, disc)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Only a subclass of another geometry has other tables
+        if any(name in cls.__dict__ for name in ["WIDTH", "HEIGHT", "CONNECT"]):
+            cls.build_tables()
+
+    def __reduce__(self):
+        # The state of the slots, set back by pickle one attribute at a time
+        state = {name: getattr(self, name) for name in BitBoard.__slots__}
+        return new_board, (BitBoard, self.WIDTH, self.HEIGHT, self.CONNECT, self.weights), (None, state)
+
+    """
+        Builds the tables of the geometry of the class.
+    """
+    @classmethod
+    def build_tables(cls) -> None:
+        cls.weights = build_weights(cls.CONNECT)
+        cls.H1 = cls.HEIGHT + 1
+        cls.column_bits = (1 << cls.HEIGHT) - 1
+        cls.bottom_mask = int("1".rjust(cls.H1, "0") * cls.WIDTH, 2)
+        cls.board_mask = cls.bottom_mask * cls.column_bits
+        cls.shifts = [1, cls.H1 - 1, cls.H1, cls.H1 + 1]
+        cls.score_windows = [window for length in range(2, cls.CONNECT + 1) for window in build_windows(length, cls.WIDTH, cls.HEIGHT, length - 2)]
+        cls.winning_windows = build_windows(cls.CONNECT, cls.WIDTH, cls.HEIGHT)
+        cls.cell_windows = build_cell_windows(cls.winning_windows, cls.WIDTH * cls.H1)
+        cls.cell_score_windows = build_cell_score_windows(cls.score_windows, cls.WIDTH * cls.H1)
+
+    """
+        Gets the board class of a geometry, see geometry.py.
+        @param width: the width of the board.
+        @param height: the height of the board.
+        @param connect: the number of discs in a row that wins.
+        @return: the board class.
+        @raises ValueError: if the geometry can't be played.
+    """
+    @staticmethod
+    def with_geometry(width: int, height: int, connect: int = 4) -> type:
+        return geometry_class(BitBoard, width, height, connect)
+
+    """
+        Gets the board class of this geometry with other weights, see geometry.py.
+        @param weights: the weight of each length of window, from 2 discs to CONNECT.
+        @return: the board class.
+        @raises ValueError: if there isn't one weight for each length of window.
+    """
+    @classmethod
+    def with_weights(cls, weights: list[int]) -> type:
+        return weights_class(cls, weights)
+
+    """
+        Gets the board as an array, the same layout as the NumPy Board.
+        @return: the board.
+    """
+    @property
+    def board(self) -> np.array:
+        board = np.zeros((self.HEIGHT, self.WIDTH), dtype=np.uint8)
+        for column in range(self.WIDTH):
+            for row in range(self.heights[column]):
+                bit = 1 << (column * self.H1 + row)
+                board[self.HEIGHT - 1 - row][column] = 1 if self.discs[1] & bit else 2
+        return board
+
+    """
+        Copies the board.
+        @return: a new board with the same discs.
+    """
+    def copy(self) -> "BitBoard":
+        board = self.__class__.__new__(self.__class__)
+        board.player_disc = self.player_disc
+        board.computer_disc = self.computer_disc
+        board.discs = self.discs.copy()
+        board.mirror_discs = self.mirror_discs.copy()
+        board.heights = self.heights.copy()
+        board.moves = self.moves
+        board.counts = [None, self.counts[1].copy(), self.counts[2].copy()]
+        board.score = self.score
+        return board
+
+    """
+        Makes a board from its key.
+        @param key: the key of the position.
+        @param player_disc: the player's disc.
+        @param computer_disc: the computer's disc.
+        @return: the board.
+    """
+    @classmethod
+    def from_key(cls, key: int, player_disc: int, computer_disc: int) -> "BitBoard":
+        return cls(grid_from_key(key, cls.WIDTH, cls.HEIGHT), player_disc, computer_disc)
+
+    """
+        Makes a board from its packed bytes.
+        @param data: the bytes of to_bytes.
+        @param player_disc: the player's disc.
+        @param computer_disc: the computer's disc.
+        @return: the board.
+        @raises ValueError: if the bytes aren't a board.
+    """
+    @classmethod
+    def from_bytes(cls, data: bytes, player_disc: int, computer_disc: int) -> "BitBoard":
+        return cls(grid_from_bytes(data, cls.WIDTH, cls.HEIGHT), player_disc, computer_disc)
+
+    """
+        Makes a board by playing a move string from the empty board.
+        @param moves: the columns played, such as "3342".
+        @param player_disc: the player's disc.
+        @param computer_disc: the computer's disc.
+        @param first_disc: the disc that plays first.
+        @return: the board and the disc to move.
+        @raises ValueError: if a move of the string isn't valid.
+    """
+    @classmethod
+    def from_moves(cls, moves: str, player_disc: int, computer_disc: int, first_disc: int) -> tuple["BitBoard", int]:
+        board = cls(np.zeros((cls.HEIGHT, cls.WIDTH), dtype=np.uint8), player_disc, computer_disc)
+        return board, play_moves(board, moves, first_disc)
+
+    """
+        Packs the board into two bits per cell.
+        @return: the bytes.
+    """
+    def to_bytes(self) -> bytes:
+        return grid_to_bytes(self.board)
+
+    """
+        Finds a move string that reaches the board from the empty board.
+        @param first_disc: the disc that played first.
+        @return: the move string.
+        @raises ValueError: if no order of the moves reaches the board.
+    """
+    def to_moves(self, first_disc: int) -> str:
+        return grid_to_moves(self.board, first_disc)
+
+    """
+        Displays the board.
+    """
+    def display(self) -> None:
+        for row in self.board:
+            print(" ".join(map(str, row)))
+
+    """
+        Check if the column is full.
+        @param column: the column to check.
+        @return: True if the column isn't, False otherwise.
+    """
+    def is_valid_move(self, column: int) -> bool:
+        return self.heights[column] < self.HEIGHT
+
+    """
+        Drops the disc in the column.
+        @param column: the column to drop the disc.
+        @param disc: the disc being dropped.
+        @raises ValueError: if the move is out of bounds or the column is full.
+    """
+    def drop_disc(self, column: int, disc: int) -> None:
+        if column < 0 or column >= self.WIDTH:
+            raise ValueError("Move out of bounds")
+        elif self.heights[column] >= self.HEIGHT:
+            raise ValueError("Column is full")
+        else:
+            bit = column * self.H1 + self.heights[column]
+            self.discs[disc] |= 1 << bit
+            self.mirror_discs[disc] |= 1 << ((self.WIDTH - 1 - column) * self.H1 + self.heights[column])
+            self.heights[column] += 1
+            self.moves += 1
+            # The windows through the cell that are now full add their weight.
+            counts = self.counts[disc]
+            score = 0
+            for index, id in self.cell_score_windows[bit]:
+                counts[index] += 1
+                if counts[index] == id + 2:
+                    score += self.weights[id]
+            if disc == self.player_disc:
+                self.score -= score
+            else:
+                self.score += score
+
+    """
+        Undos the move in the column.
+        @param column: the column to remove the disc.
+        @raises ValueError: if there's no disc to remove or out of bounds.
+    """
+    def undo_disc(self, column: int) -> None:
+        if column < 0 or column >= self.WIDTH:
+            raise ValueError("Move out of bounds")
+        elif self.heights[column] == 0:
+            raise ValueError("No disc to remove in column")
+        else:
+            self.heights[column] -= 1
+            self.moves -= 1
+            bit = column * self.H1 + self.heights[column]
+            disc = 1 if self.discs[1] >> bit & 1 else 2
+            self.discs[disc] &= ~(1 << bit)
+            self.mirror_discs[disc] &= ~(1 << ((self.WIDTH - 1 - column) * self.H1 + self.heights[column]))
+            # The windows through the cell that were full remove their weight.
+            counts = self.counts[disc]
+            score = 0
+            for index, id in self.cell_score_windows[bit]:
+                if counts[index] == id + 2:
+                    score += self.weights[id]
+                counts[index] -= 1
+            if disc == self.player_disc:
+                self.score += score
+            else:
+                self.score -= score
+
+    """
+        Gets the valid moves.
+        @return: the valid moves.
+    """
+    def get_valid_moves(self) -> list[int]:
+        return [i for i in range(self.WIDTH) if self.heights[i] < self.HEIGHT]
+
+    """
+        Check if the board is full.
+        @return: True if the board is full, False otherwise.
+    """
+    def is_board_full(self) -> bool:
+        return self.moves == self.WIDTH * self.HEIGHT
+
+    """
+        Gets the number of discs on the board.
+        @return: the number of discs.
+    """
+    def count_discs(self) -> int:
+        return self.moves
+
+    """
+        Gets the key of the position. The mask of disc 1 plus the mask of
+        all discs is unique, as the sum sets the bit above each column.
+        @return: the key.
+    """
+    def key(self) -> int:
+        return self.discs[1] + (self.discs[1] | self.discs[2])
+
+    """
+        Gets the key of the position mirrored around the middle column.
+        @return: the key.
+    """
+    def mirror_key(self) -> int:
+        return self.mirror_discs[1] + (self.mirror_discs[1] | self.mirror_discs[2])
+
+    """
+        Gets the key shared by the position and its mirror, the smaller of the two keys.
+        @return: the key.
+    """
+    def canonical_key(self) -> int:
+        return min(self.key(), self.mirror_key())
+
+    """
+        Check if the position is the same as its mirror.
+        @return: True if the position is symmetric, False otherwise.
+    """
+    def is_symmetric(self) -> bool:
+        return self.discs[1] == self.mirror_discs[1] and self.discs[2] == self.mirror_discs[2]
+
+    """
+        Check if there is a winner.
+        @param disc: the disc to check.
+        @return: True if there is a winner, False otherwise.
+    """
+    def is_winner(self, disc: int) -> bool:
+        discs = self.discs[disc]
+        for shift in self.shifts:
+            # Bits that start two in a row, then four in a row, up to CONNECT in a row.
+            run, length = discs, 1
+            while length < self.CONNECT:
+                step = min(length, self.CONNECT - length)
+                run &= run >> step * shift
+                length += step
+            if run:
+                return True
+        return False
+
+    """
+        Gets the moves that would complete CONNECT in a row for a disc.
+        @param disc: the disc to check.
+        @return: the columns of the moves.
+    """
+    def winning_moves(self, disc: int) -> list[int]:
+        mask = self.discs[1] | self.discs[2]
+        cells = winning_cells(self.discs[disc], mask, self.H1, self.board_mask, self.CONNECT) & (mask + self.bottom_mask)
+        return [column for column in range(self.WIDTH) if cells >> (column * self.H1) & self.column_bits]
+
+    """
+        Gets the moves that drop a disc right under a cell where the other disc
+        would complete CONNECT in a row, so the other disc can win on the next move.
+        @param disc: the disc to move.
+        @return: the columns of the moves.
+    """
+    def moves_under_threats(self, disc: int) -> list[int]:
+        other = self.player_disc if disc == self.computer_disc else self.computer_disc
+        mask = self.discs[1] | self.discs[2]
+        threats = winning_cells(self.discs[other], mask, self.H1, self.board_mask, self.CONNECT)
+        cells = (mask + self.bottom_mask) & self.board_mask & (threats >> 1)
+        return [column for column in range(self.WIDTH) if cells >> (column * self.H1) & self.column_bits]
+
+    """
+        Check if the top disc of the column completes CONNECT in a row.
+        Only the lines through the cell of that disc are checked.
+        @param column: the column of the last move.
+        @return: True if the last move won, False otherwise.
+    """
+    def is_winning_move(self, column: int) -> bool:
+        bit = column * self.H1 + self.heights[column] - 1
+        discs = self.discs[1] if self.discs[1] >> bit & 1 else self.discs[2]
+        for mask in self.cell_windows[bit]:
+            if discs & mask == mask:
+                return True
+        return False
+
+    """
+        Evaluates the board.
+        @return: the score of the board.
+    """
+    def evaluate(self) -> int:
+        return self.score
+
+    """
+        Evaluates the board from scratch, without the running score.
+        @return: the score of the board.
+    """
+    def full_evaluate(self) -> int:
+        score = 0
+        for disc_type in [1, 2]:
+            if disc_type == self.player_disc:
+                score -= self.get_score(self.discs[disc_type])
+            else:
+                score += self.get_score(self.discs[disc_type])
+        return score
+
+    """
+        Gets the number of 2 to CONNECT in a row.
+        @param discs: the mask of the discs of a certain type.
+        @return: the score of the board.
+    """
+    def get_score(self, discs: int) -> int:
+        score = 0
+        for mask, id in self.score_windows:
+            if discs & mask == mask:
+                score += self.weights[id]
+        return score
+
+BitBoard.build_tables()
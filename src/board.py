@@ -1,28 +1,52 @@
 
 import numpy as np
-from scipy.signal import convolve2d
+
+from encoding import key_tables, grid_from_key, grid_from_bytes, grid_to_bytes, grid_to_moves, play_moves
+from geometry import build_weights, geometry_class, new_board, weights_class
+
+"""
+    Convolves two arrays with scipy.signal.convolve2d.
+    SciPy takes most of the time of the imports of the program, so it is only
+    imported by the first convolution, when the NumPy board is actually used.
+    @param board: the array.
+    @param kernel: the kernel.
+    @param mode: the mode of the convolution.
+    @return: the convolution.
+"""
+def convolve2d(board: np.array, kernel: np.array, mode: str = "full") -> np.array:
+    global convolve2d
+    from scipy.signal import convolve2d
+    return convolve2d(board, kernel, mode)
 
 """
     The Board class.
     The class represents an action that the board does.
     The 0s represent empty cells, and 1s or 2s represent the player's or computer's discs.
+    The class is the standard 7x6 board with four in a row, with_geometry
+    gets the class of another size or connect length, see geometry.py.
 """
 class Board:
 
-    # Kernels for the convolutions.
-    h_kernels : list[np.array] = [np.array([[1, 1]]), np.array([[1,1,1]]), np.array([[1,1,1,1]])]
-    v_kernels : list[np.array] = [np.array([[1], [1]]), np.array([[1], [1], [1]]), np.array([[1], [1], [1], [1]])]
-    dp_kernels : list[np.array] = [np.eye(2), np.eye(3), np.eye(4)]
-    dn_kernels : list[np.array] = [np.eye(2)[::-1], np.eye(3)[::-1], np.eye(4)[::-1]]
-    
-    winning_kernels : list[np.array] = [np.array([[1,1,1,1]]), np.array([[1], [1], [1], [1]]), np.eye(4), np.eye(4)[::-1]]
+    # Dimensions of the board and the number of discs in a row that wins.
+    WIDTH : int = 7
+    HEIGHT : int = 6
+    CONNECT : int = 4
+
+    # The tables of the geometry, built by build_tables.
+    # Kernels for the convolutions, of 2 to CONNECT cells.
+    h_kernels : list[np.array]
+    v_kernels : list[np.array]
+    dp_kernels : list[np.array]
+    dn_kernels : list[np.array]
+
+    winning_kernels : list[np.array]
 
     # Weights for the score.
-    weights : list[int] = [10, 100, 10000]
+    weights : list[int]
 
-    # Dimensions of the board.
-    WIDTH : int = 7
-    HEIGHT : int = 6
+    # Value of each cell in the key of the position, and in the key of its mirror.
+    key_bits : np.array
+    mirror_key_bits : np.array
 
     # Player's disc and computer's disc.
     player_disc: int
@@ -33,6 +57,112 @@ class Board:
         self.player_disc = player_disc
         self.computer_disc = computer_disc
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Only a subclass of another geometry has other tables
+        if any(name in cls.__dict__ for name in ["WIDTH", "HEIGHT", "CONNECT"]):
+            cls.build_tables()
+
+    def __reduce__(self):
+        return new_board, (Board, self.WIDTH, self.HEIGHT, self.CONNECT, self.weights), self.__dict__
+
+    """
+        Builds the tables of the geometry of the class.
+    """
+    @classmethod
+    def build_tables(cls) -> None:
+        lengths = range(2, cls.CONNECT + 1)
+        cls.h_kernels = [np.ones((1, length), dtype=int) for length in lengths]
+        cls.v_kernels = [np.ones((length, 1), dtype=int) for length in lengths]
+        cls.dp_kernels = [np.eye(length) for length in lengths]
+        cls.dn_kernels = [np.eye(length)[::-1] for length in lengths]
+        cls.winning_kernels = [cls.h_kernels[-1], cls.v_kernels[-1], cls.dp_kernels[-1], cls.dn_kernels[-1]]
+        cls.weights = build_weights(cls.CONNECT)
+        cls.key_bits = key_tables(cls.WIDTH, cls.HEIGHT)[0]
+        cls.mirror_key_bits = cls.key_bits[:, ::-1]
+
+    """
+        Gets the board class of a geometry, see geometry.py.
+        @param width: the width of the board.
+        @param height: the height of the board.
+        @param connect: the number of discs in a row that wins.
+        @return: the board class.
+        @raises ValueError: if the geometry can't be played.
+    """
+    @staticmethod
+    def with_geometry(width: int, height: int, connect: int = 4) -> type:
+        return geometry_class(Board, width, height, connect)
+
+    """
+        Gets the board class of this geometry with other weights, see geometry.py.
+        @param weights: the weight of each length of window, from 2 discs to CONNECT.
+        @return: the board class.
+        @raises ValueError: if there isn't one weight for each length of window.
+    """
+    @classmethod
+    def with_weights(cls, weights: list[int]) -> type:
+        return weights_class(cls, weights)
+
+    """
+        Copies the board.
+        @return: a new board with the same discs.
+    """
+    def copy(self) -> "Board":
+        return self.__class__(self.board.copy(), self.player_disc, self.computer_disc)
+
+    """
+        Makes a board from its key.
+        @param key: the key of the position.
+        @param player_disc: the player's disc.
+        @param computer_disc: the computer's disc.
+        @return: the board.
+    """
+    @classmethod
+    def from_key(cls, key: int, player_disc: int, computer_disc: int) -> "Board":
+        return cls(grid_from_key(key, cls.WIDTH, cls.HEIGHT), player_disc, computer_disc)
+
+    """
+        Makes a board from its packed bytes.
+        @param data: the bytes of to_bytes.
+        @param player_disc: the player's disc.
+        @param computer_disc: the computer's disc.
+        @return: the board.
+        @raises ValueError: if the bytes aren't a board.
+    """
+    @classmethod
+    def from_bytes(cls, data: bytes, player_disc: int, computer_disc: int) -> "Board":
+        return cls(grid_from_bytes(data, cls.WIDTH, cls.HEIGHT), player_disc, computer_disc)
+
+    """
+        Makes a board by playing a move string from the empty board.
+        @param moves: the columns played, such as "3342".
+        @param player_disc: the player's disc.
+        @param computer_disc: the computer's disc.
+        @param first_disc: the disc that plays first.
+        @return: the board and the disc to move.
+        @raises ValueError: if a move of the string isn't valid.
+    """
+    @classmethod
+    def from_moves(cls, moves: str, player_disc: int, computer_disc: int, first_disc: int) -> tuple["Board", int]:
+        board = cls(np.zeros((cls.HEIGHT, cls.WIDTH), dtype=np.uint8), player_disc, computer_disc)
+        return board, play_moves(board, moves, first_disc)
+
+    """
+        Packs the board into two bits per cell.
+        @return: the bytes.
+    """
+    def to_bytes(self) -> bytes:
+        return grid_to_bytes(self.board)
+
+    """
+        Finds a move string that reaches the board from the empty board.
+        @param first_disc: the disc that played first.
+        @return: the move string.
+        @raises ValueError: if no order of the moves reaches the board.
+    """
+    def to_moves(self, first_disc: int) -> str:
+        return grid_to_moves(self.board, first_disc)
+
     """
         Displays the board.
     """
@@ -88,7 +218,42 @@ class Board:
     """
     def is_board_full(self) -> bool:
         return np.all(self.board != 0)
+
+    """
+        Gets the number of discs on the board.
+        @return: the number of discs.
+    """
+    def count_discs(self) -> int:
+        return int(np.count_nonzero(self.board))
     
+    """
+        Gets the key of the position, the same key as the BitBoard.
+        @return: the key.
+    """
+    def key(self) -> int:
+        return int(self.key_bits[self.board == 1].sum()) + int(self.key_bits[self.board != 0].sum())
+
+    """
+        Gets the key of the position mirrored around the middle column.
+        @return: the key.
+    """
+    def mirror_key(self) -> int:
+        return int(self.mirror_key_bits[self.board == 1].sum()) + int(self.mirror_key_bits[self.board != 0].sum())
+
+    """
+        Gets the key shared by the position and its mirror, the smaller of the two keys.
+        @return: the key.
+    """
+    def canonical_key(self) -> int:
+        return min(self.key(), self.mirror_key())
+
+    """
+        Check if the position is the same as its mirror.
+        @return: True if the position is symmetric, False otherwise.
+    """
+    def is_symmetric(self) -> bool:
+        return bool(np.array_equal(self.board, self.board[:, ::-1]))
+
     """
         Check if there is a winner.
         @param disc: the disc to check.
@@ -97,7 +262,60 @@ class Board:
     def is_winner(self, disc: int) -> bool:
         score_board = np.where(self.board == disc, 1, 0)
         for kernel in self.winning_kernels:
-            if np.sum(convolve2d(score_board, kernel, mode='valid') == 4) > 0:
+            if np.sum(convolve2d(score_board, kernel, mode='valid') == self.CONNECT) > 0:
+                return True
+        return False
+
+    """
+        Gets the moves that would complete CONNECT in a row for a disc.
+        @param disc: the disc to check.
+        @return: the columns of the moves.
+    """
+    def winning_moves(self, disc: int) -> list[int]:
+        moves = []
+        for column in self.get_valid_moves():
+            self.drop_disc(column, disc)
+            if self.is_winning_move(column):
+                moves.append(column)
+            self.undo_disc(column)
+        return moves
+
+    """
+        Gets the moves that drop a disc right under a cell where the other disc
+        would complete CONNECT in a row, so the other disc can win on the next move.
+        @param disc: the disc to move.
+        @return: the columns of the moves.
+    """
+    def moves_under_threats(self, disc: int) -> list[int]:
+        other = self.player_disc if disc == self.computer_disc else self.computer_disc
+        moves = []
+        for column in self.get_valid_moves():
+            self.drop_disc(column, disc)
+            if self.is_valid_move(column):
+                self.drop_disc(column, other)
+                if self.is_winning_move(column):
+                    moves.append(column)
+                self.undo_disc(column)
+            self.undo_disc(column)
+        return moves
+
+    """
+        Check if the top disc of the column completes CONNECT in a row.
+        Only the lines through the cell of that disc are checked.
+        @param column: the column of the last move.
+        @return: True if the last move won, False otherwise.
+    """
+    def is_winning_move(self, column: int) -> bool:
+        row = np.argmax(self.board.T[column] >= 1)
+        disc = self.board[row][column]
+        for d_row, d_col in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+            count = 1
+            for sign in [1, -1]:
+                r, c = row + sign * d_row, column + sign * d_col
+                while 0 <= r < self.HEIGHT and 0 <= c < self.WIDTH and self.board[r][c] == disc:
+                    count += 1
+                    r, c = r + sign * d_row, c + sign * d_col
+            if count >= self.CONNECT:
                 return True
         return False
 
@@ -116,7 +334,7 @@ class Board:
         return score
     
     """
-        Gets the number of 2,3,4 in a row.
+        Gets the number of 2 to CONNECT in a row.
         @param disc_board: the board with discs of a certain type.
         @return: the score of the board.
     """
@@ -135,3 +353,5 @@ class Board:
         for id, kernel in enumerate(self.dn_kernels):
             score += np.sum(convolve2d(disc_board, kernel, mode='valid') == id+2) * self.weights[id]
         return score
+
+Board.build_tables()
@@ -0,0 +1,135 @@
+import argparse
+import os
+
+import numpy as np
+
+from backend import create_board
+from batch import iter_analysis
+from encoding import book_key, canonical_move
+
+"""
+    The entries of the book file, sorted by key. The key of a position is its
+    canonical key, the smaller of its key and the key of its mirror, with the
+    disc to move in the two lowest bits, the same key as the transposition
+    table. The moves are stored the way round of the canonical key.
+"""
+BOOK_DTYPE : np.dtype = np.dtype([("key", "<u8"), ("move", "i1"), ("depth", "i1"), ("score", "<i4")])
+
+# The books opened by open_book, by absolute path.
+open_books : dict = {}
+
+"""
+    Finds every position reached in up to a number of plies from the empty board,
+    with either disc playing first. Positions that are already won aren't kept,
+    and a position and its mirror are only kept once.
+    @param plies: the number of plies.
+    @param player_disc: the player's disc.
+    @param computer_disc: the computer's disc.
+    @return: a move string of each position the way round of its key and the disc that played first, by key.
+"""
+def enumerate_positions(plies: int, player_disc: int = 1, computer_disc: int = 2) -> dict[int, tuple[str, int]]:
+    positions = {}
+
+    def visit(board, moves: str, token: int, first_disc: int) -> None:
+        key = book_key(board, token)
+        # Another move order already reached the position
+        if key in positions:
+            return
+        # The moves of the mirror reach the position the way round of its key
+        positions[key] = (moves if board.key() <= board.mirror_key() else "".join(str(board.WIDTH - 1 - int(move)) for move in moves), first_disc)
+        if len(moves) == plies:
+            return
+        next_token = player_disc if token == computer_disc else computer_disc
+        for move in board.get_valid_moves():
+            board.drop_disc(move, token)
+            if not board.is_winning_move(move):
+                visit(board, moves + str(move), next_token, first_disc)
+            board.undo_disc(move)
+
+    for first_disc in [player_disc, computer_disc]:
+        visit(create_board("bitboard", player_disc, computer_disc), "", first_disc, first_disc)
+    return positions
+
+"""
+    Builds the opening book. Every position up to a number of plies is searched
+    to a depth and the results are written to a sorted .npy file.
+    @param path: the file of the book.
+    @param plies: the number of plies from the empty board.
+    @param depth: the depth of the search of each position.
+    @param workers: the number of worker processes.
+    @param player_disc: the player's disc.
+    @param computer_disc: the computer's disc.
+    @return: the number of positions in the book.
+"""
+def build_book(path: str, plies: int, depth: int, workers: int = None, player_disc: int = 1, computer_disc: int = 2) -> int:
+    positions = enumerate_positions(plies, player_disc, computer_disc)
+    entries = np.zeros(len(positions), dtype=BOOK_DTYPE)
+    index = 0
+    for first_disc in [player_disc, computer_disc]:
+        keys = [key for key, (_, disc) in positions.items() if disc == first_disc]
+        results = iter_analysis((positions[key][0] for key in keys), depth, workers, player_disc, computer_disc, "bitboard", first_disc)
+        for key, (move, score) in zip(keys, results):
+            entries[index] = (key, move, depth, score)
+            index += 1
+    entries.sort(order="key")
+    np.save(path, entries)
+    return len(entries)
+
+"""
+    Opens the book of a file, mapping each file once per process. A worker
+    forked after its parent opened the book gets the same mapping.
+    @param path: the file of the book.
+    @return: the book.
+    @raises ValueError: if the file isn't an opening book.
+"""
+def open_book(path: str) -> "OpeningBook":
+    path = os.path.abspath(path)
+    if path not in open_books:
+        open_books[path] = OpeningBook(path)
+    return open_books[path]
+
+"""
+    The OpeningBook class.
+    The class memory-maps a book file, so only the pages of the entries
+    that are looked up are read, and finds positions with a binary search.
+"""
+class OpeningBook:
+
+    """
+        Attributes of the OpeningBook class.
+    """
+    entries: np.array
+    keys: np.array
+
+    def __init__(self, path: str):
+        self.entries = np.load(path, mmap_mode="r")
+        if self.entries.dtype != BOOK_DTYPE:
+            raise ValueError(f"Not an opening book: {path}")
+        self.keys = self.entries["key"]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    """
+        Looks up a position in O(log n).
+        @param board: the board.
+        @param token: the disc to move.
+        @return: the best move and the score, or None if the position isn't in the book.
+    """
+    def lookup(self, board, token: int) -> tuple[int, int]:
+        key = np.uint64(book_key(board, token))
+        index = np.searchsorted(self.keys, key)
+        if index < len(self.keys) and self.keys[index] == key:
+            entry = self.entries[index]
+            return canonical_move(board, int(entry["move"])), int(entry["score"])
+        return None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Builds the opening book.")
+    parser.add_argument("path", help="the file of the book, such as src/opening_book.npy")
+    parser.add_argument("--plies", type=int, default=4, help="the number of plies from the empty board")
+    parser.add_argument("--depth", type=int, default=8, help="the depth of the search of each position")
+    parser.add_argument("--workers", type=int, default=None, help="the number of worker processes")
+    args = parser.parse_args()
+    count = build_book(args.path, args.plies, args.depth, args.workers)
+    print(f"{count} positions written to {args.path}")
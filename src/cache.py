@@ -0,0 +1,117 @@
+import sqlite3
+import time
+
+from book import book_key, canonical_move
+
+"""
+    The AnalysisCache class.
+    The class keeps the results of searches in an SQLite file, so a position
+    searched in one game or process isn't searched again in the next one.
+
+    Each position is stored under the key of the opening book with the depth,
+    score and best move of its deepest search, so a position and its mirror
+    share an entry. The file is in write-ahead log mode, so many processes can
+    read it while one of them writes. Each entry keeps the time it was last
+    used, and when the cache holds more than max_entries positions the least
+    recently used ones are removed.
+
+    Both are kept cheap at a million entries: the time of an entry is only
+    updated by a lookup once it is older than touch_interval seconds, so most
+    lookups only read, and the entries are only counted, and the excess
+    removed, every evict_interval stores of the process, so the cache can hold
+    up to that many more positions per process between two evictions.
+
+    A connection belongs to the process that opened it, so each worker
+    process opens its own AnalysisCache on the same file.
+"""
+class AnalysisCache:
+
+    """
+        Attributes of the AnalysisCache class.
+    """
+    path: str
+    max_entries: int
+    # The stores between two evictions, and the seconds before a lookup updates the time of an entry.
+    evict_interval: int
+    touch_interval: float
+    # The number of stores of this connection.
+    stores: int
+    connection: sqlite3.Connection
+
+    def __init__(self, path: str, max_entries: int = 1 << 20, timeout: float = 30.0, evict_interval: int = 256, touch_interval: float = 60.0):
+        if max_entries <= 0:
+            raise ValueError("Max entries must be positive")
+        if evict_interval <= 0:
+            raise ValueError("Evict interval must be positive")
+        self.path = path
+        self.max_entries = max_entries
+        self.evict_interval = evict_interval
+        self.touch_interval = touch_interval
+        self.stores = 0
+        # Autocommit, each statement is its own transaction
+        self.connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS positions (key INTEGER PRIMARY KEY, depth INTEGER NOT NULL, "
+                                "score INTEGER NOT NULL, move INTEGER, used REAL NOT NULL)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS positions_used ON positions (used)")
+
+    def __enter__(self) -> "AnalysisCache":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+
+    """
+        Removes the excess entries, then closes the connection to the file.
+    """
+    def close(self) -> None:
+        self.evict()
+        self.connection.close()
+
+    """
+        Removes the least recently used positions past the max entries.
+    """
+    def evict(self) -> None:
+        excess = len(self) - self.max_entries
+        if excess > 0:
+            self.connection.execute("DELETE FROM positions WHERE key IN (SELECT key FROM positions ORDER BY used LIMIT ?)", (excess,))
+
+    """
+        Looks up a position searched at least to a depth.
+        @param board: the board.
+        @param token: the disc to move.
+        @param depth: the least depth of the search.
+        @return: the best move, the score and the depth of the search, or None if the position isn't stored that deep.
+    """
+    def lookup(self, board, token: int, depth: int = 0) -> tuple[int, int, int]:
+        key = book_key(board, token)
+        row = self.connection.execute("SELECT move, score, depth, used FROM positions WHERE key = ? AND depth >= ?", (key, depth)).fetchone()
+        if row is None:
+            return None
+        move, score, depth, used = row
+        # Only an entry that wasn't used lately is written, the other lookups don't take the write lock
+        now = time.time()
+        if now - used >= self.touch_interval:
+            self.connection.execute("UPDATE positions SET used = ? WHERE key = ?", (now, key))
+        return canonical_move(board, move), score, depth
+
+    """
+        Stores the result of a search, unless the position is already stored deeper.
+        @param board: the board.
+        @param token: the disc to move.
+        @param depth: the depth of the search.
+        @param move: the best move.
+        @param score: the score.
+    """
+    def store(self, board, token: int, depth: int, move: int, score: int) -> None:
+        self.connection.execute("INSERT INTO positions (key, depth, score, move, used) VALUES (?, ?, ?, ?, ?) "
+                                "ON CONFLICT (key) DO UPDATE SET depth = excluded.depth, score = excluded.score, "
+                                "move = excluded.move, used = excluded.used WHERE excluded.depth >= positions.depth",
+                                (book_key(board, token), depth, int(score), canonical_move(board, move), time.time()))
+        self.stores += 1
+        if self.stores % self.evict_interval == 0:
+            self.evict()
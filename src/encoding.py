@@ -0,0 +1,257 @@
+import numpy as np
+
+"""
+    Compact encodings of a position, for both boards.
+
+    - The key: the mask of disc 1 plus the mask of all discs in the bitboard
+      layout, which sets the bit above the discs of each column. It fits in
+      64 bits, and a column of the key decodes back to its discs.
+    - The move string: the columns played from the empty board, such as "3342".
+    - The packed bytes: two bits per cell, the cells of disc 1 then the cells
+      of disc 2 in the order of the array, 11 bytes for a 6x7 board.
+
+    Arrays of positions are kept as contiguous uint64 arrays of keys, which
+    can be saved as .npy files and memory-mapped without copying. The keys of
+    a board with more than 64 bits, such as 9x7, are only Python integers.
+"""
+
+"""
+    Builds the value of each cell in the key of a position. The key uses the
+    bitboard layout: each column takes HEIGHT + 1 bits, starting from the bottom row.
+    @param width: the width of the board.
+    @param height: the height of the board.
+    @return: the value of each cell, Python integers if the key doesn't fit in 64 bits.
+"""
+def build_key_bits(width: int, height: int) -> np.array:
+    dtype = np.uint64 if width * (height + 1) <= 64 else object
+    return np.array([[1 << (col * (height + 1) + height - 1 - row) for col in range(width)] for row in range(height)], dtype=dtype)
+
+"""
+    Builds the cells of a column for each value of its bits in the key.
+    The bits of a column with h discs are the discs of disc 1 plus 2^h - 1.
+    @param height: the height of the board.
+    @return: an array of shape (2^(height + 1), height) of the discs of the column from the top, 0 for a value no column has.
+"""
+def build_column_cells(height: int) -> np.array:
+    cells = np.zeros((1 << (height + 1), height), dtype=np.uint8)
+    for discs in range(height + 1):
+        for ones in range(1 << discs):
+            column = [0] * (height - discs) + [1 if ones >> row & 1 else 2 for row in range(discs - 1, -1, -1)]
+            cells[ones + (1 << discs) - 1] = column
+    return cells
+
+# The key tables of each size of board, built by key_tables.
+key_bits_tables : dict[tuple[int, int], np.array] = {}
+column_cells_tables : dict[int, np.array] = {}
+
+"""
+    Gets the key tables of a size of board, built once for each size.
+    @param width: the width of the board.
+    @param height: the height of the board.
+    @return: the value of each cell in the key and the cells of a column for each value of its bits.
+"""
+def key_tables(width: int, height: int) -> tuple[np.array, np.array]:
+    if (width, height) not in key_bits_tables:
+        key_bits_tables[(width, height)] = build_key_bits(width, height)
+    if height not in column_cells_tables:
+        column_cells_tables[height] = build_column_cells(height)
+    return key_bits_tables[(width, height)], column_cells_tables[height]
+
+"""
+    Checks that the keys of a size of board fit in a uint64 array.
+    @param width: the width of the board.
+    @param height: the height of the board.
+    @raises ValueError: if the keys need more than 64 bits.
+"""
+def check_key_size(width: int, height: int) -> None:
+    if width * (height + 1) > 64:
+        raise ValueError(f"The keys of a {width}x{height} board don't fit in 64 bits")
+
+"""
+    Gets the keys of a stack of boards.
+    @param grids: an array of shape (N, height, width) of discs, 6x7 for the standard board.
+    @return: a uint64 array of the N keys.
+    @raises ValueError: if the keys of the boards need more than 64 bits.
+"""
+def encode_keys(grids: np.array) -> np.array:
+    grids = np.asarray(grids)
+    height, width = grids.shape[1:]
+    check_key_size(width, height)
+    key_bits = key_tables(width, height)[0]
+    ones = np.where(grids == 1, key_bits, np.uint64(0)).sum(axis=(1, 2), dtype=np.uint64)
+    discs = np.where(grids != 0, key_bits, np.uint64(0)).sum(axis=(1, 2), dtype=np.uint64)
+    return ones + discs
+
+"""
+    Gets the boards of an array of keys.
+    @param keys: an array of N keys.
+    @param width: the width of the board.
+    @param height: the height of the board.
+    @return: an array of shape (N, height, width) of discs.
+    @raises ValueError: if the keys of the boards need more than 64 bits.
+"""
+def decode_keys(keys: np.array, width: int = 7, height: int = 6) -> np.array:
+    check_key_size(width, height)
+    keys = np.asarray(keys, dtype=np.uint64)
+    column_cells = key_tables(width, height)[1]
+    grids = np.empty((len(keys), height, width), dtype=np.uint8)
+    column_mask = np.uint64((1 << (height + 1)) - 1)
+    for column in range(width):
+        grids[:, :, column] = column_cells[(keys >> np.uint64(column * (height + 1))) & column_mask]
+    return grids
+
+"""
+    Gets the board of a key, of any size.
+    @param key: the key.
+    @param width: the width of the board.
+    @param height: the height of the board.
+    @return: the array of discs.
+"""
+def grid_from_key(key: int, width: int = 7, height: int = 6) -> np.array:
+    column_cells = key_tables(width, height)[1]
+    column_mask = (1 << (height + 1)) - 1
+    return column_cells[[key >> (column * (height + 1)) & column_mask for column in range(width)]].T.copy()
+
+"""
+    Packs a board into two bits per cell.
+    @param grid: the array of discs.
+    @return: the bytes.
+"""
+def grid_to_bytes(grid: np.array) -> bytes:
+    grid = np.asarray(grid)
+    return np.packbits(np.concatenate([(grid == 1).ravel(), (grid == 2).ravel()])).tobytes()
+
+"""
+    Unpacks a board from two bits per cell.
+    @param data: the bytes.
+    @param width: the width of the board.
+    @param height: the height of the board.
+    @return: the array of discs.
+    @raises ValueError: if the bytes aren't a board of that size.
+"""
+def grid_from_bytes(data: bytes, width: int = 7, height: int = 6) -> np.array:
+    cells = width * height
+    if len(data) != (2 * cells + 7) // 8:
+        raise ValueError(f"Not a packed board: {len(data)} bytes")
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))[:2 * cells]
+    ones, twos = bits[:cells], bits[cells:]
+    if np.any(ones & twos):
+        raise ValueError("Not a packed board: a cell has both discs")
+    return (ones + 2 * twos).reshape(height, width).astype(np.uint8)
+
+"""
+    Plays a move string on a board.
+    @param board: the board, any backend.
+    @param moves: the columns played, such as "3342".
+    @param first_disc: the disc that plays first.
+    @return: the disc to move after the moves.
+    @raises ValueError: if a move of the string isn't valid.
+"""
+def play_moves(board, moves: str, first_disc: int) -> int:
+    second_disc = board.player_disc if first_disc == board.computer_disc else board.computer_disc
+    disc = first_disc
+    for char in moves:
+        if not char.isdigit():
+            raise ValueError(f"Invalid move: {char}")
+        board.drop_disc(int(char), disc)
+        disc = second_disc if disc == first_disc else first_disc
+    return disc
+
+"""
+    Gets the disc to move of a board.
+    @param grid: the array of discs.
+    @param first_disc: the disc that played first.
+    @return: the first disc if both discs have the same count, the other disc otherwise.
+"""
+def disc_to_move(grid: np.array, first_disc: int) -> int:
+    grid = np.asarray(grid)
+    second_disc = 3 - first_disc
+    return first_disc if np.sum(grid == first_disc) == np.sum(grid == second_disc) else second_disc
+
+"""
+    Finds a move string that reaches a board, taking the top discs off in turn.
+    The discs of a column only come off from the top, so a board can need a
+    search over the order of the columns; the heights already tried are skipped.
+    @param grid: the array of discs, row 0 at the top.
+    @param first_disc: the disc that played first.
+    @return: the move string.
+    @raises ValueError: if no order of the moves reaches the board.
+"""
+def grid_to_moves(grid: np.array, first_disc: int) -> str:
+    grid = np.asarray(grid)
+    height, width = grid.shape
+    # The discs of each column from the bottom
+    columns = [[int(disc) for disc in grid[::-1, column] if disc != 0] for column in range(width)]
+    total = sum(len(column) for column in columns)
+    second_disc = 3 - first_disc
+    first_count = sum(column.count(first_disc) for column in columns)
+    if first_count != total - first_count and first_count != total - first_count + 1:
+        raise ValueError("No order of the moves reaches the board")
+    heights = [len(column) for column in columns]
+    tried = set()
+    moves = []
+
+    # Takes off the disc played at a ply, the last ply first
+    def take_off(ply: int) -> bool:
+        if ply < 0:
+            return True
+        state = tuple(heights)
+        if state in tried:
+            return False
+        tried.add(state)
+        disc = first_disc if ply % 2 == 0 else second_disc
+        for column in range(width):
+            if heights[column] > 0 and columns[column][heights[column] - 1] == disc:
+                heights[column] -= 1
+                moves.append(column)
+                if take_off(ply - 1):
+                    return True
+                moves.pop()
+                heights[column] += 1
+        return False
+
+    if not take_off(total - 1):
+        raise ValueError("No order of the moves reaches the board")
+    return "".join(str(column) for column in reversed(moves))
+
+"""
+    Gets the key of a position in the book, the tablebase and the cache:
+    its canonical key with the disc to move in the two lowest bits.
+    @param board: the board.
+    @param token: the disc to move.
+    @return: the key.
+"""
+def book_key(board, token: int) -> int:
+    return board.canonical_key() << 2 | token
+
+"""
+    Translates a move between a board and the way round of its canonical key,
+    the same translation both ways.
+    @param board: the board.
+    @param move: the move, or None.
+    @return: the mirrored move if the board is the mirror of its canonical way round, the move otherwise.
+"""
+def canonical_move(board, move: int) -> int:
+    if move is not None and board.mirror_key() < board.key():
+        return board.WIDTH - 1 - move
+    return move
+
+"""
+    Saves an array of keys as a contiguous .npy file.
+    @param path: the file.
+    @param keys: the keys.
+"""
+def save_keys(path: str, keys) -> None:
+    np.save(path, np.ascontiguousarray(keys, dtype=np.uint64))
+
+"""
+    Memory-maps a file of keys, only the pages that are read are loaded.
+    @param path: the file.
+    @return: the read-only array of keys.
+    @raises ValueError: if the file isn't an array of keys.
+"""
+def load_keys(path: str) -> np.array:
+    keys = np.load(path, mmap_mode="r")
+    if keys.dtype != np.uint64 or keys.ndim != 1:
+        raise ValueError(f"Not an array of keys: {path}")
+    return keys
@@ -1,8 +1,15 @@
 
-import numpy as np
+import os
 
 from board import Board
+from backend import create_board
+from book import OpeningBook, open_book
+from cache import AnalysisCache
+from geometry import GEOMETRY
 from minimax import MiniMax
+from ponder import Ponderer
+from tablebase import Tablebase, open_tablebase, search_score
+from transposition import TranspositionTable
 from random import randint
 
 """
@@ -14,22 +21,56 @@ class Game:
     """
         Attributes of the Game class.
     """
-    WIDTH : int = 7
-    HEIGHT : int = 6
+    # Width, height and number of discs in a row that wins of the board.
+    GEOMETRY : tuple[int, int, int] = GEOMETRY
+    # Width and height of the board of the default geometry, a game sets its own for its geometry.
+    WIDTH : int = GEOMETRY[0]
+    HEIGHT : int = GEOMETRY[1]
     # Max depth of the search of 7 or take some time to compute for higher values.
     DEPTH : int = 7
+    # Time budget of the computer's move, the search stops at the deepest depth completed in time.
+    TIME_BUDGET_MS : int = 5000
+    # The board backend, "numpy" or "bitboard".
+    BACKEND : str = "numpy"
+    # Number of slots of the transposition table kept between moves.
+    TABLE_SIZE : int = 1 << 18
+    # The opening book built by book.py, only used if the file exists.
+    BOOK_PATH : str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_book.npy")
+    # The cache of the computer's searches kept between games, used when a game is given it.
+    CACHE_PATH : str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "analysis_cache.db")
+    # The endgame tablebase built by tablebase.py, only used if the file exists.
+    TABLEBASE_PATH : str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "endgame_tablebase.npy")
 
     board: Board
     player_disc: int
     computer_disc: int
     minimax: MiniMax
+    book: OpeningBook
+    cache: AnalysisCache
+    tablebase: Tablebase
+    # Searches the replies of the player while they think, None without pondering.
+    ponderer: Ponderer
 
-    def __init__(self):
+    def __init__(self, backend: str = BACKEND, book_path: str = BOOK_PATH, cache_path: str = None, ponder: bool = False,
+                 geometry: tuple[int, int, int] = GEOMETRY, tablebase_path: str = TABLEBASE_PATH):
         self.player_disc = 1
         self.computer_disc = 2
+        self.WIDTH, self.HEIGHT = geometry[0], geometry[1]
+        # The book, the cache and the tablebase hold positions of the standard board
+        if geometry != GEOMETRY:
+            book_path, cache_path, tablebase_path = None, None, None
+        self.tablebase = open_tablebase(tablebase_path) if tablebase_path is not None and os.path.exists(tablebase_path) else None
 
-        self.board = Board(np.zeros((self.HEIGHT, self.WIDTH), dtype=np.uint8), self.player_disc, self.computer_disc)
-        self.minimax = MiniMax(self.player_disc, self.computer_disc)
+        self.board = create_board(backend, self.player_disc, self.computer_disc, geometry)
+        # The NumPy board evaluates the leaves faster as a batch
+        table = TranspositionTable(self.TABLE_SIZE)
+        self.minimax = MiniMax(self.player_disc, self.computer_disc, backend, table, batch_leaves=backend == "numpy", threats=True, geometry=geometry,
+                               tablebase=self.tablebase)
+        # The pondering shares the table, so a reply it didn't finish still starts with its entries
+        self.ponderer = Ponderer(MiniMax(self.player_disc, self.computer_disc, backend, table, batch_leaves=backend == "numpy", threats=True,
+                                         geometry=geometry, tablebase=self.tablebase), self.DEPTH) if ponder else None
+        self.book = open_book(book_path) if book_path is not None and os.path.exists(book_path) else None
+        self.cache = AnalysisCache(cache_path) if cache_path is not None else None
 
     """
         Gets the starting disc to determine who starts.
@@ -50,8 +91,8 @@ class Game:
             if not player_input.isdigit():
                 print("Invalid input. Please enter a number.")
                 continue
-            if int(player_input) < 0 or int(player_input) > 6:
-                print("Invalid input. Please enter a number between 0 and 6.")
+            if int(player_input) < 0 or int(player_input) > self.board.WIDTH - 1:
+                print(f"Invalid input. Please enter a number between 0 and {self.board.WIDTH - 1}.")
                 continue
             if not self.board.is_valid_move(int(player_input)):
                 print("Invalid input. Please enter a number for a column that is not full.")
@@ -59,13 +100,55 @@ class Game:
             print("Player's move: ", player_input)
             return int(player_input)
 
+    """
+        Finds the computer's move in the opening book, then in the endgame tablebase,
+        then in the pondered replies, then in the cache, then with a search.
+        @param time_budget_ms: the time budget of the search, None for the time budget of the game.
+        @return: the move, the score, the depth of the search (None from the book or the tablebase) and where the move came from.
+    """
+    def find_computer_move(self, time_budget_ms: int = None) -> tuple[int, int, int, str]:
+        if self.ponderer is not None:
+            self.ponderer.stop()
+        entry = self.book.lookup(self.board, self.computer_disc) if self.book is not None else None
+        if entry is not None:
+            move, score = entry
+            return move, score, None, "book"
+        if self.tablebase is not None and self.tablebase.covers(self.board.count_discs()):
+            entry = self.tablebase.lookup(self.board, self.computer_disc)
+            if entry is not None:
+                move, score = entry
+                return move, search_score(self.board, self.computer_disc, score), None, "tablebase"
+        if self.ponderer is not None:
+            entry = self.ponderer.lookup(self.board, self.computer_disc)
+            if entry is not None:
+                move, score, depth = entry
+                return move, score, depth, "ponder"
+        entry = self.cache.lookup(self.board, self.computer_disc, self.DEPTH) if self.cache is not None else None
+        if entry is not None:
+            move, score, depth = entry
+            return move, score, depth, "cache"
+        time_budget_ms = self.TIME_BUDGET_MS if time_budget_ms is None else time_budget_ms
+        move, score, depth = self.minimax.iterative_deepening(self.board, self.computer_disc, self.DEPTH, time_budget_ms)
+        if self.cache is not None and move is not None:
+            self.cache.store(self.board, self.computer_disc, depth, move, score)
+        return move, score, depth, "search"
+
     """
         Gets the computer's move.
         @return: the computer's move.
     """
     def computer_move(self) -> int:
-        move, score = self.minimax.mini_max(self.board, -float('inf'), float('inf'), self.DEPTH, self.computer_disc)
-        print(f"Computer's move: {move}, Computer's score: {score}")
+        move, score, depth, source = self.find_computer_move()
+        if source == "book":
+            print(f"Computer's move: {move}, Computer's score: {score}, From the opening book")
+        elif source == "tablebase":
+            print(f"Computer's move: {move}, Computer's score: {score}, From the endgame tablebase")
+        elif source == "cache":
+            print(f"Computer's move: {move}, Computer's score: {score}, Depth: {depth}, From the cache")
+        elif source == "ponder":
+            print(f"Computer's move: {move}, Computer's score: {score}, Depth: {depth}, Pondered")
+        else:
+            print(f"Computer's move: {move}, Computer's score: {score}, Depth: {depth}")
         return move
 
 
@@ -88,7 +171,7 @@ class Game:
         disc = self.get_starting_disc()
         print("Player's disc: ", self.player_disc)
         print("Computer's disc: ", self.computer_disc)
-        print(f"The first column number is 0 and the last is {self.WIDTH-1}")
+        print(f"The first column number is 0 and the last is {self.board.WIDTH-1}")
         print("Player starts!" if disc == self.player_disc else "Computer starts!")
         while running:
             self.board.display()
@@ -114,4 +197,9 @@ class Game:
                 running = False
             else:
                 disc = self.change_disc(disc)
+                # Searches the replies of the player while they think
+                if disc == self.player_disc and self.ponderer is not None:
+                    self.ponderer.start(self.board, self.player_disc)
+        if self.ponderer is not None:
+            self.ponderer.stop()
         print("Thank you for playing!")
@@ -0,0 +1,96 @@
+"""
+    Board geometries: the width, the height and the number of discs in a row
+    that wins. Each board class is written for the standard geometry, 7x6
+    and four in a row, and keeps the tables of its geometry, such as its
+    windows and the value of each cell in the key, as class attributes. The
+    class of another geometry is a subclass with the tables of that geometry,
+    made once by geometry_class and shared by every board of that geometry,
+    so a board of any size looks its tables up the same way. The weights of
+    the score can be changed the same way, by a subclass that only changes
+    the weights and shares the other tables of its geometry. The subclasses
+    add no slots, so a board class with slots keeps its boards without a dictionary.
+"""
+
+# The width, the height and the number of discs in a row that wins of the standard board.
+GEOMETRY : tuple[int, int, int] = (7, 6, 4)
+
+# The class of each board class and geometry, made by geometry_class,
+# and of each board class and weights, made by weights_class.
+geometry_classes : dict[tuple[type, int, int, int], type] = {}
+weights_classes : dict[tuple[type, tuple[int, ...]], type] = {}
+
+"""
+    Checks that a geometry can be played.
+    @param width: the width of the board.
+    @param height: the height of the board.
+    @param connect: the number of discs in a row that wins.
+    @raises ValueError: if a line of connect discs doesn't fit the board in every direction.
+"""
+def check_geometry(width: int, height: int, connect: int) -> None:
+    if connect < 2:
+        raise ValueError("The connect length must be at least 2")
+    if width < connect or height < connect:
+        raise ValueError(f"A {width}x{height} board can't fit {connect} in a row in every direction")
+
+"""
+    Builds the weights of the windows of 2 to connect discs in a row. A full
+    winning window outweighs every shorter window, 10000 for four in a row.
+    @param connect: the number of discs in a row that wins.
+    @return: the weight of each length of window, from 2 discs.
+"""
+def build_weights(connect: int) -> list[int]:
+    return [10 ** (length - 1) for length in range(2, connect)] + [10 ** connect]
+
+"""
+    Gets the class of a board class for a geometry, made with its tables on
+    the first call for each geometry.
+    @param board_class: the board class, written for the standard geometry.
+    @param width: the width of the board.
+    @param height: the height of the board.
+    @param connect: the number of discs in a row that wins.
+    @return: the board class itself for its own geometry, its subclass for the geometry otherwise.
+    @raises ValueError: if the geometry can't be played.
+"""
+def geometry_class(board_class: type, width: int, height: int, connect: int) -> type:
+    if (width, height, connect) == (board_class.WIDTH, board_class.HEIGHT, board_class.CONNECT):
+        return board_class
+    key = (board_class, width, height, connect)
+    if key not in geometry_classes:
+        check_geometry(width, height, connect)
+        # The subclass builds its tables when it is made
+        geometry_classes[key] = type(f"{board_class.__name__}{width}x{height}c{connect}", (board_class,),
+                                     {"WIDTH": width, "HEIGHT": height, "CONNECT": connect, "__slots__": ()})
+    return geometry_classes[key]
+
+"""
+    Gets the class of a board class with other weights, made on the first
+    call for each weights.
+    @param board_class: the board class, of any geometry.
+    @param weights: the weight of each length of window, from 2 discs to the connect length.
+    @return: the board class itself for its own weights, its subclass with the weights otherwise.
+    @raises ValueError: if there isn't one weight for each length of window.
+"""
+def weights_class(board_class: type, weights: list[int]) -> type:
+    weights = [int(weight) for weight in weights]
+    if weights == board_class.weights:
+        return board_class
+    key = (board_class, tuple(weights))
+    if key not in weights_classes:
+        if len(weights) != board_class.CONNECT - 1:
+            raise ValueError(f"Expected {board_class.CONNECT - 1} weights, got {len(weights)}")
+        weights_classes[key] = type(f"{board_class.__name__}Weighted", (board_class,), {"weights": weights, "__slots__": ()})
+    return weights_classes[key]
+
+"""
+    Makes an empty instance of a board class for a geometry and weights, to
+    unpickle a board, as the classes of the geometries aren't attributes of a module.
+    @param board_class: the board class, written for the standard geometry.
+    @param width: the width of the board.
+    @param height: the height of the board.
+    @param connect: the number of discs in a row that wins.
+    @param weights: the weights of the score.
+    @return: the board, without its attributes.
+"""
+def new_board(board_class: type, width: int, height: int, connect: int, weights: list[int]):
+    cls = weights_class(geometry_class(board_class, width, height, connect), weights)
+    return cls.__new__(cls)
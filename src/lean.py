@@ -0,0 +1,225 @@
+import gc
+from contextlib import contextmanager
+
+from bitboard import BitBoard
+from geometry import GEOMETRY
+from tablebase import won_score
+from transposition import TranspositionTable, EXACT, LOWER, UPPER
+
+"""
+    The LeanMiniMax class.
+    The class is the alpha-beta search of the MiniMax class written so its
+    hot loop allocates nothing that outlives a node, for long searches and
+    many searches at once in one process.
+
+    - The moves of each ply are written into a buffer made once for the
+      deepest search, instead of a new list per node.
+    - The moves are ordered without sorting: the killer move of the ply,
+      then the move of the transposition table, then the columns closer to
+      the middle first.
+    - A node returns its score only, the best move of the root is kept in
+      the best_move attribute instead of a (move, score) tuple per node.
+    - The board is a BitBoard, whose state is kept in slots and whose
+      evaluation is a read of its running score. The NumPy board allocates
+      arrays on each evaluation, so it isn't searched here.
+
+    The memory of the search is then the buffers and the transposition table,
+    whose number of slots is fixed, whatever the depth. With nothing left for
+    the garbage collector to find, the search can run with it disabled.
+    The scores are the same as the scores of the MiniMax class at the same depth.
+"""
+
+# A bound beyond every score, kept an integer so the scores are never floats.
+INFINITY : int = 1 << 62
+
+"""
+    Disables the garbage collector for the duration of a block, then enables
+    it again if it was enabled.
+"""
+@contextmanager
+def gc_paused():
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+class LeanMiniMax:
+
+    __slots__ = ("player_disc", "computer_disc", "board_class", "table", "max_depth", "column_order",
+                 "move_buffers", "killers", "root_depth", "best_move", "nodes")
+
+    """
+        Attributes of the LeanMiniMax class.
+    """
+    player_disc: int
+    computer_disc: int
+    # The class of the boards searched, of the geometry of the search.
+    board_class: type
+    # The transposition table, None searches without one.
+    table: TranspositionTable
+    # The deepest search, the buffers are made for it.
+    max_depth: int
+    column_order: list[int]
+    # The moves of the node of each remaining depth, and the killer move of each depth, -1 for none.
+    move_buffers: list[list[int]]
+    killers: list[int]
+
+    # The depth of the current search, the best move of its root, and the number of nodes it searched.
+    root_depth: int
+    best_move: int
+    nodes: int
+
+    def __init__(self, player_disc: int, computer_disc: int, max_depth: int, table: TranspositionTable = None, geometry: tuple[int, int, int] = GEOMETRY):
+        self.player_disc = player_disc
+        self.computer_disc = computer_disc
+        self.board_class = BitBoard.with_geometry(*geometry)
+        self.table = table
+        self.max_depth = max_depth
+        width = geometry[0]
+        self.column_order = sorted(range(width), key=lambda x: abs(x - width//2))
+        self.move_buffers = [[0] * width for _ in range(max_depth + 1)]
+        self.killers = [-1] * (max_depth + 1)
+        self.root_depth = 0
+        self.best_move = None
+        self.nodes = 0
+
+    """
+        Searches a position to a depth.
+        @param board: the board, converted to a BitBoard of the geometry of the search if it isn't one.
+        @param token: the current token.
+        @param depth: the depth of the search.
+        @param disable_gc: if True, the garbage collector is disabled during the search.
+        @return: the best move and the score, None for the move if the game is over.
+        @raises ValueError: if the depth is deeper than the buffers.
+    """
+    def search(self, board: BitBoard, token: int, depth: int, disable_gc: bool = True) -> tuple[int, int]:
+        if depth > self.max_depth:
+            raise ValueError(f"The search is limited to depth {self.max_depth}")
+        if not isinstance(board, self.board_class):
+            board = self.board_class(board.board, board.player_disc, board.computer_disc)
+        for i in range(len(self.killers)):
+            self.killers[i] = -1
+        self.root_depth = depth
+        self.best_move = None
+        self.nodes = 0
+        if disable_gc:
+            with gc_paused():
+                score = self.alpha_beta(board, -INFINITY, INFINITY, depth, token, -1)
+        else:
+            score = self.alpha_beta(board, -INFINITY, INFINITY, depth, token, -1)
+        return self.best_move, score
+
+    """
+        The alpha-beta search of a node, the computer maximizes the score and
+        the player minimizes it.
+        @param board: the board.
+        @param alpha: the alpha value.
+        @param beta: the beta value.
+        @param depth: the remaining depth.
+        @param token: the current token.
+        @param last_move: the column of the last move, -1 at the root.
+        @return: the score.
+    """
+    def alpha_beta(self, board: BitBoard, alpha: int, beta: int, depth: int, token: int, last_move: int) -> int:
+        self.nodes += 1
+        last_disc = self.player_disc if token == self.computer_disc else self.computer_disc
+        if last_move >= 0:
+            won = board.is_winning_move(last_move)
+        else:
+            won = board.is_winner(last_disc)
+        if won:
+            return won_score(board, last_disc)
+        if depth == 0 or board.moves == board.WIDTH * board.HEIGHT:
+            return board.score
+        # Looks up the position, stored the way round of the smaller key as in the MiniMax class
+        table = self.table
+        table_move = -1
+        if table is not None:
+            key, mirror_key = board.key(), board.mirror_key()
+            mirrored = mirror_key < key
+            key = (mirror_key if mirrored else key) << 2 | token
+            entry = table.probe(key)
+            if entry is not None:
+                if entry[4] is not None:
+                    table_move = board.WIDTH - 1 - entry[4] if mirrored else entry[4]
+                if entry[1] >= depth:
+                    if entry[3] == EXACT:
+                        if depth == self.root_depth and table_move >= 0:
+                            self.best_move = table_move
+                        return entry[2]
+                    elif entry[3] == LOWER:
+                        if entry[2] > alpha:
+                            alpha = entry[2]
+                    elif entry[2] < beta:
+                        beta = entry[2]
+                    if alpha >= beta:
+                        if depth == self.root_depth and table_move >= 0:
+                            self.best_move = table_move
+                        return entry[2]
+        low, high = alpha, beta
+        # Fills the buffer of the depth: the killer move, the table move, then the columns closer to the middle
+        moves = self.move_buffers[depth]
+        heights = board.heights
+        height = board.HEIGHT
+        killer = self.killers[depth]
+        count = 0
+        if killer >= 0 and heights[killer] < height:
+            moves[0] = killer
+            count = 1
+        if table_move >= 0 and table_move != killer:
+            moves[count] = table_move
+            count += 1
+        for move in self.column_order:
+            if heights[move] < height and move != killer and move != table_move:
+                moves[count] = move
+                count += 1
+        best_move = moves[0]
+        if token == self.computer_disc:
+            # Maximize
+            score = -INFINITY
+            other = self.player_disc
+            for i in range(count):
+                move = moves[i]
+                board.drop_disc(move, token)
+                child = self.alpha_beta(board, alpha, beta, depth - 1, other, move)
+                board.undo_disc(move)
+                if child > score:
+                    score = child
+                    best_move = move
+                    if score > alpha:
+                        alpha = score
+                        if alpha >= beta:
+                            self.killers[depth] = move
+                            break
+        else:
+            # Minimize
+            score = INFINITY
+            other = self.computer_disc
+            for i in range(count):
+                move = moves[i]
+                board.drop_disc(move, token)
+                child = self.alpha_beta(board, alpha, beta, depth - 1, other, move)
+                board.undo_disc(move)
+                if child < score:
+                    score = child
+                    best_move = move
+                    if score < beta:
+                        beta = score
+                        if beta <= alpha:
+                            self.killers[depth] = move
+                            break
+        if table is not None:
+            # Outside the window the score is only a bound on the value
+            if score <= low:
+                bound = UPPER
+            elif score >= high:
+                bound = LOWER
+            else:
+                bound = EXACT
+            table.store(key, depth, score, bound, board.WIDTH - 1 - best_move if mirrored else best_move)
+        if depth == self.root_depth:
+            self.best_move = best_move
+        return score
@@ -1,5 +1,28 @@
+import argparse
+
 from game import Game
+from geometry import GEOMETRY
 
 if __name__ == "__main__":
-  game = Game()
-  game.run()
+  parser = argparse.ArgumentParser(description="Plays Connect4 against the computer.")
+  parser.add_argument("--server", action="store_true", help="serve many games over TCP instead of playing one")
+  parser.add_argument("--host", default="127.0.0.1", help="the address the server listens on")
+  parser.add_argument("--port", type=int, default=4000, help="the port the server listens on")
+  parser.add_argument("--workers", type=int, default=None, help="the number of worker processes of the server")
+  parser.add_argument("--ponder", action="store_true", help="search the replies while the player thinks")
+  parser.add_argument("--width", type=int, default=GEOMETRY[0], help="the number of columns of the board")
+  parser.add_argument("--height", type=int, default=GEOMETRY[1], help="the number of rows of the board")
+  parser.add_argument("--cache", nargs="?", const=Game.CACHE_PATH, default=None,
+                      help=f"keep the computer's searches between games in an SQLite file, {Game.CACHE_PATH} if none is given")
+  parser.add_argument("--connect", type=int, default=GEOMETRY[2], help="the number of discs in a row that wins")
+  args = parser.parse_args()
+  if args.server:
+    import asyncio
+    from server import run_server
+    try:
+      asyncio.run(run_server(host=args.host, port=args.port, workers=args.workers, cache_path=args.cache))
+    except KeyboardInterrupt:
+      pass
+  else:
+    game = Game(cache_path=args.cache, ponder=args.ponder, geometry=(args.width, args.height, args.connect))
+    game.run()
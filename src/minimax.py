@@ -1,5 +1,13 @@
 
+import time
+
 from board import Board
+from backend import get_board_class, convert_board
+from geometry import GEOMETRY
+from transposition import TranspositionTable, EXACT, LOWER, UPPER
+from vectorized import evaluate_children
+from stats import SearchStats
+from tablebase import Tablebase, search_score, won_score
 
 """
     The MiniMax class.
@@ -15,9 +23,35 @@ from board import Board
     and score.
     
     The algorithm uses alpha-beta pruning to reduce the number of nodes so
-    it can search more profoundly in the game tree.
+    it can search more profoundly in the game tree. With a transposition table,
+    positions reached by different move orders are only searched once.
+
+    The iterative deepening driver searches depth 1, 2, 3, ... until the time
+    budget runs out, and searches the principal variation of each depth first
+    in the next one.
+
+    Given a SearchStats, the search counts its nodes, leaves and cutoffs and
+    times its evaluations and win checks, and reports after each depth of
+    the iterative deepening.
+
+    With the threat pre-pass, a node that can win at once returns that move
+    without searching the others, a node facing a win of the opponent only
+    searches the block, and moves right under a winning cell of the opponent
+    are left out.
+
+    A won position scores past the bound of every heuristic score, plus one
+    for each disc the winner has left, so sooner wins score more. With an
+    endgame tablebase, a position it holds returns its exact result on the
+    same scale instead of being searched. A node whose children the tablebase may hold searches them
+    one by one rather than as a batch of leaves, so each of them is looked up.
 """
 
+"""
+    Raised inside the search when the time budget runs out.
+"""
+class SearchTimeout(Exception):
+    pass
+
 class MiniMax:
 
     """
@@ -25,12 +59,132 @@ class MiniMax:
     """
     player_disc: int
     computer_disc: int
+    # The backend the search runs on, None searches the board it is given,
+    # and the width, height and connect length of the boards searched.
+    backend: str
+    geometry: tuple[int, int, int]
+    board_class: type
+    # The transposition table, None searches without one.
+    table: TranspositionTable
+    # Evaluates the children of the nodes above the horizon in one vectorized pass.
+    batch_leaves: bool
+    # The counters the search fills, None counts nothing.
+    stats: SearchStats
+    # Plays a winning move at once, only searches the block of a win of the
+    # opponent, and leaves out the moves right under a winning cell of the opponent.
+    threats: bool
+    # The endgame tablebase of the standard board, None searches every position.
+    tablebase: Tablebase
+
+    # Move ordering: the columns closer to the middle first, and with dynamic
+    # ordering, the killer moves of each depth and the columns of each disc
+    # kept in order of their history score.
+    move_ordering: bool
+    column_order: list[int]
+    killers: dict[int, list[int]]
+    history: dict[int, list[int]]
+    history_order: dict[int, list[int]]
+
+    # State of the iterative deepening driver: the time the search must stop,
+    # the principal variation of each depth in the current search, and the
+    # principal variation of the previous depth searched first.
+    deadline: float
+    pv_lines: list[tuple[int, ...]]
+    pv_line: tuple[int, ...]
+    follow_pv: bool
+    root_depth: int
 
 
-    def __init__(self, player_disc, computer_disc):
+    def __init__(self, player_disc, computer_disc, backend: str = None, table: TranspositionTable = None, batch_leaves: bool = False,
+                 move_ordering: bool = True, stats: SearchStats = None, threats: bool = False, geometry: tuple[int, int, int] = GEOMETRY,
+                 tablebase: Tablebase = None):
         self.player_disc = player_disc
         self.computer_disc = computer_disc
+        self.backend = backend
+        self.geometry = geometry
+        self.board_class = get_board_class(backend, geometry) if backend is not None else None
+        self.table = table
+        self.batch_leaves = batch_leaves
+        self.move_ordering = move_ordering
+        self.stats = stats
+        self.threats = threats
+        self.tablebase = tablebase
+        # Moves closer to the middle are "better", so they are evaluated first
+        width = geometry[0]
+        self.column_order = sorted(range(width), key=lambda x: abs(x - width//2))
+        self.clear_history()
+        self.deadline = None
+        self.pv_lines = None
+        self.pv_line = ()
+        self.follow_pv = False
+        self.root_depth = 0
         
+    """
+        Forgets the killer moves and the history scores.
+    """
+    def clear_history(self) -> None:
+        self.killers = {}
+        self.history = {self.player_disc: [0] * len(self.column_order), self.computer_disc: [0] * len(self.column_order)}
+        self.history_order = {self.player_disc: list(self.column_order), self.computer_disc: list(self.column_order)}
+
+    """
+        Orders the valid moves of a node, from the most to the least promising.
+        The given moves come first, then the moves that win at once and the
+        moves that block a win of the opponent, then the killer moves of the
+        depth, then the other moves by history score. Without dynamic
+        ordering, the other moves are only ordered closer to the middle first.
+        In a position that is its own mirror, a move and its mirror score the
+        same, so the moves right of the middle are left out.
+
+        @param board: the board.
+        @param token: the current token.
+        @param depth: the depth of the node.
+        @param first_moves: the moves to search first, such as the principal variation and table moves.
+        @return: the ordered moves.
+    """
+    def order_moves(self, board: Board, token: int, depth: int, *first_moves: int) -> list[int]:
+        valid_moves = board.get_valid_moves()
+        if board.is_symmetric():
+            valid_moves = [move for move in valid_moves if move <= len(self.column_order) - 1 - move]
+        ranked_moves = [move for move in first_moves if move is not None and move in valid_moves]
+        if self.move_ordering:
+            # The children of depth 1 are leaves, finding the tactics there costs more than it saves.
+            # With the threat pre-pass the wins and blocks are already handled.
+            if depth >= 2 and not self.threats:
+                other = self.player_disc if token == self.computer_disc else self.computer_disc
+                for move in board.winning_moves(token) + board.winning_moves(other) + self.killers.get(depth, []):
+                    if move not in ranked_moves and move in valid_moves:
+                        ranked_moves.append(move)
+            order = self.history_order[token]
+        else:
+            order = self.column_order
+        for move in order:
+            if move not in ranked_moves and move in valid_moves:
+                ranked_moves.append(move)
+        return ranked_moves
+
+    """
+        Records a move that caused a cutoff as a killer move of its depth
+        and adds to its history score.
+
+        @param move: the move.
+        @param token: the token that played the move.
+        @param depth: the depth of the node.
+    """
+    def record_cutoff(self, move: int, token: int, depth: int) -> None:
+        killers = self.killers.setdefault(depth, [])
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+        history = self.history[token]
+        history[move] += depth * depth
+        # Keeps the columns in order of history score, moving this one up
+        order = self.history_order[token]
+        index = order.index(move)
+        while index > 0 and history[order[index - 1]] < history[move]:
+            order[index - 1], order[index] = order[index], order[index - 1]
+            index -= 1
+
     """
         The MiniMax algorithm with alpha-beta pruning
         to find the best move for the computer.
@@ -40,47 +194,235 @@ class MiniMax:
         @param beta: the beta value.
         @param depth: the depth of the search.
         @param token: the current token.
+        @param last_move: the column of the last move, only the lines through it are checked for a win.
         @return: the best move and the score.
+        @raises SearchTimeout: if the deadline is set and has passed.
     """
 
-    def mini_max(self, board: Board, alpha: float, beta: float, depth: int, token: int) -> tuple[int, int]:
+    def mini_max(self, board: Board, alpha: float, beta: float, depth: int, token: int, last_move: int = None) -> tuple[int, int]:
+        # The board is converted once at the root, the children then share its backend.
+        if self.board_class is not None and not isinstance(board, self.board_class):
+            board = convert_board(board, self.backend)
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+        if self.pv_lines is not None:
+            self.pv_lines[depth] = ()
+        stats = self.stats
+        if stats is not None:
+            stats.add_node(depth)
+            start = time.perf_counter()
         # Only need to check if there's a winner of one of the discs as
         # the player who played the last move is the only one who can win
         last_disc = self.player_disc if token == self.computer_disc else self.computer_disc
-        if depth == 0 or board.is_board_full() or board.is_winner(last_disc):
+        if last_move is not None:
+            won = board.is_winning_move(last_move)
+        else:
+            won = board.is_winner(last_disc)
+        if stats is not None:
+            stats.winner_time += time.perf_counter() - start
+        # A position of the tablebase is solved, whatever the depth left
+        if self.tablebase is not None and not won and self.tablebase.covers(board.count_discs()):
+            entry = self.tablebase.lookup(board, token)
+            if entry is not None:
+                if stats is not None:
+                    stats.leaves += 1
+                if self.pv_lines is not None:
+                    self.pv_lines[depth] = (entry[0],)
+                return entry[0], search_score(board, token, entry[1])
+        if won:
+            if stats is not None:
+                stats.leaves += 1
+            return None, won_score(board, last_disc)
+        if depth == 0 or board.is_board_full():
+            if stats is not None:
+                start = time.perf_counter()
+                score = board.evaluate()
+                stats.evaluate_time += time.perf_counter() - start
+                stats.leaves += 1
+                return None, score
             return None, board.evaluate()
         else:
-            # Sort valid moves by a heuristic
-            # Heuristic: the closer to the middle, the better
-            moves = board.get_valid_moves()
-            # Moves closers to the middle are "better", so they are evaluated first
-            ranked_moves = sorted(moves, key=lambda x: abs(x - board.WIDTH//2))
+            # The threat pre-pass: a winning move is played at once and a win of
+            # the opponent must be blocked, so the other moves aren't searched.
+            # The children of depth 1 are leaves, as in the move ordering.
+            allowed_moves = None
+            if self.threats and depth >= 2:
+                wins = board.winning_moves(token)
+                if wins:
+                    move = wins[0]
+                    board.drop_disc(move, token)
+                    score = self.mini_max(board, alpha, beta, depth-1, last_disc, move)[1]
+                    board.undo_disc(move)
+                    self.follow_pv = False
+                    if self.pv_lines is not None:
+                        self.pv_lines[depth] = (move,)
+                    return move, score
+                blocks = board.winning_moves(last_disc)
+                if blocks:
+                    # With two threats every move loses, blocking one is as good as any other move
+                    allowed_moves = blocks[:1]
+                else:
+                    # A move right under a winning cell of the opponent loses at once,
+                    # unless every move does
+                    losing_moves = board.moves_under_threats(token)
+                    if losing_moves:
+                        allowed_moves = [move for move in board.get_valid_moves() if move not in losing_moves] or None
+            # Looks up the position, a deep enough entry gives the score or narrows the window
+            table_move = None
+            if self.table is not None:
+                # A position and its mirror share an entry, stored the way round of the smaller key
+                key, mirror_key = board.key(), board.mirror_key()
+                mirrored = mirror_key < key
+                key = (mirror_key if mirrored else key) << 2 | token
+                entry = self.table.probe(key)
+                if entry is not None:
+                    table_move = entry[4]
+                    if mirrored and table_move is not None:
+                        table_move = len(self.column_order) - 1 - table_move
+                    if entry[1] >= depth:
+                        if entry[3] == EXACT:
+                            return table_move, entry[2]
+                        elif entry[3] == LOWER:
+                            alpha = max(alpha, entry[2])
+                        else:
+                            beta = min(beta, entry[2])
+                        if alpha >= beta:
+                            return table_move, entry[2]
+            window = (alpha, beta)
+            # On the principal variation of the previous depth, its move is searched first
+            pv_move = None
+            if self.follow_pv:
+                ply = self.root_depth - depth
+                if ply < len(self.pv_line):
+                    pv_move = self.pv_line[ply]
+                else:
+                    self.follow_pv = False
+            ranked_moves = self.order_moves(board, token, depth, pv_move, table_move)
+            if allowed_moves is not None:
+                ranked_moves = [move for move in ranked_moves if move in allowed_moves]
             best_move = ranked_moves[0]
-            if token == self.computer_disc:
+            # The children the tablebase may hold are looked up, not evaluated
+            children_solved = self.tablebase is not None and self.tablebase.covers(board.count_discs() + 1)
+            if self.batch_leaves and depth == 1 and not children_solved:
+                # The children are all leaves, so they are evaluated together
+                if stats is not None:
+                    start = time.perf_counter()
+                scores = evaluate_children(board, ranked_moves, token)
+                # The children that won are scored as won positions, one more disc on the board
+                for move in board.winning_moves(token):
+                    if move in ranked_moves:
+                        board.drop_disc(move, token)
+                        scores[ranked_moves.index(move)] = won_score(board, token)
+                        board.undo_disc(move)
+                if stats is not None:
+                    stats.evaluate_time += time.perf_counter() - start
+                    stats.add_node(0, len(ranked_moves))
+                    stats.leaves += len(ranked_moves)
+                index = scores.argmax() if token == self.computer_disc else scores.argmin()
+                best_move, score = ranked_moves[index], int(scores[index])
+                if self.pv_lines is not None:
+                    self.pv_lines[depth] = (best_move,)
+            elif token == self.computer_disc:
                 # Maximize
                 score = -float('inf')
                 for move in ranked_moves:
                     board.drop_disc(move, token) 
-                    new_score = max(score, self.mini_max(board, alpha, beta, depth-1, self.player_disc)[1])
+                    new_score = max(score, self.mini_max(board, alpha, beta, depth-1, self.player_disc, move)[1])
                     board.undo_disc(move)
+                    self.follow_pv = False
                     if new_score > score:
                         score = new_score
                         best_move = move
+                        if self.pv_lines is not None:
+                            self.pv_lines[depth] = (move,) + self.pv_lines[depth-1]
                     alpha = max(alpha, score)
                     if alpha >= beta:
+                        if stats is not None:
+                            stats.add_cutoff(move == ranked_moves[0])
+                        if self.move_ordering:
+                            self.record_cutoff(move, token, depth)
                         break
-                return best_move, score
             else:
                 # Minimize
                 score = float('inf')
                 for move in ranked_moves:
                     board.drop_disc(move, token)
-                    new_score = min(score, self.mini_max(board, alpha, beta, depth-1, self.computer_disc)[1])
+                    new_score = min(score, self.mini_max(board, alpha, beta, depth-1, self.computer_disc, move)[1])
                     board.undo_disc(move)
+                    self.follow_pv = False
                     if new_score < score:
                         score = new_score
                         best_move = move
+                        if self.pv_lines is not None:
+                            self.pv_lines[depth] = (move,) + self.pv_lines[depth-1]
                     beta = min(beta, score)
                     if beta <= alpha:
+                        if stats is not None:
+                            stats.add_cutoff(move == ranked_moves[0])
+                        if self.move_ordering:
+                            self.record_cutoff(move, token, depth)
                         break
-                return best_move, score
+            if self.table is not None:
+                # Outside the window the score is only a bound on the value
+                if score <= window[0]:
+                    bound = UPPER
+                elif score >= window[1]:
+                    bound = LOWER
+                else:
+                    bound = EXACT
+                self.table.store(key, depth, score, bound, len(self.column_order) - 1 - best_move if mirrored else best_move)
+            return best_move, score
+
+    """
+        Stops a search running in another thread, which raises SearchTimeout at
+        its next node. The iterative deepening clears the deadline when it returns,
+        so a search started after that isn't stopped.
+    """
+    def stop(self) -> None:
+        self.deadline = 0.0
+
+    """
+        Searches deeper and deeper until the time budget runs out.
+        Each depth searches the principal variation of the previous depth first.
+
+        @param board: the board.
+        @param token: the current token.
+        @param max_depth: the deepest search.
+        @param time_budget_ms: the time budget in milliseconds, None searches to the max depth.
+        @return: the best move and the score of the deepest completed search, and its depth.
+    """
+    def iterative_deepening(self, board: Board, token: int, max_depth: int, time_budget_ms: float = None) -> tuple[int, int, int]:
+        # The search works on a copy, as a timeout leaves the discs of the aborted line on the board
+        if self.board_class is not None and not isinstance(board, self.board_class):
+            board = convert_board(board, self.backend)
+        else:
+            board = board.copy()
+        start = time.perf_counter()
+        self.clear_history()
+        best_move, score, completed = None, board.evaluate(), 0
+        self.pv_line = ()
+        try:
+            for depth in range(1, max_depth + 1):
+                # Depth 1 always completes, so there is always a move
+                if time_budget_ms is not None and depth > 1:
+                    self.deadline = start + time_budget_ms / 1000
+                self.root_depth = depth
+                self.follow_pv = True
+                self.pv_lines = [()] * (depth + 1)
+                try:
+                    move, new_score = self.mini_max(board, -float('inf'), float('inf'), depth, token)
+                except SearchTimeout:
+                    break
+                best_move, score, completed = move, new_score, depth
+                self.pv_line = self.pv_lines[depth]
+                if self.stats is not None:
+                    self.stats.report(depth)
+                # The game is over
+                if move is None:
+                    break
+        finally:
+            self.deadline = None
+            self.pv_lines = None
+            self.pv_line = ()
+            self.follow_pv = False
+        return best_move, score, completed
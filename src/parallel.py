@@ -0,0 +1,118 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from board import Board
+from geometry import GEOMETRY
+from minimax import MiniMax
+from tablebase import won_score
+from transposition import TranspositionTable
+from workers import preload_backend, worker_context
+
+# The MiniMax of a worker process, made once by init_worker.
+worker_minimax : MiniMax = None
+
+"""
+    Sets up the MiniMax of a worker process. Each worker keeps its own
+    transposition table between the moves it searches.
+    @param player_disc: the player's disc.
+    @param computer_disc: the computer's disc.
+    @param backend: the backend the workers search on.
+    @param table_size: the number of slots of the table of each worker, None for no table.
+    @param geometry: the width, the height and the connect length of the boards.
+"""
+def init_worker(player_disc: int, computer_disc: int, backend: str, table_size: int, geometry: tuple[int, int, int] = GEOMETRY) -> None:
+    global worker_minimax
+    table = TranspositionTable(table_size) if table_size is not None else None
+    worker_minimax = MiniMax(player_disc, computer_disc, backend, table, geometry=geometry)
+
+"""
+    Searches one root move in a worker process.
+    @param board: the board before the move.
+    @param move: the root move.
+    @param depth: the depth of the search from the root.
+    @param token: the token playing the root move.
+    @param alpha: the alpha value.
+    @param beta: the beta value.
+    @return: the score of the move.
+"""
+def search_root_move(board: Board, move: int, depth: int, token: int, alpha: float, beta: float) -> int:
+    board.drop_disc(move, token)
+    next_token = worker_minimax.player_disc if token == worker_minimax.computer_disc else worker_minimax.computer_disc
+    return worker_minimax.mini_max(board, alpha, beta, depth - 1, next_token, move)[1]
+
+"""
+    The ParallelMiniMax class.
+    The class splits the root moves of the MiniMax search across worker processes,
+    as the GIL keeps threads from searching at the same time.
+
+    The first root move is searched in this process to get a bound, then the other
+    moves are searched in parallel against that bound. A move is only chosen
+    when it beats every move before it in the same order as the serial search,
+    so the best move is the same as the serial search at the same depth.
+"""
+class ParallelMiniMax:
+
+    """
+        Attributes of the ParallelMiniMax class.
+    """
+    player_disc: int
+    computer_disc: int
+    workers: int
+    minimax: MiniMax
+    executor: ProcessPoolExecutor
+
+    def __init__(self, player_disc: int, computer_disc: int, workers: int = None, backend: str = "bitboard", table_size: int = None,
+                 geometry: tuple[int, int, int] = GEOMETRY):
+        self.player_disc = player_disc
+        self.computer_disc = computer_disc
+        self.workers = workers or os.cpu_count() or 1
+        table = TranspositionTable(table_size) if table_size is not None else None
+        self.minimax = MiniMax(player_disc, computer_disc, backend, table, geometry=geometry)
+        preload_backend(backend)
+        self.executor = ProcessPoolExecutor(self.workers, worker_context(), initializer=init_worker,
+                                            initargs=(player_disc, computer_disc, backend, table_size, geometry))
+
+    def __enter__(self) -> "ParallelMiniMax":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    """
+        Shuts down the worker processes.
+    """
+    def close(self) -> None:
+        self.executor.shutdown()
+
+    """
+        Finds the best move with the root moves searched in parallel.
+        @param board: the board.
+        @param depth: the depth of the search.
+        @param token: the current token.
+        @return: the best move and the score.
+    """
+    def mini_max(self, board: Board, depth: int, token: int) -> tuple[int, int]:
+        last_disc = self.player_disc if token == self.computer_disc else self.computer_disc
+        if board.is_winner(last_disc):
+            return None, won_score(board, last_disc)
+        if depth == 0 or board.is_board_full():
+            return None, board.evaluate()
+        # Same order as a serial search that starts without killer moves or history
+        self.minimax.clear_history()
+        ranked_moves = self.minimax.order_moves(board, token, depth)
+        next_token = self.player_disc if token == self.computer_disc else self.computer_disc
+        maximize = token == self.computer_disc
+
+        # The eldest move is searched here, the others only need to beat it
+        best_move = ranked_moves[0]
+        board.drop_disc(best_move, token)
+        score = self.minimax.mini_max(board, -float('inf'), float('inf'), depth - 1, next_token, best_move)[1]
+        board.undo_disc(best_move)
+        alpha, beta = (score, float('inf')) if maximize else (-float('inf'), score)
+        futures = [self.executor.submit(search_root_move, board, move, depth, token, alpha, beta) for move in ranked_moves[1:]]
+        for move, future in zip(ranked_moves[1:], futures):
+            new_score = future.result()
+            if (maximize and new_score > score) or (not maximize and new_score < score):
+                score = new_score
+                best_move = move
+        return best_move, score
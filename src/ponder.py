@@ -0,0 +1,96 @@
+import threading
+
+from book import book_key, canonical_move
+from minimax import MiniMax
+
+"""
+    The Ponderer class.
+    The class searches on the opponent's time: once the computer has moved,
+    a background thread searches the position after each likely reply of the
+    player, most likely first, while the player thinks. When the player's move
+    was searched to the full depth, its result is the computer's move at once,
+    otherwise the search of the move starts with the entries the pondering
+    left in the transposition table.
+
+    The waiting thread blocks on the player's input, which releases the GIL,
+    so the pondering thread gets the CPU. The ponderer has its own MiniMax,
+    which only shares the transposition table with the MiniMax of the game.
+"""
+class Ponderer:
+
+    """
+        Attributes of the Ponderer class.
+    """
+    minimax: MiniMax
+    depth: int
+    # The result of each position searched to the full depth, by the key of the opening book,
+    # so the result of a position is found for its mirror too.
+    results: dict[int, tuple[int, int, int]]
+    thread: threading.Thread
+    stopped: threading.Event
+
+    def __init__(self, minimax: MiniMax, depth: int):
+        self.minimax = minimax
+        self.depth = depth
+        self.results = {}
+        self.thread = None
+        self.stopped = threading.Event()
+
+    """
+        Starts pondering the replies of a position, after stopping the pondering before.
+        @param board: the board after the computer's move, which the pondering doesn't change.
+        @param token: the disc of the player, who moves next.
+    """
+    def start(self, board, token: int) -> None:
+        self.stop()
+        self.results = {}
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.ponder, args=(board.copy(), token, self.stopped), daemon=True)
+        self.thread.start()
+
+    """
+        Searches the position after each reply, most likely first, until it is stopped.
+        @param board: a copy of the board.
+        @param token: the disc of the player.
+        @param stopped: the event set when the pondering must stop.
+    """
+    def ponder(self, board, token: int, stopped: threading.Event) -> None:
+        next_token = self.minimax.player_disc if token == self.minimax.computer_disc else self.minimax.computer_disc
+        for move in self.minimax.order_moves(board, token, self.depth):
+            if stopped.is_set():
+                return
+            board.drop_disc(move, token)
+            if not board.is_winning_move(move) and not board.is_board_full():
+                result = self.minimax.iterative_deepening(board, next_token, self.depth)
+                if result[2] == self.depth:
+                    move_found, score, depth = result
+                    self.results[book_key(board, next_token)] = (canonical_move(board, move_found), score, depth)
+            board.undo_disc(move)
+
+    """
+        Stops the pondering and waits for its thread. The results found so far are kept.
+        The search is only stopped while the thread runs, and its deadline is cleared
+        once the thread is done, as a stop that lands after the last search would
+        otherwise stop the first search of the next pondering.
+    """
+    def stop(self) -> None:
+        if self.thread is not None:
+            self.stopped.set()
+            if self.thread.is_alive():
+                self.minimax.stop()
+            self.thread.join()
+            self.minimax.deadline = None
+            self.thread = None
+
+    """
+        Gets the result of a position searched to the full depth.
+        @param board: the board.
+        @param token: the disc to move.
+        @return: the best move, the score and the depth, or None if the position wasn't searched to the full depth.
+    """
+    def lookup(self, board, token: int) -> tuple[int, int, int]:
+        result = self.results.get(book_key(board, token))
+        if result is None:
+            return None
+        move, score, depth = result
+        return canonical_move(board, move), score, depth
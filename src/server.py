@@ -0,0 +1,306 @@
+import asyncio
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from bitboard import BitBoard
+from book import open_book
+from game import Game
+from tablebase import open_tablebase
+from workers import preload_backend, worker_context
+
+"""
+    The game server.
+    Many games are played at once over TCP, one JSON object per line in each
+    direction. Each request may carry an "id", which is sent back with its
+    response. The requests are:
+    - {"op": "new", "computer_first": false}: starts a game.
+    - {"op": "move", "game": 1, "column": 3, "time_budget_ms": 500}: plays the
+      player's move, then the computer's move unless the game is over.
+    - {"op": "state", "game": 1}: gets the board of a game.
+    - {"op": "close", "game": 1}: ends a game.
+    Each response has the game, its board and its status, "playing",
+    "player_wins", "computer_wins" or "draw", and the computer's move when
+    it played one. A request that fails gets {"error": "..."} instead, and
+    leaves the games as they were: a new game is only kept once the
+    computer's first move was played, and a player's move is taken back when
+    the computer's move fails.
+
+    The games of a connection belong to it and end when it closes, and a
+    connection handles its requests one at a time. The searches run in a
+    bounded pool of worker processes, so the event loop never waits on one.
+    The workers are forked where possible, with the book and the endgame
+    tablebase already mapped.
+    When every worker is busy and max_queue moves already wait for one, a
+    move is refused with a busy error rather than queued.
+"""
+
+# The Game of a worker process, made once by init_worker.
+worker_game : Game = None
+
+"""
+    Sets up the Game of a worker process, which keeps its transposition table
+    between the moves it searches.
+    @param book_path: the file of the opening book, None for no book.
+    @param cache_path: the file of the analysis cache, None for no cache.
+"""
+def init_worker(book_path: str, cache_path: str) -> None:
+    global worker_game
+    worker_game = Game("bitboard", book_path, cache_path)
+
+"""
+    Finds the computer's move in a worker process.
+    @param board: the board of the game.
+    @param time_budget_ms: the time budget of the search.
+    @return: the move, the score, the depth of the search and where the move came from.
+"""
+def search_move(board: BitBoard, time_budget_ms: int) -> tuple[int, int, int, str]:
+    worker_game.board = board
+    return worker_game.find_computer_move(time_budget_ms)
+
+"""
+    The GameSession class.
+    The class holds the state of one game of the server.
+"""
+class GameSession:
+
+    """
+        Attributes of the GameSession class.
+    """
+    id: int
+    board: BitBoard
+    status: str
+
+    def __init__(self, id: int, player_disc: int, computer_disc: int):
+        self.id = id
+        self.board = BitBoard(None, player_disc, computer_disc)
+        self.status = "playing"
+
+    """
+        Updates the status of the game after a move.
+        @param disc: the disc that played the move.
+        @param column: the column of the move.
+    """
+    def update_status(self, disc: int, column: int) -> None:
+        if self.board.is_winning_move(column):
+            self.status = "player_wins" if disc == self.board.player_disc else "computer_wins"
+        elif self.board.is_board_full():
+            self.status = "draw"
+
+    """
+        Gets the state of the game for a response.
+        @return: the game, its board and its status.
+    """
+    def describe(self) -> dict:
+        return {"game": self.id, "board": self.board.board.tolist(), "status": self.status}
+
+"""
+    The GameServer class.
+    The class serves the games of many connections with one event loop.
+"""
+class GameServer:
+
+    """
+        Attributes of the GameServer class.
+    """
+    host: str
+    port: int
+    workers: int
+    # The longest time budget of a search, a request can only ask for less.
+    time_budget_ms: int
+    max_sessions: int
+    max_queue: int
+    book_path: str
+    cache_path: str
+
+    sessions: dict[int, GameSession]
+    ids: itertools.count
+    executor: ProcessPoolExecutor
+    server: asyncio.Server
+    # One slot per worker, and the number of moves waiting for a slot.
+    slots: asyncio.Semaphore
+    waiting: int
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 4000, workers: int = None, time_budget_ms: int = Game.TIME_BUDGET_MS,
+                 max_sessions: int = 10000, max_queue: int = None, book_path: str = Game.BOOK_PATH, cache_path: str = None):
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.time_budget_ms = time_budget_ms
+        self.max_sessions = max_sessions
+        self.max_queue = max_queue if max_queue is not None else 4 * self.workers
+        self.book_path = book_path if book_path is not None and os.path.exists(book_path) else None
+        self.cache_path = cache_path
+        self.sessions = {}
+        self.ids = itertools.count(1)
+        self.executor = None
+        self.server = None
+        self.waiting = 0
+
+    async def __aenter__(self) -> "GameServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    """
+        Starts the worker processes and listens for connections.
+        With port 0, the port chosen by the system is stored in the port attribute.
+    """
+    async def start(self) -> None:
+        self.slots = asyncio.Semaphore(self.workers)
+        # The workers are forked with the modules and the book of this process
+        preload_backend("bitboard")
+        if self.book_path is not None:
+            open_book(self.book_path)
+        if os.path.exists(Game.TABLEBASE_PATH):
+            open_tablebase(Game.TABLEBASE_PATH)
+        self.executor = ProcessPoolExecutor(self.workers, worker_context(), initializer=init_worker, initargs=(self.book_path, self.cache_path))
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    """
+        Serves connections until the server is closed.
+    """
+    async def serve_forever(self) -> None:
+        await self.server.serve_forever()
+
+    """
+        Stops listening and shuts down the worker processes.
+    """
+    async def close(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+        self.executor.shutdown()
+
+    """
+        Handles the requests of a connection, one at a time.
+        @param reader: the stream of the requests.
+        @param writer: the stream of the responses.
+    """
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        games = set()
+        try:
+            while line := await reader.readline():
+                request = None
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("A request must be a JSON object")
+                    response = await self.handle_request(request, games)
+                except (ValueError, KeyError, TypeError) as error:
+                    response = {"error": str(error)}
+                if isinstance(request, dict) and "id" in request:
+                    response["id"] = request["id"]
+                writer.write((json.dumps(response) + "\n").encode())
+                # Waits while the client doesn't read its responses
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for id in games:
+                self.sessions.pop(id, None)
+            writer.close()
+
+    """
+        Handles a request.
+        @param request: the request.
+        @param games: the games of the connection.
+        @return: the response.
+        @raises ValueError: if the request isn't valid or the server is busy.
+        @raises KeyError: if a field of the request is missing.
+    """
+    async def handle_request(self, request: dict, games: set[int]) -> dict:
+        op = request.get("op")
+        if op == "new":
+            if len(self.sessions) >= self.max_sessions:
+                raise ValueError("Too many games")
+            session = GameSession(next(self.ids), 1, 2)
+            time_budget_ms = self.time_budget(request)
+            response = await self.play_computer_move(session, time_budget_ms) if request.get("computer_first", False) else session.describe()
+            self.sessions[session.id] = session
+            games.add(session.id)
+            return response
+        if op not in ["move", "state", "close"]:
+            raise ValueError(f"Unknown op: {op}")
+        id = request["game"]
+        if id not in games:
+            raise ValueError(f"Unknown game: {id}")
+        session = self.sessions[id]
+        if op == "state":
+            return session.describe()
+        if op == "close":
+            games.discard(id)
+            del self.sessions[id]
+            return {"game": id, "status": "closed"}
+        if session.status != "playing":
+            raise ValueError("The game is over")
+        column = request["column"]
+        if not isinstance(column, int) or isinstance(column, bool):
+            raise ValueError(f"Invalid column: {column}")
+        time_budget_ms = self.time_budget(request)
+        session.board.drop_disc(column, session.board.player_disc)
+        try:
+            session.update_status(session.board.player_disc, column)
+            if session.status != "playing":
+                return session.describe()
+            return await self.play_computer_move(session, time_budget_ms)
+        except BaseException:
+            # Whatever failed, the player can play the move again
+            session.board.undo_disc(column)
+            session.status = "playing"
+            raise
+
+    """
+        Gets the time budget of the computer's move of a request, at most the budget of the server.
+        @param request: the request, which may ask for a shorter time budget.
+        @return: the time budget in milliseconds.
+        @raises ValueError: if the time budget isn't a number of milliseconds.
+    """
+    def time_budget(self, request: dict) -> float:
+        time_budget_ms = request.get("time_budget_ms", self.time_budget_ms)
+        if not isinstance(time_budget_ms, (int, float)) or isinstance(time_budget_ms, bool) or not 0 <= time_budget_ms < float('inf'):
+            raise ValueError(f"Invalid time budget: {time_budget_ms}")
+        return min(time_budget_ms, self.time_budget_ms)
+
+    """
+        Plays the computer's move of a game, searched in the worker processes.
+        @param session: the game.
+        @param time_budget_ms: the time budget of the search in milliseconds.
+        @return: the state of the game with the computer's move.
+        @raises ValueError: if every worker is busy and the queue is full, or the search failed in its worker.
+    """
+    async def play_computer_move(self, session: GameSession, time_budget_ms: float) -> dict:
+        if self.slots.locked() and self.waiting >= self.max_queue:
+            raise ValueError("Server busy, try again later")
+        self.waiting += 1
+        try:
+            await self.slots.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            loop = asyncio.get_running_loop()
+            move, score, depth, source = await loop.run_in_executor(self.executor, search_move, session.board, time_budget_ms)
+        except BrokenProcessPool as error:
+            raise ValueError(f"The search workers stopped: {error}") from error
+        except Exception as error:
+            raise ValueError(f"The search failed: {error}") from error
+        finally:
+            self.slots.release()
+        session.board.drop_disc(move, session.board.computer_disc)
+        session.update_status(session.board.computer_disc, move)
+        response = session.describe()
+        response.update({"computer_move": move, "score": score, "depth": depth, "source": source})
+        return response
+
+"""
+    Runs a server until it is interrupted.
+    @param options: the options of the GameServer.
+"""
+async def run_server(**options) -> None:
+    async with GameServer(**options) as server:
+        print(f"Serving games on {server.host}:{server.port}")
+        await server.serve_forever()
@@ -0,0 +1,234 @@
+from bitboard import BitBoard, winning_cells
+from transposition import TranspositionTable, UPPER
+
+"""
+    The Solver class.
+    The class solves a position exactly, rather than scoring it with a
+    heuristic at a fixed depth like the MiniMax class.
+
+    The solver uses negamax: the score of a position is from the side of the
+    disc to move, and the score of a move is minus the score of the position it
+    leads to. It only asks whether the score is above a value, a null window
+    search, and narrows the value down like a binary search on the score. Moves
+    are generated on the bitboard, and the upper bounds it finds are kept in a
+    transposition table.
+
+    The score is 0 for a draw, positive if the disc to move wins and negative if
+    it loses. The sooner the win, the larger the score: a win with the last disc
+    of the winner scores 1, and each disc the winner has left when it wins adds 1.
+
+    The position is kept as the mask of the discs of the side to move and the
+    mask of all discs, in the layout of the BitBoard. A position and its mirror
+    have the same score, so the table keeps them under one key, the smaller
+    of their two keys, as the book, the cache and the tablebase do.
+"""
+class Solver:
+
+    # Dimensions of the board.
+    WIDTH : int = BitBoard.WIDTH
+    HEIGHT : int = BitBoard.HEIGHT
+    H1 : int = BitBoard.H1
+    CELLS : int = WIDTH * HEIGHT
+
+    # Masks of the bottom row and of every cell of the board.
+    bottom_mask : int = BitBoard.bottom_mask
+    board_mask : int = BitBoard.board_mask
+
+    # The columns, closer to the middle first.
+    column_order : list[int] = sorted(range(WIDTH), key=lambda x: abs(x - BitBoard.WIDTH // 2))
+
+    # The mask of each column left of the middle with the shift to its mirror column, and the mask of the middle column.
+    mirror_shifts : list[tuple[int, int]] = [(((1 << BitBoard.H1) - 1) << (column * BitBoard.H1), (BitBoard.WIDTH - 1 - 2 * column) * BitBoard.H1)
+                                              for column in range(WIDTH // 2)]
+    middle_mask : int = ((1 << H1) - 1) << (WIDTH // 2 * H1) if WIDTH % 2 else 0
+
+    table: TranspositionTable
+    nodes: int
+
+    def __init__(self, table_size: int = 1 << 20):
+        self.table = TranspositionTable(table_size)
+        self.nodes = 0
+
+    """
+        Gets the mask of a column.
+        @param column: the column.
+        @return: the mask of every cell of the column.
+    """
+    def column_mask(self, column: int) -> int:
+        return ((1 << self.HEIGHT) - 1) << (column * self.H1)
+
+    """
+        Gets the key of a position in the table, shared with its mirror. The
+        columns of a key are independent, so the key of the mirror is the key
+        with each column swapped with its mirror column.
+        @param position: the mask of the discs of the side to move.
+        @param mask: the mask of all discs.
+        @return: the smaller of the keys of the position and of its mirror.
+    """
+    def table_key(self, position: int, mask: int) -> int:
+        key = position + mask
+        mirror_key = key & self.middle_mask
+        for column_mask, shift in self.mirror_shifts:
+            mirror_key |= (key & column_mask) << shift | (key >> shift) & column_mask
+        return min(key, mirror_key)
+
+    """
+        Gets the empty cells where a disc would complete four in a row.
+        @param position: the mask of the discs.
+        @param mask: the mask of all discs.
+        @return: the mask of the cells.
+    """
+    def winning_cells(self, position: int, mask: int) -> int:
+        return winning_cells(position, mask, self.H1, self.board_mask)
+
+    """
+        Gets the cells a disc can be dropped in.
+        @param mask: the mask of all discs.
+        @return: the mask of the lowest empty cell of each column that isn't full.
+    """
+    def possible(self, mask: int) -> int:
+        return (mask + self.bottom_mask) & self.board_mask
+
+    """
+        Gets the moves that don't let the opponent win on the next move.
+        @param position: the mask of the discs of the side to move.
+        @param mask: the mask of all discs.
+        @return: the mask of the moves, 0 if every move loses.
+    """
+    def non_losing_moves(self, position: int, mask: int) -> int:
+        possible = self.possible(mask)
+        opponent_win = self.winning_cells(position ^ mask, mask)
+        forced = possible & opponent_win
+        if forced:
+            # Two threats at once can't both be blocked
+            if forced & (forced - 1):
+                return 0
+            possible = forced
+        # A disc right under a winning cell of the opponent lets them play it
+        return possible & ~(opponent_win >> 1)
+
+    """
+        The negamax search with alpha-beta pruning, for a position where the
+        side to move can't win on this move.
+        @param position: the mask of the discs of the side to move.
+        @param mask: the mask of all discs.
+        @param moves: the number of discs played.
+        @param alpha: the alpha value.
+        @param beta: the beta value.
+        @return: the score if it is inside the window, otherwise a bound beyond the window.
+    """
+    def negamax(self, position: int, mask: int, moves: int, alpha: int, beta: int) -> int:
+        self.nodes += 1
+        next_moves = self.non_losing_moves(position, mask)
+        if next_moves == 0:
+            return -((self.CELLS - moves) // 2)
+        # Only the last two discs are left and none of them wins
+        if moves >= self.CELLS - 2:
+            return 0
+        # The opponent can't win on their next move
+        low = -((self.CELLS - 2 - moves) // 2)
+        if alpha < low:
+            alpha = low
+            if alpha >= beta:
+                return alpha
+        # The side to move can't win on this move
+        high = (self.CELLS - 1 - moves) // 2
+        key = self.table_key(position, mask)
+        entry = self.table.probe(key)
+        if entry is not None:
+            high = entry[2]
+        if beta > high:
+            beta = high
+            if alpha >= beta:
+                return beta
+        # Moves that make more winning cells are searched first
+        ranked_moves = []
+        for column in self.column_order:
+            move = next_moves & self.column_mask(column)
+            if move:
+                threats = bin(self.winning_cells(position | move, mask)).count("1")
+                ranked_moves.append((threats, move))
+        ranked_moves.sort(key=lambda x: -x[0])
+        for _, move in ranked_moves:
+            score = -self.negamax(position ^ mask, mask | move, moves + 1, -beta, -alpha)
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        self.table.store(key, 0, alpha, UPPER, None)
+        return alpha
+
+    """
+        Finds the score of a position with null window searches.
+        @param position: the mask of the discs of the side to move.
+        @param mask: the mask of all discs.
+        @param moves: the number of discs played.
+        @return: the score.
+    """
+    def score(self, position: int, mask: int, moves: int) -> int:
+        if self.winning_cells(position, mask) & self.possible(mask):
+            return (self.CELLS + 1 - moves) // 2
+        low = -((self.CELLS - moves) // 2)
+        high = (self.CELLS + 1 - moves) // 2
+        while low < high:
+            middle = low + (high - low) // 2
+            # Tries values closer to 0 first, they are faster to refute
+            if middle <= 0 and -(-low // 2) < middle:
+                middle = -(-low // 2)
+            elif middle >= 0 and high // 2 > middle:
+                middle = high // 2
+            result = self.negamax(position, mask, moves, middle, middle + 1)
+            if result <= middle:
+                high = result
+            else:
+                low = result
+        return low
+
+    """
+        Solves a position.
+        @param board: the board, any backend.
+        @param token: the disc to move.
+        @return: the best move and the score, None for the move if the game is over.
+    """
+    def solve(self, board, token: int) -> tuple[int, int]:
+        if not isinstance(board, BitBoard):
+            board = BitBoard(board.board, board.player_disc, board.computer_disc)
+        other = 2 if token == 1 else 1
+        if board.is_winner(other):
+            return None, -((self.CELLS + 2 - board.moves) // 2)
+        if board.is_board_full():
+            return None, 0
+        position, mask = board.discs[token], board.discs[1] | board.discs[2]
+        score = self.score(position, mask, board.moves)
+        wins = self.winning_cells(position, mask) & self.possible(mask)
+        next_moves = self.non_losing_moves(position, mask)
+        for column in self.column_order:
+            move = self.possible(mask) & self.column_mask(column)
+            if not move:
+                continue
+            if wins:
+                if wins & move:
+                    return column, score
+            # Every move loses at once, any of them will do
+            elif next_moves == 0:
+                return column, score
+            # The best move is the first one whose position scores at most minus the score
+            elif next_moves & move and -self.negamax(position ^ mask, mask | move, board.moves + 1, -score, -score + 1) >= score:
+                return column, score
+        return None, score
+
+    """
+        Gets the number of plies left until the end of a solved game.
+        @param score: the score of the position.
+        @param moves: the number of discs played.
+        @return: the plies until the winning disc is played, or until the board is full for a draw.
+    """
+    def plies_to_end(self, score: int, moves: int) -> int:
+        if score == 0:
+            return self.CELLS - moves
+        # The disc that wins is the (CELLS + 1) // 2 - |score| + 1 th of its side
+        winner_moves = moves if score > 0 else moves + 1
+        last = self.CELLS + 1 - 2 * abs(score)
+        if last % 2 != winner_moves % 2:
+            last -= 1
+        return last - moves + 1
@@ -0,0 +1,107 @@
+"""
+    The SearchStats class.
+    The class counts what a MiniMax search does, to find out where the time
+    of a move goes. A MiniMax only fills it when it is given one, so a search
+    without stats only pays a check of None at each node.
+
+    The counters add up over every search until clear() is called:
+    - nodes: the calls of mini_max, and the children evaluated together by batch_leaves.
+    - leaves: the nodes scored with evaluate, at the horizon or at the end of the game.
+    - cutoffs: the nodes whose search stopped early, and first_move_cutoffs,
+      those that stopped at their first move, a measure of the move ordering.
+    - evaluate_time and winner_time: the seconds spent in evaluate and in the win checks.
+    - depth_nodes: the nodes at each remaining depth, which gives the effective
+      branching factor of each depth.
+
+    Callbacks are called with the stats and the depth of the search when a
+    search reports, such as after each depth of the iterative deepening, to
+    feed the counters into a metrics system.
+"""
+class SearchStats:
+
+    """
+        Attributes of the SearchStats class.
+    """
+    nodes: int
+    leaves: int
+    cutoffs: int
+    first_move_cutoffs: int
+    evaluate_time: float
+    winner_time: float
+    depth_nodes: dict[int, int]
+    callbacks: list
+
+    def __init__(self, callback=None):
+        self.callbacks = [callback] if callback is not None else []
+        self.clear()
+
+    """
+        Resets the counters, the callbacks are kept.
+    """
+    def clear(self) -> None:
+        self.nodes = 0
+        self.leaves = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.evaluate_time = 0.0
+        self.winner_time = 0.0
+        self.depth_nodes = {}
+
+    """
+        Adds a callback called on each report.
+        @param callback: a function of the stats and the depth of the search.
+    """
+    def add_callback(self, callback) -> None:
+        self.callbacks.append(callback)
+
+    """
+        Counts a node.
+        @param depth: the remaining depth of the node.
+        @param count: the number of nodes.
+    """
+    def add_node(self, depth: int, count: int = 1) -> None:
+        self.nodes += count
+        self.depth_nodes[depth] = self.depth_nodes.get(depth, 0) + count
+
+    """
+        Counts a cutoff.
+        @param first_move: whether the cutoff came from the first move searched.
+    """
+    def add_cutoff(self, first_move: bool) -> None:
+        self.cutoffs += 1
+        if first_move:
+            self.first_move_cutoffs += 1
+
+    """
+        Gets the share of the cutoffs that came from the first move searched.
+        @return: the rate between 0 and 1, 0 without cutoffs.
+    """
+    def first_move_cutoff_rate(self) -> float:
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    """
+        Gets the effective branching factor of each depth, the number of
+        children searched per node of that depth.
+        @return: the branching factor by remaining depth, for every depth with children.
+    """
+    def branching_factors(self) -> dict[int, float]:
+        return {depth: self.depth_nodes.get(depth - 1, 0) / count
+                for depth, count in sorted(self.depth_nodes.items()) if depth > 0 and count}
+
+    """
+        Gets the counters as plain values.
+        @return: the counters, the first move cutoff rate and the branching factors.
+    """
+    def summary(self) -> dict:
+        return {"nodes": self.nodes, "leaves": self.leaves, "cutoffs": self.cutoffs,
+                "first_move_cutoff_rate": self.first_move_cutoff_rate(),
+                "evaluate_time": self.evaluate_time, "winner_time": self.winner_time,
+                "branching_factors": self.branching_factors()}
+
+    """
+        Calls the callbacks with the stats.
+        @param depth: the depth of the search that finished.
+    """
+    def report(self, depth: int) -> None:
+        for callback in self.callbacks:
+            callback(self, depth)
@@ -0,0 +1,327 @@
+import argparse
+import json
+import os
+import random
+
+import numpy as np
+
+from bitboard import BitBoard
+from encoding import book_key, canonical_move, load_keys, save_keys
+
+"""
+    The endgame tablebase.
+    Near the end of the game the search can know the exact result of a
+    position instead of its heuristic score. The tablebase holds the solved
+    positions with up to a number of empty cells, and the search returns the
+    entry of a position it reaches there instead of searching it.
+
+    The positions with a few empty cells of the 7x6 board are far too many to
+    solve them all, so the tablebase covers the positions reached from a set
+    of root lines: each line is played to the number of empty cells, then every
+    position that follows is solved exhaustively, with either disc moving first.
+    The roots can be random games, files of move strings, or the games of a
+    tournament log, so the endgames the program actually plays are covered.
+
+    Each entry is packed in one integer: the key of the book, the canonical
+    key with the disc to move, then the best move the way round of the
+    canonical key and the score of the Solver for the disc to move. The
+    entries are sorted, so they are sorted by key, and saved as a contiguous
+    uint64 array, 8 bytes per position, which is searched in place when it is
+    memory-mapped. Only positions of the standard board are kept. The number
+    of empty cells of the positions is written to a .json file next to it, so
+    opening the tablebase doesn't read its entries.
+"""
+
+# The bits of the move and of the score in an entry, and the offset that keeps the score positive.
+MOVE_BITS : int = 4
+SCORE_BITS : int = 6
+SCORE_OFFSET : int = 1 << (SCORE_BITS - 1)
+
+# The number of cells of the standard board.
+CELLS : int = BitBoard.WIDTH * BitBoard.HEIGHT
+
+# The number of discs of each value of the bits of a column in the key.
+COLUMN_DISCS : np.array = np.array([(bits + 1).bit_length() - 1 for bits in range(1 << BitBoard.H1)], dtype=np.uint8)
+
+# The tablebases opened by open_tablebase, by absolute path.
+open_tablebases : dict = {}
+
+"""
+    Solves every position that follows a position, each one once, the way
+    the Solver scores them: a win on the move of the disc to move scores one
+    more for each disc it has left, a loss the opposite, a draw 0.
+    @param board: the board, a BitBoard, left as it was.
+    @param token: the disc to move.
+    @param entries: the best move the way round of the key and the score of each position solved, by key.
+    @return: the score of the position.
+"""
+def solve_position(board: BitBoard, token: int, entries: dict[int, tuple[int, int]]) -> int:
+    key = book_key(board, token)
+    if key in entries:
+        return entries[key][1]
+    wins = board.winning_moves(token)
+    if wins:
+        move, score = wins[0], (CELLS + 1 - board.moves) // 2
+    else:
+        other = board.player_disc if token == board.computer_disc else board.computer_disc
+        move, score = None, None
+        for column in board.get_valid_moves():
+            board.drop_disc(column, token)
+            value = 0 if board.is_board_full() else -solve_position(board, other, entries)
+            board.undo_disc(column)
+            if score is None or value > score:
+                move, score = column, value
+    entries[key] = (canonical_move(board, move), score)
+    return score
+
+"""
+    Solves the positions with up to a number of empty cells that follow root lines.
+    @param roots: the move strings of the roots, played to the number of empty cells.
+    @param empty: the number of empty cells.
+    @param player_disc: the player's disc.
+    @param computer_disc: the computer's disc.
+    @return: the best move the way round of the key and the score of each position, by key.
+    @raises ValueError: if a root is shorter than the line to the number of empty cells, or isn't valid.
+"""
+def solve_endgames(roots, empty: int, player_disc: int = 1, computer_disc: int = 2) -> dict[int, tuple[int, int]]:
+    entries = {}
+    for moves in roots:
+        if len(moves) < CELLS - empty:
+            raise ValueError(f"The root {moves} has more than {empty} empty cells")
+        moves = moves[:CELLS - empty]
+        for first_disc in [player_disc, computer_disc]:
+            board, token = BitBoard.from_moves(moves, player_disc, computer_disc, first_disc)
+            # A line that already won has no endgame to solve
+            last_disc = player_disc if token == computer_disc else computer_disc
+            if not board.is_winner(last_disc):
+                solve_position(board, token, entries)
+    return entries
+
+"""
+    Plays random games to a number of empty cells, keeping the games that
+    nobody won on the way.
+    @param count: the number of roots.
+    @param empty: the number of empty cells.
+    @param seed: the seed of the random moves.
+    @return: the move strings of the roots.
+"""
+def random_roots(count: int, empty: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    roots = []
+    while len(roots) < count:
+        board = BitBoard(None, 1, 2)
+        moves = ""
+        while len(moves) < CELLS - empty:
+            move = rng.choice(board.get_valid_moves())
+            board.drop_disc(move, 1 + len(moves) % 2)
+            if board.is_winning_move(move):
+                break
+            moves += str(move)
+        if len(moves) == CELLS - empty:
+            roots.append(moves)
+    return roots
+
+"""
+    Gets the file of the metadata of a tablebase, next to it.
+    @param path: the file of the tablebase.
+    @return: the .json file of the metadata.
+"""
+def metadata_path(path: str) -> str:
+    return os.path.splitext(path)[0] + ".json"
+
+"""
+    Builds a tablebase and writes its entries to a sorted .npy file, and its
+    number of empty cells to the file of its metadata.
+    @param path: the file of the tablebase.
+    @param roots: the move strings of the roots.
+    @param empty: the number of empty cells.
+    @return: the number of positions in the tablebase.
+    @raises ValueError: if a root is shorter than the line to the number of empty cells, or isn't valid.
+"""
+def build_tablebase(path: str, roots, empty: int) -> int:
+    solved = solve_endgames(roots, empty)
+    entries = sorted(pack_entry(key, move, score) for key, (move, score) in solved.items())
+    save_keys(path, entries)
+    with open(metadata_path(path), "w") as metadata:
+        json.dump({"empty": empty}, metadata)
+    return len(entries)
+
+"""
+    Packs an entry of the tablebase.
+    @param key: the key of the book of the position.
+    @param move: the best move, the way round of the canonical key.
+    @param score: the score of the Solver for the disc to move.
+    @return: the entry.
+"""
+def pack_entry(key: int, move: int, score: int) -> int:
+    return (key << MOVE_BITS | move) << SCORE_BITS | score + SCORE_OFFSET
+
+"""
+    Unpacks the move and the score of an entry of the tablebase.
+    @param entry: the entry.
+    @return: the best move, the way round of the canonical key, and the score.
+"""
+def unpack_entry(entry: int) -> tuple[int, int]:
+    return entry >> SCORE_BITS & ((1 << MOVE_BITS) - 1), (entry & ((1 << SCORE_BITS) - 1)) - SCORE_OFFSET
+
+"""
+    Counts the fewest discs of the positions of a tablebase from its keys, one
+    column of bits at a time, for a tablebase without the file of its metadata.
+    @param entries: the entries, at least one.
+    @return: the fewest discs of a position.
+"""
+def count_min_discs(entries: np.array) -> int:
+    # The key without the disc to move
+    keys = entries >> np.uint64(MOVE_BITS + SCORE_BITS + 2)
+    discs = np.zeros(len(keys), dtype=np.uint8)
+    for column in range(BitBoard.WIDTH):
+        discs += COLUMN_DISCS[(keys >> np.uint64(column * BitBoard.H1)) & np.uint64((1 << BitBoard.H1) - 1)]
+    return int(discs.min())
+
+"""
+    Opens the tablebase of a file, mapping each file once per process. A
+    worker forked after its parent opened the tablebase gets the same mapping.
+    @param path: the file of the tablebase.
+    @return: the tablebase.
+    @raises ValueError: if the file isn't a tablebase.
+"""
+def open_tablebase(path: str) -> "Tablebase":
+    path = os.path.abspath(path)
+    if path not in open_tablebases:
+        open_tablebases[path] = Tablebase(path)
+    return open_tablebases[path]
+
+"""
+    The Tablebase class.
+    The class memory-maps a tablebase file and finds positions with a binary
+    search. The fewest discs of its positions are read from the file of its
+    metadata when it is opened, so the search only looks up the positions it
+    can hold. A tablebase built without that file has them counted from its
+    keys instead, which reads every entry.
+"""
+class Tablebase:
+
+    """
+        Attributes of the Tablebase class.
+    """
+    entries: np.array
+    # The fewest discs of a position in the tablebase.
+    min_discs: int
+
+    def __init__(self, path: str):
+        self.entries = load_keys(path)
+        if len(self.entries) == 0:
+            self.min_discs = CELLS + 1
+        elif os.path.exists(metadata_path(path)):
+            with open(metadata_path(path)) as metadata:
+                self.min_discs = CELLS - json.load(metadata)["empty"]
+        else:
+            self.min_discs = count_min_discs(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    """
+        Check if the tablebase can hold a position, from its number of discs.
+        @param discs: the number of discs of the position.
+        @return: True if positions with that many discs may be in the tablebase, False otherwise.
+    """
+    def covers(self, discs: int) -> bool:
+        return discs >= self.min_discs
+
+    """
+        Looks up a position in O(log n).
+        @param board: the board of the standard geometry, any backend.
+        @param token: the disc to move.
+        @return: the best move and the score of the Solver for the disc to move, or None if the position isn't in the tablebase.
+    """
+    def lookup(self, board, token: int) -> tuple[int, int]:
+        key = book_key(board, token)
+        # The first entry of the key, its move and score are at least 0
+        index = self.entries.searchsorted(np.uint64(pack_entry(key, 0, -SCORE_OFFSET)))
+        if index < len(self.entries):
+            entry = int(self.entries[index])
+            if entry >> (MOVE_BITS + SCORE_BITS) == key:
+                move, score = unpack_entry(entry)
+                return canonical_move(board, move), score
+        return None
+
+"""
+    Gets a bound on the heuristic score of any board of a geometry: the weights
+    of every window of the board, as if one disc had them all.
+    @param board: the board.
+    @return: the bound.
+"""
+def score_bound(board) -> int:
+    bound = 0
+    for length, weight in enumerate(board.weights, 2):
+        across, down = board.WIDTH - length + 1, board.HEIGHT - length + 1
+        bound += weight * (across * board.HEIGHT + board.WIDTH * down + 2 * across * down)
+    return bound
+
+"""
+    Gets the score of the search for a score of the Solver. A win scores past
+    the bound of every heuristic score plus the score, so a proven win ranks
+    above any heuristic score and sooner wins score more, on the scale of
+    won_score. A loss scores the opposite, and a draw 0.
+    @param board: the board.
+    @param token: the disc to move.
+    @param score: the score of the Solver for the disc to move.
+    @return: the score of the search, from the side of the computer.
+"""
+def search_score(board, token: int, score: int) -> int:
+    if token != board.computer_disc:
+        score = -score
+    if score > 0:
+        return score_bound(board) + score
+    if score < 0:
+        return -score_bound(board) + score
+    return 0
+
+"""
+    Gets the score of the search of a board won by a disc, on the scale of
+    search_score: the bound of every heuristic score plus the score the
+    Solver gives the win, one more for each disc the winner has left. A won
+    leaf and a proven result then compare the way the Solver does.
+    @param board: the board, with the winning disc played.
+    @param disc: the disc that won.
+    @return: the score, from the side of the computer.
+"""
+def won_score(board, disc: int) -> int:
+    score = score_bound(board) + (board.WIDTH * board.HEIGHT - board.count_discs()) // 2 + 1
+    return score if disc == board.computer_disc else -score
+
+"""
+    Reads the move strings of a file, one per line.
+    @param path: the file.
+    @return: the move strings.
+"""
+def read_roots(path: str) -> list[str]:
+    with open(path) as roots:
+        return [line.strip() for line in roots if line.strip()]
+
+"""
+    Reads the moves of the games of a tournament log.
+    @param path: the log.
+    @return: the move strings of the games.
+"""
+def read_log_roots(path: str) -> list[str]:
+    with open(path) as log:
+        return [json.loads(line)["moves"] for line in log if line.strip()]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Builds the endgame tablebase.")
+    parser.add_argument("path", help="the file of the tablebase, such as src/endgame_tablebase.npy")
+    parser.add_argument("--empty", type=int, default=8, help="the number of empty cells of the positions")
+    parser.add_argument("--random", type=int, default=0, help="the number of random games played to the empty cells")
+    parser.add_argument("--seed", type=int, default=0, help="the seed of the random games")
+    parser.add_argument("--positions", action="append", default=[], help="a file of move strings, one per line")
+    parser.add_argument("--log", action="append", default=[], help="a tournament log, its games long enough are roots")
+    args = parser.parse_args()
+    roots = random_roots(args.random, args.empty, args.seed)
+    for path in args.positions:
+        roots += read_roots(path)
+    for path in args.log:
+        roots += [moves for moves in read_log_roots(path) if len(moves) >= CELLS - args.empty]
+    count = build_tablebase(args.path, roots, args.empty)
+    print(f"{count} positions from {len(roots)} roots written to {args.path}")
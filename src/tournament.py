@@ -0,0 +1,332 @@
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import time
+from typing import Iterator
+
+from backend import get_board_class
+from geometry import GEOMETRY
+from minimax import MiniMax
+from transposition import TranspositionTable
+from workers import preload_backend, worker_context
+
+"""
+    Self-play tournaments between engine configurations.
+
+    Every pair of engines plays the same number of random openings, each
+    opening twice with the engines swapping who moves first, so neither the
+    opening nor the first move favours an engine. The games are scheduled
+    over a pool of worker processes, and each game is appended to the log as
+    one compact JSON line as soon as it ends, so a long tournament can be
+    followed, or reported on, while it runs.
+
+    Each engine plays on its own board, of the board class with its weights,
+    and keeps its own transposition tables, which are cleared before each
+    game so a game doesn't depend on the games the worker played before.
+    Without a time budget, the games of a tournament are the same for any
+    number of workers.
+"""
+
+# The z value of a 95% confidence interval.
+Z_95 : float = 1.96
+
+"""
+    The Engine class.
+    The class is a configuration of the search played in a tournament.
+"""
+class Engine:
+
+    """
+        Attributes of the Engine class.
+    """
+    name: str
+    depth: int
+    # The time budget of each move, None searches to the depth.
+    time_budget_ms: int
+    # The weights of the score, None for the weights of the board.
+    weights: list[int]
+    threats: bool
+    backend: str
+
+    def __init__(self, name: str, depth: int = 5, time_budget_ms: int = None, weights: list[int] = None, threats: bool = True,
+                 backend: str = "bitboard"):
+        self.name = name
+        self.depth = depth
+        self.time_budget_ms = time_budget_ms
+        self.weights = weights
+        self.threats = threats
+        self.backend = backend
+
+    """
+        Parses an engine from the command line, such as "deep:depth=7,weights=10/100/10000".
+        The options are depth, time (the time budget in milliseconds), weights,
+        threats (0 or 1) and backend.
+        @param spec: the name, then the options after a colon.
+        @return: the engine.
+        @raises ValueError: if an option doesn't exist or its value isn't valid.
+    """
+    @classmethod
+    def parse(cls, spec: str) -> "Engine":
+        name, _, options = spec.partition(":")
+        engine = cls(name)
+        for option in filter(None, options.split(",")):
+            key, _, value = option.partition("=")
+            if key == "depth":
+                engine.depth = int(value)
+            elif key == "time":
+                engine.time_budget_ms = int(value)
+            elif key == "weights":
+                engine.weights = [int(weight) for weight in value.split("/")]
+            elif key == "threats":
+                engine.threats = value == "1"
+            elif key == "backend":
+                engine.backend = value
+            else:
+                raise ValueError(f"Unknown engine option: {key}")
+        return engine
+
+# The engines of a worker process and their searches for each disc, made once by init_worker.
+worker_engines : list[Engine] = None
+worker_searches : list[dict[int, MiniMax]] = None
+worker_board_classes : list[type] = None
+
+"""
+    Sets up the searches of a worker process, or of this process without workers.
+    Each engine has a MiniMax and a transposition table for each disc, as
+    the scores of the search are from the side of the disc it plays.
+    @param engines: the engines of the tournament.
+    @param geometry: the width, the height and the connect length of the board.
+    @param table_size: the number of slots of each transposition table, None for no table.
+"""
+def init_worker(engines: list[Engine], geometry: tuple[int, int, int], table_size: int) -> None:
+    global worker_engines, worker_searches, worker_board_classes
+    worker_engines = engines
+    worker_board_classes = []
+    worker_searches = []
+    for engine in engines:
+        board_class = get_board_class(engine.backend, geometry)
+        worker_board_classes.append(board_class.with_weights(engine.weights) if engine.weights is not None else board_class)
+        worker_searches.append({disc: MiniMax(3 - disc, disc, engine.backend, TranspositionTable(table_size) if table_size is not None else None,
+                                              batch_leaves=engine.backend == "numpy", threats=engine.threats, geometry=geometry)
+                                for disc in [1, 2]})
+
+"""
+    Plays a game between two engines of the tournament in this process.
+    @param game: the number of the game, the first engine, the second engine and the opening.
+    @return: the record of the game: its number, the names of the engines, the result (1 if
+             the first engine won, 2 if the second won, 0 for a draw), the moves, and the
+             searches and the milliseconds they took for each engine.
+"""
+def play_game(game: tuple[int, int, int, str]) -> dict:
+    number, first, second, opening = game
+    players = [first, second]
+    boards = [worker_board_classes[player].from_moves(opening, 2 - index, 1 + index, 1)[0] for index, player in enumerate(players)]
+    for player in players:
+        for search in worker_searches[player].values():
+            if search.table is not None:
+                search.table.clear()
+    moves = list(opening)
+    searches, milliseconds = [0, 0], [0.0, 0.0]
+    result = 0
+    # The first engine plays disc 1, which moves first from the empty board
+    index = len(opening) % 2
+    while not boards[0].is_board_full():
+        engine = worker_engines[players[index]]
+        disc = index + 1
+        start = time.perf_counter()
+        move, _, _ = worker_searches[players[index]][disc].iterative_deepening(boards[index], disc, engine.depth, engine.time_budget_ms)
+        milliseconds[index] += (time.perf_counter() - start) * 1000
+        searches[index] += 1
+        for board in boards:
+            board.drop_disc(move, disc)
+        moves.append(str(move))
+        if boards[0].is_winning_move(move):
+            result = index + 1
+            break
+        index = 1 - index
+    return {"game": number, "first": worker_engines[first].name, "second": worker_engines[second].name, "result": result,
+            "moves": "".join(moves), "searches": searches, "ms": [round(ms, 3) for ms in milliseconds]}
+
+"""
+    Makes random openings, none of them won, and different from each other
+    while there are enough of them.
+    @param count: the number of openings.
+    @param plies: the number of moves of each opening.
+    @param seed: the seed of the random moves.
+    @param geometry: the width, the height and the connect length of the board.
+    @return: the move strings of the openings.
+"""
+def make_openings(count: int, plies: int, seed: int = 0, geometry: tuple[int, int, int] = GEOMETRY) -> list[str]:
+    rng = random.Random(seed)
+    board_class = get_board_class("bitboard", geometry)
+    openings = []
+    attempts = 0
+    while len(openings) < count:
+        attempts += 1
+        board = board_class(None, 1, 2)
+        moves = ""
+        for ply in range(plies):
+            move = rng.choice(board.get_valid_moves())
+            board.drop_disc(move, 1 + ply % 2)
+            if board.is_winning_move(move):
+                break
+            moves += str(move)
+        if len(moves) == plies and (moves not in openings or attempts > 100 * count):
+            openings.append(moves)
+    return openings
+
+"""
+    Lists the games of a round robin: each opening is played by every pair
+    of engines, once with each engine moving first.
+    @param engines: the number of engines.
+    @param openings: the move strings of the openings.
+    @return: the number of the game, the first engine, the second engine and the opening of each game.
+"""
+def schedule_games(engines: int, openings: list[str]) -> list[tuple[int, int, int, str]]:
+    games = []
+    for first, second in itertools.combinations(range(engines), 2):
+        for opening in openings:
+            games.append((len(games), first, second, opening))
+            games.append((len(games), second, first, opening))
+    return games
+
+"""
+    Plays a tournament and yields the record of each game as it ends, in the
+    order the games end.
+    @param engines: the engines, with different names.
+    @param games_per_pair: the number of openings each pair of engines plays, twice each.
+    @param workers: the number of worker processes, 1 plays in this process.
+    @param opening_plies: the number of random moves of each opening.
+    @param seed: the seed of the openings.
+    @param geometry: the width, the height and the connect length of the board.
+    @param table_size: the number of slots of each transposition table, None for no table.
+    @return: the record of each game, see play_game.
+    @raises ValueError: if two engines have the same name.
+"""
+def iter_tournament(engines: list[Engine], games_per_pair: int, workers: int = None, opening_plies: int = 2, seed: int = 0,
+                    geometry: tuple[int, int, int] = GEOMETRY, table_size: int = 1 << 16) -> Iterator[dict]:
+    if len({engine.name for engine in engines}) != len(engines):
+        raise ValueError("The engines must have different names")
+    workers = workers or os.cpu_count() or 1
+    games = schedule_games(len(engines), make_openings(games_per_pair, opening_plies, seed, geometry))
+    settings = (engines, geometry, table_size)
+    if workers == 1:
+        init_worker(*settings)
+        for game in games:
+            yield play_game(game)
+        return
+    for backend in {engine.backend for engine in engines}:
+        preload_backend(backend)
+    with worker_context().Pool(workers, initializer=init_worker, initargs=settings) as pool:
+        yield from pool.imap_unordered(play_game, games)
+
+"""
+    Plays a tournament and appends each game to a log as it ends.
+    @param engines: the engines, with different names.
+    @param log_path: the file of the log, one JSON line per game.
+    @param games_per_pair: the number of openings each pair of engines plays, twice each.
+    @param workers: the number of worker processes, 1 plays in this process.
+    @param options: the options of iter_tournament.
+    @return: the summary of each engine, see summarize.
+"""
+def run_tournament(engines: list[Engine], log_path: str, games_per_pair: int, workers: int = None, **options) -> dict[str, dict]:
+    records = []
+    with open(log_path, "a") as log:
+        for record in iter_tournament(engines, games_per_pair, workers, **options):
+            log.write(json.dumps(record, separators=(",", ":")) + "\n")
+            log.flush()
+            records.append(record)
+    return summarize(records)
+
+"""
+    Reads the games of a log.
+    @param path: the file of the log.
+    @return: the record of each game.
+"""
+def load_log(path: str) -> list[dict]:
+    with open(path) as log:
+        return [json.loads(line) for line in log if line.strip()]
+
+"""
+    Gets the Wilson score interval of a proportion, which stays within 0
+    and 1 and holds up for few games or rates close to 0 or 1.
+    @param successes: the number of successes.
+    @param trials: the number of trials.
+    @param z: the z value of the confidence level.
+    @return: the lower and the upper bound, 0 and 1 without trials.
+"""
+def wilson_interval(successes: float, trials: int, z: float = Z_95) -> tuple[float, float]:
+    if trials == 0:
+        return 0.0, 1.0
+    rate = successes / trials
+    denominator = 1 + z * z / trials
+    center = (rate + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+"""
+    Sums up the games of each engine.
+    @param records: the records of the games.
+    @return: for each engine, its games, wins, draws and losses, its win rate with its 95%
+             confidence interval, its score (a draw counts half a win) and its average
+             milliseconds per move.
+"""
+def summarize(records: list[dict]) -> dict[str, dict]:
+    summary = {}
+    for record in records:
+        for index, name in enumerate([record["first"], record["second"]]):
+            engine = summary.setdefault(name, {"games": 0, "wins": 0, "draws": 0, "losses": 0, "searches": 0, "ms": 0.0})
+            engine["games"] += 1
+            if record["result"] == 0:
+                engine["draws"] += 1
+            elif record["result"] == index + 1:
+                engine["wins"] += 1
+            else:
+                engine["losses"] += 1
+            engine["searches"] += record["searches"][index]
+            engine["ms"] += record["ms"][index]
+    for engine in summary.values():
+        engine["win_rate"] = engine["wins"] / engine["games"]
+        engine["win_rate_interval"] = wilson_interval(engine["wins"], engine["games"])
+        engine["score"] = (engine["wins"] + engine["draws"] / 2) / engine["games"]
+        engine["ms_per_move"] = engine["ms"] / engine["searches"] if engine["searches"] else 0.0
+    return summary
+
+"""
+    Formats the summary of a tournament as a table, the best score first.
+    @param summary: the summary of each engine.
+    @return: the lines of the table.
+"""
+def format_summary(summary: dict[str, dict]) -> list[str]:
+    lines = [f"{'engine':<16} {'games':>6} {'wins':>6} {'draws':>6} {'losses':>6} {'win rate (95% CI)':>24} {'score':>6} {'ms/move':>9}"]
+    for name, engine in sorted(summary.items(), key=lambda item: -item[1]["score"]):
+        low, high = engine["win_rate_interval"]
+        lines.append(f"{name:<16} {engine['games']:>6} {engine['wins']:>6} {engine['draws']:>6} {engine['losses']:>6} "
+                     f"{engine['win_rate']:>8.1%} [{low:>5.1%}, {high:>5.1%}] {engine['score']:>6.3f} {engine['ms_per_move']:>9.2f}")
+    return lines
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plays engine configurations against each other.")
+    parser.add_argument("--engine", action="append", default=[], type=Engine.parse,
+                        help="an engine, such as \"deep:depth=7,weights=10/100/10000\", at least two")
+    parser.add_argument("--games", type=int, default=10, help="the number of openings each pair of engines plays, twice each")
+    parser.add_argument("--workers", type=int, default=None, help="the number of worker processes")
+    parser.add_argument("--plies", type=int, default=2, help="the number of random moves of each opening")
+    parser.add_argument("--seed", type=int, default=0, help="the seed of the openings")
+    parser.add_argument("--width", type=int, default=GEOMETRY[0], help="the number of columns of the board")
+    parser.add_argument("--height", type=int, default=GEOMETRY[1], help="the number of rows of the board")
+    parser.add_argument("--connect", type=int, default=GEOMETRY[2], help="the number of discs in a row that wins")
+    parser.add_argument("--log", default="tournament.jsonl", help="the log the games are appended to")
+    parser.add_argument("--report", action="store_true", help="only report on the games of the log")
+    args = parser.parse_args()
+    if args.report:
+        summary = summarize(load_log(args.log))
+    else:
+        if len(args.engine) < 2:
+            parser.error("at least two engines are needed")
+        summary = run_tournament(args.engine, args.log, args.games, args.workers, opening_plies=args.plies, seed=args.seed,
+                                 geometry=(args.width, args.height, args.connect))
+    print("\n".join(format_summary(summary)))
@@ -0,0 +1,121 @@
+
+"""
+    The bound types of an entry.
+    EXACT: the score is the value of the position.
+    LOWER: the search failed high, the value is at least the score.
+    UPPER: the search failed low, the value is at most the score.
+"""
+EXACT : int = 0
+LOWER : int = 1
+UPPER : int = 2
+
+"""
+    The TranspositionTable class.
+    The class stores the results of positions that were already searched,
+    so the search doesn't search them again when another move order leads to them.
+
+    The table is a fixed number of slots indexed by the key of the position,
+    which bounds its memory. When two positions share a slot, the replacement
+    policy decides which one is kept:
+    - "depth": depth-preferred, the entry searched deeper is kept.
+    - "two-tier": each slot has a depth-preferred entry and an always-replace entry.
+
+    Each entry is a tuple (key, depth, score, bound, move).
+    Keys are scattered over the slots by multiplying them with a large odd
+    constant, as the low bits of a bitboard key only describe the first column.
+"""
+class TranspositionTable:
+
+    POLICIES : list[str] = ["depth", "two-tier"]
+    MULTIPLIER : int = 0x9E3779B97F4A7C15
+
+    size: int
+    policy: str
+    slots: list[tuple]
+
+    # Number of probes that found the position, found nothing, or found another position.
+    hits: int
+    misses: int
+    collisions: int
+
+    def __init__(self, size: int = 1 << 18, policy: str = "depth"):
+        if size <= 0:
+            raise ValueError("Size must be positive")
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown replacement policy: {policy}")
+        self.size = size
+        self.policy = policy
+        self.clear()
+
+    """
+        Removes every entry and resets the counters.
+    """
+    def clear(self) -> None:
+        ways = 2 if self.policy == "two-tier" else 1
+        self.slots = [None] * (self.size * ways)
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+
+    """
+        Gets the number of entries in the table.
+        @return: the number of entries.
+    """
+    def __len__(self) -> int:
+        return sum(1 for entry in self.slots if entry is not None)
+
+    """
+        Looks up a position.
+        @param key: the key of the position.
+        @return: the entry of the position, or None if it isn't stored.
+    """
+    def probe(self, key: int) -> tuple:
+        if self.policy == "two-tier":
+            index = (key * self.MULTIPLIER >> 32) % self.size * 2
+            first, second = self.slots[index], self.slots[index + 1]
+        else:
+            first, second = self.slots[(key * self.MULTIPLIER >> 32) % self.size], None
+        if first is not None and first[0] == key:
+            self.hits += 1
+            return first
+        if second is not None and second[0] == key:
+            self.hits += 1
+            return second
+        if first is None and second is None:
+            self.misses += 1
+        else:
+            self.collisions += 1
+        return None
+
+    """
+        Stores the result of a search.
+        @param key: the key of the position.
+        @param depth: the depth of the search.
+        @param score: the score of the position.
+        @param bound: EXACT, LOWER or UPPER.
+        @param move: the best move of the position.
+    """
+    def store(self, key: int, depth: int, score: float, bound: int, move: int) -> None:
+        entry = (key, depth, score, bound, move)
+        if self.policy == "two-tier":
+            index = (key * self.MULTIPLIER >> 32) % self.size * 2
+            deep = self.slots[index]
+            if deep is None or deep[0] == key or depth >= deep[1]:
+                self.slots[index] = entry
+                # The entry that loses its deep slot still gets the always-replace slot.
+                if deep is not None and deep[0] != key:
+                    self.slots[index + 1] = deep
+            else:
+                self.slots[index + 1] = entry
+        else:
+            index = (key * self.MULTIPLIER >> 32) % self.size
+            old = self.slots[index]
+            if old is None or old[0] == key or depth >= old[1]:
+                self.slots[index] = entry
+
+    """
+        Gets the counters of the table.
+        @return: the hits, misses, collisions and entries of the table.
+    """
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "collisions": self.collisions, "entries": len(self)}
@@ -0,0 +1,92 @@
+import numpy as np
+
+from board import Board
+
+"""
+    Vectorized evaluation of many boards at once.
+
+    Board.get_score convolves one board at a time, where the overhead of each
+    call is far larger than the arithmetic. Here every window of 2, 3 and 4 cells is
+    a row of flat cell indices, so an (N, 6, 7) stack of boards is scored with one
+    gather and a few reductions per window length. The windows of the other
+    geometries are built on their first use.
+"""
+
+"""
+    Builds the flat cell indices of every window of a given length.
+    @param length: the number of cells in the window.
+    @param width: the width of the board.
+    @param height: the height of the board.
+    @return: an array of shape (windows, length) of indices into a flattened board.
+"""
+def build_window_indices(length: int, width: int, height: int) -> np.array:
+    windows = []
+    for d_row, d_col in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+        for row in range(height):
+            for col in range(width):
+                end_row = row + d_row * (length - 1)
+                end_col = col + d_col * (length - 1)
+                if end_row >= height or end_col < 0 or end_col >= width:
+                    continue
+                windows.append([(row + d_row * i) * width + col + d_col * i for i in range(length)])
+    return np.array(windows, dtype=np.intp)
+
+# The windows of each geometry, built by get_window_indices.
+window_tables : dict[tuple[int, int, int], list[np.array]] = {}
+
+"""
+    Gets the windows of 2 to connect cells of a geometry, in the order of the
+    weights of the board, built once for each geometry.
+    @param width: the width of the board.
+    @param height: the height of the board.
+    @param connect: the number of discs in a row that wins.
+    @return: the window indices of each length.
+"""
+def get_window_indices(width: int, height: int, connect: int) -> list[np.array]:
+    if (width, height, connect) not in window_tables:
+        window_tables[(width, height, connect)] = [build_window_indices(length, width, height) for length in range(2, connect + 1)]
+    return window_tables[(width, height, connect)]
+
+# Windows of 2, 3 and 4 cells of the standard board, in the order of Board.weights.
+window_indices : list[np.array] = get_window_indices(Board.WIDTH, Board.HEIGHT, Board.CONNECT)
+
+"""
+    Evaluates a stack of boards, the same score as Board.evaluate for each board.
+    @param boards: an array of shape (N, height, width), 6x7 for the standard board.
+    @param player_disc: the player's disc.
+    @param computer_disc: the computer's disc.
+    @param weights: the weights of 2 to connect in a row, which give the connect length.
+    @return: an array of the N scores.
+"""
+def evaluate_boards(boards: np.array, player_disc: int, computer_disc: int, weights: list[int] = Board.weights) -> np.array:
+    boards = np.asarray(boards)
+    height, width = boards.shape[1:]
+    window_indices = get_window_indices(width, height, len(weights) + 1)
+    flat = boards.reshape(len(boards), -1)
+    scores = np.zeros(len(flat), dtype=np.int64)
+    for disc_type in [1, 2]:
+        is_disc = flat == disc_type
+        score = np.zeros(len(flat), dtype=np.int64)
+        for id, indices in enumerate(window_indices):
+            score += is_disc[:, indices].all(axis=2).sum(axis=1) * weights[id]
+        if disc_type == player_disc:
+            scores -= score
+        else:
+            scores += score
+    return scores
+
+"""
+    Evaluates the child of a board for each move, without playing the moves on the board.
+    @param board: the board, any backend with a board array.
+    @param moves: the columns to play, none of them full.
+    @param disc: the disc being dropped.
+    @return: an array of the score of each child.
+"""
+def evaluate_children(board, moves: list[int], disc: int) -> np.array:
+    grid = np.asarray(board.board)
+    children = np.repeat(grid[np.newaxis], len(moves), axis=0)
+    # The disc lands above the highest disc of the column, or on the bottom row.
+    columns = grid.T[moves] != 0
+    rows = np.where(columns.any(axis=1), columns.argmax(axis=1), grid.shape[0]) - 1
+    children[np.arange(len(moves)), rows, moves] = disc
+    return evaluate_boards(children, board.player_disc, board.computer_disc, board.weights)
@@ -0,0 +1,40 @@
+import importlib
+import multiprocessing
+import sys
+
+"""
+    The start of worker processes.
+    A worker started with spawn runs a new interpreter, which imports the
+    modules of the program again, SciPy included for the NumPy board, before
+    it does any work. Where fork is available the workers are forked from
+    this process instead, so they start with the modules it imported and the
+    files it mapped, such as the opening book, whose pages they share.
+    The pools call preload_backend before they start their workers, so the
+    workers never import the modules of their backend themselves.
+"""
+
+# The modules the search of each backend imports on its first use.
+BACKEND_MODULES : dict[str, list[str]] = {
+    "numpy": ["scipy.signal"],
+    "bitboard": [],
+}
+
+"""
+    Gets the context the worker processes are started with.
+    macOS has fork, but its system libraries aren't safe to use in a forked
+    process, so it keeps its default start method.
+    @return: the fork context where it is safe, the default context otherwise.
+"""
+def worker_context() -> multiprocessing.context.BaseContext:
+    if sys.platform != "darwin" and "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+"""
+    Imports the modules the search of a backend imports on its first use,
+    so the workers forked afterwards already have them.
+    @param backend: the name of the backend.
+"""
+def preload_backend(backend: str) -> None:
+    for module in BACKEND_MODULES.get(backend, []):
+        importlib.import_module(module)
@@ -0,0 +1,80 @@
+import unittest
+import numpy as np
+import tempfile
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from minimax import MiniMax
+from batch import parse_position, iter_analysis, analyse_batch, iter_file_analysis
+from encoding import encode_keys, save_keys
+
+"""
+    The TestBatch class.
+    The class that tests the batch analysis.
+"""
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.player_disc = 1
+        self.computer_disc = 2
+        self.depth = 3
+        self.positions = ["", "3", "33", "334", "0123", "3344521", "4444"]
+        self.minimax = MiniMax(self.player_disc, self.computer_disc, "bitboard")
+
+    """
+        Tests to check that a move string is played from the empty board.
+    """
+    def test_parse_moves(self):
+        board, disc = parse_position("334", self.player_disc, self.computer_disc, "bitboard", 1)
+        self.assertEqual(board.board[5][3], 1)
+        self.assertEqual(board.board[4][3], 2)
+        self.assertEqual(board.board[5][4], 1)
+        self.assertEqual(disc, 2)
+        with self.assertRaises(ValueError):
+            parse_position("3a", self.player_disc, self.computer_disc, "bitboard", 1)
+
+    """
+        Tests to check that the batch gives the same results as searching each position.
+    """
+    def test_same_as_mini_max(self):
+        results = analyse_batch(self.positions, self.depth, workers=1)
+        for position, result in zip(self.positions, results):
+            board, disc = parse_position(position, self.player_disc, self.computer_disc, "bitboard", 1)
+            self.minimax.clear_history()
+            self.assertEqual(result, self.minimax.mini_max(board, -float('inf'), float('inf'), self.depth, disc))
+
+    """
+        Tests to check that a stack of arrays gives the same results as the move strings.
+    """
+    def test_stacked_arrays(self):
+        stack = np.stack([parse_position(position, self.player_disc, self.computer_disc, "numpy", 1)[0].board for position in self.positions])
+        self.assertEqual(stack.shape, (len(self.positions), 6, 7))
+        self.assertEqual(analyse_batch(stack, self.depth, workers=1), analyse_batch(self.positions, self.depth, workers=1))
+
+    """
+        Tests to check that the workers stream the results in the same order.
+    """
+    def test_workers(self):
+        results = iter_analysis((position for position in self.positions), self.depth, workers=2, chunksize=2)
+        self.assertNotIsInstance(results, list)
+        self.assertEqual(list(results), analyse_batch(self.positions, self.depth, workers=1))
+
+    """
+        Tests to check that keys, packed bytes and a file of keys give the same results as the move strings.
+    """
+    def test_keys(self):
+        boards = [parse_position(position, self.player_disc, self.computer_disc, "bitboard", 1)[0] for position in self.positions]
+        expected = analyse_batch(self.positions, self.depth, workers=1)
+        keys = encode_keys(np.stack([board.board for board in boards]))
+        self.assertEqual(analyse_batch(keys, self.depth, workers=1), expected)
+        self.assertEqual(analyse_batch([board.to_bytes() for board in boards], self.depth, workers=1), expected)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "keys.npy")
+            save_keys(path, keys)
+            self.assertEqual(list(iter_file_analysis(path, self.depth, workers=1, chunksize=3)), expected)
+            self.assertEqual(list(iter_file_analysis(path, self.depth, workers=2, chunksize=3)), expected)
+
+if __name__ == '__main__':
+    unittest.main()
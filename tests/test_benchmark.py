@@ -0,0 +1,72 @@
+import unittest
+import argparse
+import copy
+import io
+import sys
+import os
+from contextlib import redirect_stdout
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "timing")))
+
+from benchmark import compare, parse_table_size, run_benchmark
+
+"""
+    The TestBenchmark class.
+    The class that tests the benchmark and its comparison with a baseline, at a shallow depth.
+"""
+class TestBenchmark(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with redirect_stdout(io.StringIO()):
+            cls.results = run_benchmark(["opening", "midgame"], table_size=None, depth=2)
+
+    """
+        Tests to check that 0 and "none" search without a table and that other sizes are refused.
+    """
+    def test_table_size(self):
+        self.assertIsNone(parse_table_size("0"))
+        self.assertIsNone(parse_table_size("None"))
+        self.assertEqual(parse_table_size("1024"), 1024)
+        for value in ["-1", "big"]:
+            with self.assertRaises(argparse.ArgumentTypeError):
+                parse_table_size(value)
+        self.assertIsNone(self.results["table_size"])
+
+    """
+        Tests to check that every set is searched to the depth given.
+    """
+    def test_depth(self):
+        for name in ["opening", "midgame"]:
+            self.assertEqual(self.results["sets"][name]["depth"], 2)
+            self.assertTrue(all(run["depth"] == 2 for run in self.results["positions"][name]))
+
+    """
+        Tests to check that the same results have no regression and no change.
+    """
+    def test_compare_same(self):
+        self.assertEqual(compare(self.results, self.results), ([], []))
+
+    """
+        Tests to check that a slower set is a regression and that a new best move or node count is a change.
+    """
+    def test_compare_changed(self):
+        baseline = copy.deepcopy(self.results)
+        baseline["sets"]["opening"]["nodes_per_second"] *= 2
+        baseline["sets"]["opening"]["seconds"] /= 2
+        run = baseline["positions"]["midgame"][0]
+        run["best_move"] = (run["best_move"] + 1) % 7
+        run["nodes"] += 1
+        regressions, changes = compare(self.results, baseline)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(all(regression.startswith("opening") for regression in regressions))
+        self.assertEqual(len(changes), 2)
+        self.assertTrue(all(change.startswith(f"midgame '{run['moves']}'") for change in changes))
+        # A set or a depth the baseline doesn't have isn't compared
+        del baseline["sets"]["opening"]
+        run["depth"] = 3
+        self.assertEqual(compare(self.results, baseline), ([], []))
+
+if __name__ == '__main__':
+    unittest.main()
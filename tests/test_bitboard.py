@@ -0,0 +1,250 @@
+import unittest
+import numpy as np
+import random
+import pickle
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from board import Board
+from bitboard import BitBoard
+from vectorized import evaluate_boards
+
+"""
+    The TestBitBoard class.
+    The class that tests the BitBoard class.
+"""
+class TestBitBoard(unittest.TestCase):
+
+    def setUp(self):
+        self.player_disc = 1
+        self.computer_disc = 2
+        self.WIDTH = 7
+        self.HEIGHT = 6
+        self.board = BitBoard(np.zeros((self.HEIGHT, self.WIDTH), dtype=np.uint8), self.player_disc, self.computer_disc)
+
+    """
+        Plays random moves on a BitBoard and a NumPy Board at the same time.
+        @param moves: the number of moves to play.
+        @param seed: the seed of the random moves.
+        @return: the BitBoard and the NumPy Board.
+    """
+    def random_boards(self, moves: int, seed: int) -> tuple[BitBoard, Board]:
+        rng = random.Random(seed)
+        bit_board = BitBoard(None, self.player_disc, self.computer_disc)
+        numpy_board = Board(np.zeros((self.HEIGHT, self.WIDTH), dtype=np.uint8), self.player_disc, self.computer_disc)
+        disc = 1
+        for _ in range(moves):
+            move = rng.choice(bit_board.get_valid_moves())
+            bit_board.drop_disc(move, disc)
+            numpy_board.drop_disc(move, disc)
+            disc = 3 - disc
+        return bit_board, numpy_board
+
+    """
+        Tests to check that a valid disc is dropped in the correct position.
+    """
+    def test_valid_move(self):
+        self.board.drop_disc(0, 1)
+        self.assertEqual(self.board.board[5][0], 1)
+
+    """
+        Tests to check that an invalid disc isn't dropped at all.
+    """
+    def test_invalid_move(self):
+        with self.assertRaises(ValueError):
+            self.board.drop_disc(7, 1)
+        with self.assertRaises(ValueError):
+            self.board.drop_disc(-1, 1)
+
+    """
+        Tests to check that a disc is removed from the correct position.
+    """
+    def test_remove_move(self):
+        with self.assertRaises(ValueError):
+            self.board.undo_disc(0)
+        with self.assertRaises(ValueError):
+            self.board.undo_disc(-1)
+        with self.assertRaises(ValueError):
+            self.board.undo_disc(7)
+
+        self.board.drop_disc(0, 1)
+        self.board.drop_disc(0, 2)
+        self.board.undo_disc(0)
+        self.assertEqual(self.board.board[4][0], 0)
+        self.assertEqual(self.board.board[5][0], 1)
+
+    """
+        Tests to check that a column is full.
+    """
+    def test_if_full_column(self):
+        for _ in range(6):
+            self.board.drop_disc(0, 1)
+        self.assertNotIn(0, self.board.get_valid_moves())
+        with self.assertRaises(ValueError):
+            self.board.drop_disc(0, 1)
+
+    """
+        Tests to check that the board is full.
+    """
+    def test_full_board(self):
+        for i in range(6):
+            for j in range(7):
+                self.board.drop_disc(j, 1)
+        self.assertTrue(self.board.is_board_full())
+
+    """
+        Tests to check that a BitBoard built from an array keeps the discs.
+    """
+    def test_from_array(self):
+        _, numpy_board = self.random_boards(20, 0)
+        bit_board = BitBoard(numpy_board.board, self.player_disc, self.computer_disc)
+        self.assertTrue(np.array_equal(bit_board.board, numpy_board.board))
+
+    """
+        Tests to check that the wins and scores match the NumPy Board on random positions.
+    """
+    def test_matches_numpy_board(self):
+        for seed in range(30):
+            bit_board, numpy_board = self.random_boards(seed % 25 + 1, seed)
+            self.assertTrue(np.array_equal(bit_board.board, numpy_board.board))
+            for disc in [1, 2]:
+                self.assertEqual(bit_board.is_winner(disc), numpy_board.is_winner(disc))
+            self.assertEqual(bit_board.evaluate(), numpy_board.evaluate())
+
+    """
+        Tests to check that the last move check agrees with the full win check.
+    """
+    def test_winning_move(self):
+        for seed in range(30):
+            rng = random.Random(seed)
+            bit_board = BitBoard(None, self.player_disc, self.computer_disc)
+            numpy_board = Board(np.zeros((self.HEIGHT, self.WIDTH), dtype=np.uint8), self.player_disc, self.computer_disc)
+            disc = 1
+            while not bit_board.is_board_full():
+                move = rng.choice(bit_board.get_valid_moves())
+                bit_board.drop_disc(move, disc)
+                numpy_board.drop_disc(move, disc)
+                won = bit_board.is_winner(disc)
+                self.assertEqual(bit_board.is_winning_move(move), won)
+                self.assertEqual(numpy_board.is_winning_move(move), won)
+                if won:
+                    break
+                disc = 3 - disc
+
+    """
+        Tests to check that the running score matches a full evaluation after drops and undos.
+    """
+    def test_incremental_evaluate(self):
+        for seed in range(30):
+            rng = random.Random(seed)
+            bit_board, numpy_board = self.random_boards(rng.randint(1, 30), seed)
+            for _ in range(rng.randint(0, min(10, bit_board.moves))):
+                move = rng.choice([i for i in range(self.WIDTH) if bit_board.heights[i] > 0])
+                bit_board.undo_disc(move)
+                numpy_board.undo_disc(move)
+            self.assertEqual(bit_board.evaluate(), bit_board.full_evaluate())
+            self.assertEqual(bit_board.evaluate(), numpy_board.evaluate())
+
+    """
+        Tests to check that the winning moves and the moves under threats match the NumPy Board.
+    """
+    def test_threat_moves(self):
+        found = 0
+        for seed in range(60):
+            bit_board, numpy_board = self.random_boards(seed % 30 + 1, seed)
+            for disc in [1, 2]:
+                self.assertEqual(bit_board.winning_moves(disc), numpy_board.winning_moves(disc))
+                self.assertEqual(bit_board.moves_under_threats(disc), numpy_board.moves_under_threats(disc))
+                found += len(bit_board.moves_under_threats(disc))
+        self.assertGreater(found, 0)
+
+    """
+        Tests to check that the mirror keys match the NumPy Board and the key of the mirrored board.
+    """
+    def test_mirror_key(self):
+        for seed in range(30):
+            bit_board, numpy_board = self.random_boards(seed % 30 + 1, seed)
+            mirror = BitBoard(numpy_board.board[:, ::-1], self.player_disc, self.computer_disc)
+            self.assertEqual(bit_board.mirror_key(), mirror.key())
+            self.assertEqual(bit_board.mirror_key(), numpy_board.mirror_key())
+            self.assertEqual(bit_board.canonical_key(), mirror.canonical_key())
+            self.assertEqual(bit_board.is_symmetric(), numpy_board.is_symmetric())
+            for move in range(self.WIDTH):
+                if bit_board.heights[move] > 0:
+                    bit_board.undo_disc(move)
+                    break
+            self.assertEqual(bit_board.mirror_key(), BitBoard(bit_board.board[:, ::-1], self.player_disc, self.computer_disc).key())
+        board = BitBoard(None, self.player_disc, self.computer_disc)
+        self.assertTrue(board.is_symmetric())
+        board.drop_disc(2, 1)
+        self.assertFalse(board.is_symmetric())
+        board.drop_disc(4, 1)
+        self.assertTrue(board.is_symmetric())
+
+    """
+        Tests to check that both backends agree on boards of other sizes and connect lengths.
+    """
+    def test_geometries(self):
+        for width, height, connect in [(8, 7, 4), (9, 7, 5), (5, 5, 3)]:
+            bit_class, numpy_class = BitBoard.with_geometry(width, height, connect), Board.with_geometry(width, height, connect)
+            for seed in range(10):
+                rng = random.Random(seed)
+                bit_board = bit_class(None, self.player_disc, self.computer_disc)
+                numpy_board = numpy_class(np.zeros((height, width), dtype=np.uint8), self.player_disc, self.computer_disc)
+                disc = 1
+                while not bit_board.is_board_full():
+                    move = rng.choice(bit_board.get_valid_moves())
+                    bit_board.drop_disc(move, disc)
+                    numpy_board.drop_disc(move, disc)
+                    won = numpy_board.is_winner(disc)
+                    self.assertEqual(bit_board.is_winner(disc), won)
+                    self.assertEqual(bit_board.is_winning_move(move), won)
+                    self.assertEqual(numpy_board.is_winning_move(move), won)
+                    self.assertEqual(bit_board.evaluate(), numpy_board.evaluate())
+                    self.assertEqual(bit_board.evaluate(), bit_board.full_evaluate())
+                    self.assertEqual(bit_board.evaluate(), evaluate_boards(numpy_board.board[np.newaxis], self.player_disc, self.computer_disc,
+                                                                          numpy_board.weights)[0])
+                    self.assertEqual(bit_board.key(), numpy_board.key())
+                    self.assertEqual(bit_board.mirror_key(), numpy_board.mirror_key())
+                    for other in [1, 2]:
+                        self.assertEqual(bit_board.winning_moves(other), numpy_board.winning_moves(other))
+                        self.assertEqual(bit_board.moves_under_threats(other), numpy_board.moves_under_threats(other))
+                    if won:
+                        break
+                    disc = 3 - disc
+                self.assertTrue(np.array_equal(bit_class.from_key(bit_board.key(), 1, 2).board, numpy_board.board))
+
+    """
+        Tests to check that the tables of a geometry are built once and shared by its boards.
+    """
+    def test_geometry_tables(self):
+        self.assertIs(BitBoard.with_geometry(7, 6, 4), BitBoard)
+        board_class = BitBoard.with_geometry(8, 7)
+        self.assertIs(BitBoard.with_geometry(8, 7, 4), board_class)
+        first, second = board_class(None, 1, 2), board_class(None, 1, 2)
+        self.assertIs(first.cell_windows, second.cell_windows)
+        self.assertIsNot(first.cell_windows, self.board.cell_windows)
+        self.assertEqual(first.get_valid_moves(), list(range(8)))
+        first.drop_disc(7, 1)
+        copy = pickle.loads(pickle.dumps(first))
+        self.assertIs(type(copy), board_class)
+        self.assertEqual(copy.key(), first.key())
+        self.assertIs(type(first.copy()), board_class)
+        weighted_class = board_class.with_weights([10, 200, 10000])
+        self.assertIs(weighted_class.cell_windows, board_class.cell_windows)
+        weighted = weighted_class(None, 1, 2)
+        for move in [3, 4, 5]:
+            weighted.drop_disc(move, 2)
+        self.assertEqual(weighted.evaluate(), 200 + 2 * 10)
+        self.assertIs(type(pickle.loads(pickle.dumps(weighted))), weighted_class)
+        with self.assertRaises(ValueError):
+            BitBoard.with_weights([10, 100])
+        with self.assertRaises(ValueError):
+            BitBoard.with_geometry(7, 3, 4)
+        with self.assertRaises(ValueError):
+            Board.with_geometry(7, 6, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -120,6 +120,16 @@ class TestConnectFourBoard(unittest.TestCase):
         self.board.drop_disc(2,1)
         self.assertTrue(self.board.is_winner(1))
     
+    """
+        Tests to check that only the last move is checked for a win.
+    """
+    def test_winning_move(self):
+        for move, disc in [(0,1), (1,2), (1,1), (2,2), (2,2), (2,1), (3,2), (3,2), (3,2)]:
+            self.board.drop_disc(move, disc)
+            self.assertFalse(self.board.is_winning_move(move))
+        self.board.drop_disc(3,1)
+        self.assertTrue(self.board.is_winning_move(3))
+
     """
         Tests to check that the board is full.
     """
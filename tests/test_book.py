@@ -0,0 +1,96 @@
+import unittest
+import numpy as np
+import tempfile
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from board import Board
+from bitboard import BitBoard
+from minimax import MiniMax
+from game import Game
+from book import enumerate_positions, build_book, OpeningBook
+
+"""
+    The TestOpeningBook class.
+    The class that tests the opening book.
+"""
+class TestOpeningBook(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "book.npy")
+        cls.depth = 3
+        cls.count = build_book(cls.path, 2, cls.depth, workers=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def setUp(self):
+        self.player_disc = 1
+        self.computer_disc = 2
+        self.book = OpeningBook(self.path)
+
+    """
+        Tests to check that each position is only kept once.
+    """
+    def test_enumerate_positions(self):
+        # The empty board with either disc to move, then 7 moves of each, of which 3 are mirrors
+        self.assertEqual(len(enumerate_positions(0)), 2)
+        self.assertEqual(len(enumerate_positions(1)), 10)
+        self.assertEqual(len(self.book), self.count)
+        self.assertTrue(np.all(np.diff(self.book.keys.astype(np.int64)) > 0))
+
+    """
+        Tests to check that the book has the results of the search.
+    """
+    def test_lookup(self):
+        minimax = MiniMax(self.player_disc, self.computer_disc)
+        for moves in ["", "3", "24"]:
+            board = Board(np.zeros((6, 7), dtype=np.uint8), self.player_disc, self.computer_disc)
+            disc = self.computer_disc
+            for move in moves:
+                board.drop_disc(int(move), disc)
+                disc = 3 - disc
+            minimax.clear_history()
+            self.assertEqual(self.book.lookup(board, disc), minimax.mini_max(board, -float('inf'), float('inf'), self.depth, disc))
+            self.assertEqual(self.book.lookup(BitBoard(board.board, self.player_disc, self.computer_disc), disc), self.book.lookup(board, disc))
+
+    """
+        Tests to check that the mirror of a position in the book is found with the mirrored move.
+    """
+    def test_mirror_lookup(self):
+        for moves in ["2", "15", "06"]:
+            board = BitBoard(None, self.player_disc, self.computer_disc)
+            mirror = BitBoard(None, self.player_disc, self.computer_disc)
+            disc = self.computer_disc
+            for move in moves:
+                board.drop_disc(int(move), disc)
+                mirror.drop_disc(6 - int(move), disc)
+                disc = 3 - disc
+            move, score = self.book.lookup(board, disc)
+            self.assertEqual(self.book.lookup(mirror, disc), (6 - move, score))
+
+    """
+        Tests to check that positions past the book aren't found.
+    """
+    def test_missing(self):
+        board = Board(np.zeros((6, 7), dtype=np.uint8), self.player_disc, self.computer_disc)
+        for move in [3, 3, 3]:
+            board.drop_disc(move, 1)
+        self.assertIsNone(self.book.lookup(board, 2))
+
+    """
+        Tests to check that the game plays the book move.
+    """
+    def test_game_uses_book(self):
+        game = Game(book_path=self.path, cache_path=None)
+        self.assertIsNotNone(game.book)
+        self.assertEqual(game.computer_move(), self.book.lookup(game.board, game.computer_disc)[0])
+        self.assertIsNone(Game(book_path=os.path.join(self.directory.name, "missing.npy"), cache_path=None).book)
+
+if __name__ == '__main__':
+    unittest.main()
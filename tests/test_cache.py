@@ -0,0 +1,125 @@
+import unittest
+import tempfile
+import sys
+import os
+from multiprocessing import Pool
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from bitboard import BitBoard
+from cache import AnalysisCache
+
+"""
+    Reads the cache of a file in a worker process.
+    @param path: the file of the cache.
+    @return: the entry of the empty board with disc 1 to move.
+"""
+def read_cache(path: str) -> tuple[int, int, int]:
+    with AnalysisCache(path) as cache:
+        return cache.lookup(BitBoard(None, 1, 2), 1)
+
+"""
+    The TestAnalysisCache class.
+    The class that tests the AnalysisCache class.
+"""
+class TestAnalysisCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "cache.db")
+        self.cache = AnalysisCache(self.path)
+        self.board = BitBoard(None, 1, 2)
+
+    def tearDown(self):
+        self.cache.close()
+        self.directory.cleanup()
+
+    """
+        Tests to check that a stored position is found only at its depth or below.
+    """
+    def test_store_and_lookup(self):
+        self.assertIsNone(self.cache.lookup(self.board, 1))
+        self.cache.store(self.board, 1, 6, 3, 40)
+        self.assertEqual(self.cache.lookup(self.board, 1), (3, 40, 6))
+        self.assertEqual(self.cache.lookup(self.board, 1, 6), (3, 40, 6))
+        self.assertIsNone(self.cache.lookup(self.board, 1, 7))
+        # The same discs with the other disc to move is another position
+        self.assertIsNone(self.cache.lookup(self.board, 2))
+
+    """
+        Tests to check that a shallower search doesn't replace a deeper one.
+    """
+    def test_deeper_entry_kept(self):
+        self.cache.store(self.board, 1, 6, 3, 40)
+        self.cache.store(self.board, 1, 4, 2, 10)
+        self.assertEqual(self.cache.lookup(self.board, 1), (3, 40, 6))
+        self.cache.store(self.board, 1, 8, 4, 20)
+        self.assertEqual(self.cache.lookup(self.board, 1), (4, 20, 8))
+        self.assertEqual(len(self.cache), 1)
+
+    """
+        Tests to check that a position and its mirror share an entry, with the move mirrored.
+    """
+    def test_mirror(self):
+        self.board.drop_disc(1, 1)
+        mirror = BitBoard(None, 1, 2)
+        mirror.drop_disc(5, 1)
+        self.cache.store(self.board, 2, 6, 2, 40)
+        self.assertEqual(self.cache.lookup(mirror, 2), (4, 40, 6))
+        self.assertEqual(len(self.cache), 1)
+
+    """
+        Tests to check that the least recently used positions are removed past the max entries.
+    """
+    def test_eviction(self):
+        cache = AnalysisCache(os.path.join(self.directory.name, "small.db"), max_entries=3, evict_interval=1, touch_interval=0)
+        boards = []
+        for column in range(4):
+            board = BitBoard(None, 1, 2)
+            board.drop_disc(column, 1)
+            boards.append(board)
+        for board in boards[:3]:
+            cache.store(board, 2, 4, 0, 0)
+        # The first board is used again, so the second one is the oldest
+        self.assertIsNotNone(cache.lookup(boards[0], 2))
+        cache.store(boards[3], 2, 4, 0, 0)
+        self.assertEqual(len(cache), 3)
+        self.assertIsNone(cache.lookup(boards[1], 2))
+        for board in [boards[0], boards[2], boards[3]]:
+            self.assertIsNotNone(cache.lookup(board, 2))
+        cache.close()
+
+    """
+        Tests to check that the entries are only counted every evict_interval stores
+        and that a recent entry isn't written by a lookup.
+    """
+    def test_batched_eviction(self):
+        cache = AnalysisCache(os.path.join(self.directory.name, "batched.db"), max_entries=2, evict_interval=4, touch_interval=60)
+        boards = []
+        for column in range(4):
+            board = BitBoard(None, 1, 2)
+            board.drop_disc(column, 1)
+            boards.append(board)
+        for board in boards[:3]:
+            cache.store(board, 2, 4, 0, 0)
+        self.assertEqual(len(cache), 3)
+        used = cache.connection.execute("SELECT used FROM positions ORDER BY key").fetchall()
+        self.assertIsNotNone(cache.lookup(boards[0], 2))
+        self.assertEqual(cache.connection.execute("SELECT used FROM positions ORDER BY key").fetchall(), used)
+        # The fourth store evicts down to the max entries, keeping the newest
+        cache.store(boards[3], 2, 4, 0, 0)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.lookup(boards[3], 2))
+        cache.close()
+
+    """
+        Tests to check that other processes read the positions stored in the file.
+    """
+    def test_shared_across_processes(self):
+        self.cache.store(self.board, 1, 6, 3, 40)
+        with Pool(2) as pool:
+            results = pool.map(read_cache, [self.path] * 4)
+        self.assertEqual(results, [(3, 40, 6)] * 4)
+
+if __name__ == '__main__':
+    unittest.main()
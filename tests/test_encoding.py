@@ -0,0 +1,117 @@
+import unittest
+import numpy as np
+import random
+import tempfile
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from board import Board
+from bitboard import BitBoard
+from encoding import encode_keys, decode_keys, grid_to_moves, save_keys, load_keys
+
+"""
+    The TestEncoding class.
+    The class that tests the encodings of a position.
+"""
+class TestEncoding(unittest.TestCase):
+
+    def setUp(self):
+        self.player_disc = 1
+        self.computer_disc = 2
+
+    """
+        Plays random moves from the empty board.
+        @param seed: the seed of the random moves.
+        @return: the move string and the BitBoard.
+    """
+    def random_position(self, seed: int) -> tuple[str, BitBoard]:
+        rng = random.Random(seed)
+        board = BitBoard(None, self.player_disc, self.computer_disc)
+        moves = ""
+        disc = 1
+        for _ in range(rng.randint(0, 42)):
+            move = rng.choice(board.get_valid_moves())
+            board.drop_disc(move, disc)
+            moves += str(move)
+            disc = 3 - disc
+        return moves, board
+
+    """
+        Tests to check that a board comes back from its key and its bytes on both boards.
+    """
+    def test_round_trips(self):
+        for seed in range(30):
+            _, board = self.random_position(seed)
+            for board_class in [Board, BitBoard]:
+                from_key = board_class.from_key(board.key(), self.player_disc, self.computer_disc)
+                self.assertTrue(np.array_equal(from_key.board, board.board))
+                self.assertEqual(from_key.key(), board.key())
+                data = board.to_bytes()
+                self.assertEqual(len(data), 11)
+                self.assertTrue(np.array_equal(board_class.from_bytes(data, self.player_disc, self.computer_disc).board, board.board))
+
+    """
+        Tests to check that a move string reaches the board it was found for.
+    """
+    def test_moves(self):
+        for seed in range(30):
+            moves, board = self.random_position(seed)
+            for board_class in [Board, BitBoard]:
+                parsed, disc = board_class.from_moves(moves, self.player_disc, self.computer_disc, 1)
+                self.assertTrue(np.array_equal(parsed.board, board.board))
+                self.assertEqual(disc, 1 if len(moves) % 2 == 0 else 2)
+            found = board.to_moves(1)
+            self.assertEqual(len(found), len(moves))
+            self.assertTrue(np.array_equal(BitBoard.from_moves(found, self.player_disc, self.computer_disc, 1)[0].board, board.board))
+        with self.assertRaises(ValueError):
+            BitBoard.from_moves("3x", self.player_disc, self.computer_disc, 1)
+
+    """
+        Tests to check that a board no game reaches has no move string.
+    """
+    def test_unreachable(self):
+        grid = np.zeros((6, 7), dtype=np.uint8)
+        grid[5][0] = grid[5][1] = 2
+        with self.assertRaises(ValueError):
+            grid_to_moves(grid, 1)
+        # Disc 1 can't play first under a disc 2 on top of the only column
+        grid = np.zeros((6, 7), dtype=np.uint8)
+        grid[5][0], grid[4][0] = 2, 1
+        with self.assertRaises(ValueError):
+            grid_to_moves(grid, 1)
+        self.assertEqual(grid_to_moves(grid, 2), "00")
+        with self.assertRaises(ValueError):
+            BitBoard.from_bytes(bytes(10), self.player_disc, self.computer_disc)
+
+    """
+        Tests to check that a stack of boards gives the keys of each board and back.
+    """
+    def test_stack(self):
+        boards = [self.random_position(seed)[1] for seed in range(30)]
+        stack = np.stack([board.board for board in boards])
+        keys = encode_keys(stack)
+        self.assertEqual(keys.dtype, np.uint64)
+        self.assertEqual(keys.tolist(), [board.key() for board in boards])
+        self.assertTrue(np.array_equal(decode_keys(keys), stack))
+
+    """
+        Tests to check that a file of keys is memory-mapped.
+    """
+    def test_save_and_load(self):
+        keys = encode_keys(np.stack([self.random_position(seed)[1].board for seed in range(10)]))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "keys.npy")
+            save_keys(path, keys)
+            loaded = load_keys(path)
+            self.assertIsInstance(loaded, np.memmap)
+            self.assertTrue(loaded.flags["C_CONTIGUOUS"])
+            self.assertTrue(np.array_equal(loaded, keys))
+            del loaded
+            np.save(path, np.zeros(3, dtype=np.int32))
+            with self.assertRaises(ValueError):
+                load_keys(path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,10 @@
 
 import unittest
 import numpy as np
+import tempfile
 import sys
 import os
+from unittest import mock
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
 
@@ -15,7 +17,13 @@ from game import Game
 class TestConnectFourGame(unittest.TestCase):
 
     def setUp(self):
-        self.game = Game()
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.directory.name, "cache.db")
+        self.game = Game(cache_path=self.cache_path)
+
+    def tearDown(self):
+        self.game.cache.close()
+        self.directory.cleanup()
 
     """
         Tests to check that the turns alternate between the player and the computer.
@@ -43,5 +51,54 @@ class TestConnectFourGame(unittest.TestCase):
                 self.game.board.drop_disc(j,1)
         self.assertTrue(self.game.board.is_board_full())
 
+    """
+        Tests to check that the game can be played on the bitboard backend.
+    """
+    def test_bitboard_backend(self):
+        game = Game("bitboard")
+        # The cache is only used when the game is given its file
+        self.assertIsNone(game.cache)
+        for i in range(3):
+            game.board.drop_disc(i, 1)
+        self.assertFalse(game.board.is_winner(1))
+        self.assertEqual(game.minimax.mini_max(game.board, -float('inf'), float('inf'), 2, 2)[0], 3)
+        game.board.drop_disc(3, 1)
+        self.assertTrue(game.board.is_winner(1))
+
+    """
+        Tests to check that a game on a wider board takes the player's moves up to its last column.
+    """
+    def test_geometry(self):
+        game = Game("bitboard", cache_path=None, geometry=(8, 7, 5))
+        self.assertEqual((game.board.WIDTH, game.board.HEIGHT, game.board.CONNECT), (8, 7, 5))
+        self.assertEqual((game.WIDTH, game.HEIGHT), (8, 7))
+        self.assertEqual((Game.WIDTH, Game.HEIGHT), (7, 6))
+        self.assertIsNone(game.book)
+        with mock.patch("builtins.input", side_effect=["8", "7"]), mock.patch("builtins.print"):
+            self.assertEqual(game.get_player_input(), 7)
+        for i in range(4):
+            game.board.drop_disc(i, 1)
+        self.assertFalse(game.board.is_winner(1))
+        game.DEPTH = 3
+        self.assertEqual(game.find_computer_move(1000)[0], 4)
+
+    """
+        Tests to check that the computer's move is stored in the cache and found by the next game.
+    """
+    def test_computer_move_cache(self):
+        self.game.DEPTH = 3
+        for move, disc in [(3, 1), (3, 2), (2, 1)]:
+            self.game.board.drop_disc(move, disc)
+        move = self.game.computer_move()
+        self.assertEqual(self.game.cache.lookup(self.game.board, self.game.computer_disc, 3)[0], move)
+        game = Game("bitboard", cache_path=self.cache_path)
+        game.DEPTH = 3
+        for move, disc in [(3, 1), (3, 2), (2, 1)]:
+            game.board.drop_disc(move, disc)
+        # The search would fail, so the move can only come from the cache
+        game.minimax = None
+        self.assertEqual(game.computer_move(), self.game.cache.lookup(self.game.board, self.game.computer_disc)[0])
+        game.cache.close()
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
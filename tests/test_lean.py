@@ -0,0 +1,137 @@
+import unittest
+import gc
+import pickle
+import tracemalloc
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from board import Board
+from bitboard import BitBoard
+from lean import LeanMiniMax
+from minimax import MiniMax
+from tablebase import won_score
+from transposition import TranspositionTable
+
+"""
+    The TestLeanMiniMax class.
+    The class that tests the LeanMiniMax class against the MiniMax class and
+    the memory it allocates.
+"""
+class TestLeanMiniMax(unittest.TestCase):
+
+    def setUp(self):
+        self.player_disc = 1
+        self.computer_disc = 2
+        self.positions = ["", "3342", "33421562", "334215624400"]
+
+    """
+        Tests to check that the scores are the scores of the MiniMax class, with and without a table.
+    """
+    def test_same_scores(self):
+        for moves in self.positions:
+            board, token = BitBoard.from_moves(moves, self.player_disc, self.computer_disc, 1)
+            for depth in range(1, 6):
+                expected = MiniMax(self.player_disc, self.computer_disc).mini_max(board.copy(), -float('inf'), float('inf'), depth, token)[1]
+                for table in [None, TranspositionTable(1 << 12)]:
+                    search = LeanMiniMax(self.player_disc, self.computer_disc, 6, table)
+                    move, score = search.search(board, token, depth)
+                    self.assertEqual(score, expected, (moves, depth))
+                    # The best move leads to the score
+                    board.drop_disc(move, token)
+                    child = MiniMax(self.player_disc, self.computer_disc).mini_max(board.copy(), -float('inf'), float('inf'), depth - 1, 3 - token, move)[1]
+                    board.undo_disc(move)
+                    self.assertEqual(child, score, (moves, depth))
+
+    """
+        Tests to check that a finished game has no move and that the board is left as it was.
+    """
+    def test_game_over(self):
+        board, token = BitBoard.from_moves("3434343", self.player_disc, self.computer_disc, 1)
+        search = LeanMiniMax(self.player_disc, self.computer_disc, 4)
+        move, score = search.search(board, token, 4)
+        self.assertIsNone(move)
+        self.assertEqual(score, won_score(board, 1))
+        board, token = BitBoard.from_moves("3342", self.player_disc, self.computer_disc, 1)
+        key = board.key()
+        search.search(board, token, 4)
+        self.assertEqual(board.key(), key)
+
+    """
+        Tests to check that a NumPy board is searched as a BitBoard.
+    """
+    def test_numpy_board(self):
+        board, token = BitBoard.from_moves("3342", self.player_disc, self.computer_disc, 1)
+        search = LeanMiniMax(self.player_disc, self.computer_disc, 4)
+        expected = search.search(board, token, 4)
+        self.assertEqual(search.search(Board(board.board, self.player_disc, self.computer_disc), token, 4), expected)
+
+    """
+        Tests to check that a search deeper than the buffers is refused.
+    """
+    def test_max_depth(self):
+        search = LeanMiniMax(self.player_disc, self.computer_disc, 3)
+        with self.assertRaises(ValueError):
+            search.search(BitBoard(None, self.player_disc, self.computer_disc), 1, 4)
+
+    """
+        Tests to check that the garbage collector is enabled again after the search, only if it was.
+    """
+    def test_gc_restored(self):
+        board, token = BitBoard.from_moves("3342", self.player_disc, self.computer_disc, 1)
+        search = LeanMiniMax(self.player_disc, self.computer_disc, 3)
+        enabled = gc.isenabled()
+        try:
+            gc.enable()
+            search.search(board, token, 3)
+            self.assertTrue(gc.isenabled())
+            gc.disable()
+            search.search(board, token, 3)
+            self.assertFalse(gc.isenabled())
+        finally:
+            if enabled:
+                gc.enable()
+
+    """
+        Tests to check that the boards keep their state in slots and still pickle.
+    """
+    def test_slots(self):
+        for cls in [BitBoard, BitBoard.with_geometry(8, 7, 5), BitBoard.with_weights([1, 10, 1000])]:
+            board, token = cls.from_moves("3342", self.player_disc, self.computer_disc, 1)
+            self.assertFalse(hasattr(board, "__dict__"))
+            copy = pickle.loads(pickle.dumps(board))
+            self.assertIs(type(copy), cls)
+            self.assertEqual((copy.key(), copy.score), (board.key(), board.score))
+
+    """
+        Tests to check that the memory of the search doesn't grow with its depth.
+        The nodes grow about tenfold every two plies, so an allocation kept per
+        node, or per node on the path, would show. Only the integers of the
+        frames on the path are alive at once, a few dozen bytes per ply.
+    """
+    def test_flat_allocations(self):
+        board, token = BitBoard.from_moves("3342", self.player_disc, self.computer_disc, 1)
+        search = LeanMiniMax(self.player_disc, self.computer_disc, 8)
+        # The first search warms up the interpreter
+        search.search(board, token, 8)
+        kept, peaks, nodes = [], [], []
+        tracemalloc.start()
+        try:
+            for depth in [2, 4, 6, 8]:
+                gc.collect()
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                search.search(board, token, depth)
+                current, peak = tracemalloc.get_traced_memory()
+                kept.append(current - before)
+                peaks.append(peak - before)
+                nodes.append(search.nodes)
+        finally:
+            tracemalloc.stop()
+        self.assertGreater(nodes[-1], 100 * nodes[0])
+        self.assertTrue(all(size <= kept[0] for size in kept), kept)
+        self.assertLess(peaks[-1] - peaks[0], 1024, peaks)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,6 +8,8 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "s
 
 from board import Board
 from minimax import MiniMax
+from stats import SearchStats
+from transposition import TranspositionTable
 
 """
     The TestMinimax class.
@@ -61,5 +63,119 @@ class TestMinimax(unittest.TestCase):
         best_move = self.minimax.mini_max(self.board, -float('inf'), float('inf'), self.depth, self.computer_disc)[0]
         self.assertIsNone(best_move)  # No valid move left
 
+    """
+        Tests to check that the bitboard backend chooses the same move.
+    """
+    def test_bitboard_backend(self):
+        for move, disc in [(3, 1), (4, 2), (3, 1), (2, 2)]:
+            self.board.drop_disc(move, disc)
+        bit_minimax = MiniMax(self.player_disc, self.computer_disc, "bitboard")
+        expected = self.minimax.mini_max(self.board, -float('inf'), float('inf'), self.depth, self.computer_disc)
+        result = bit_minimax.mini_max(self.board, -float('inf'), float('inf'), self.depth, self.computer_disc)
+        self.assertEqual(result, expected)
+
+    """
+        Tests to check that iterative deepening finds the score of the full depth search.
+    """
+    def test_iterative_deepening(self):
+        for move, disc in [(3, 1), (4, 2), (3, 1)]:
+            self.board.drop_disc(move, disc)
+        expected = self.minimax.mini_max(self.board, -float('inf'), float('inf'), self.depth, self.computer_disc)
+        move, score, depth = self.minimax.iterative_deepening(self.board, self.computer_disc, self.depth)
+        self.assertEqual(depth, self.depth)
+        self.assertEqual(score, expected[1])
+        self.assertIn(move, self.board.get_valid_moves())
+
+    """
+        Tests to check that iterative deepening stops at the time budget and leaves the board unchanged.
+    """
+    def test_iterative_deepening_budget(self):
+        before = self.board.board.copy()
+        move, _, depth = self.minimax.iterative_deepening(self.board, self.computer_disc, 42, 50)
+        self.assertGreaterEqual(depth, 1)
+        self.assertLess(depth, 42)
+        self.assertIn(move, self.board.get_valid_moves())
+        self.assertTrue(np.array_equal(self.board.board, before))
+
+    """
+        Tests to check that the killer moves and history don't change the score of the search.
+    """
+    def test_move_ordering(self):
+        for move, disc in [(3, 1), (4, 2), (3, 1), (2, 2)]:
+            self.board.drop_disc(move, disc)
+        static_minimax = MiniMax(self.player_disc, self.computer_disc, move_ordering=False)
+        expected = static_minimax.mini_max(self.board, -float('inf'), float('inf'), self.depth, self.computer_disc)
+        result = self.minimax.mini_max(self.board, -float('inf'), float('inf'), self.depth, self.computer_disc)
+        self.assertEqual(result[1], expected[1])
+        self.assertTrue(any(self.minimax.history[self.computer_disc]))
+        # The history order stays sorted by score
+        order = self.minimax.history_order[self.computer_disc]
+        scores = [self.minimax.history[self.computer_disc][move] for move in order]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    """
+        Tests to check that the threat pre-pass plays a winning move without searching the others.
+    """
+    def test_threats_win(self):
+        for move, disc in [(0, 2), (6, 1), (1, 2), (6, 1), (2, 2), (5, 1)]:
+            self.board.drop_disc(move, disc)
+        stats = SearchStats()
+        minimax = MiniMax(self.player_disc, self.computer_disc, stats=stats, threats=True)
+        best_move = minimax.mini_max(self.board, -float('inf'), float('inf'), self.depth, self.computer_disc)[0]
+        self.assertEqual(best_move, 3)
+        # The root and the winning move only
+        self.assertEqual(stats.nodes, 2)
+
+    """
+        Tests to check that the threat pre-pass only searches the block of a win of the opponent.
+    """
+    def test_threats_block(self):
+        for move, disc in [(0, 1), (6, 2), (1, 1), (6, 2), (2, 1)]:
+            self.board.drop_disc(move, disc)
+        stats = SearchStats()
+        minimax = MiniMax(self.player_disc, self.computer_disc, stats=stats, threats=True)
+        best_move = minimax.mini_max(self.board, -float('inf'), float('inf'), self.depth, self.computer_disc)[0]
+        self.assertEqual(best_move, 3)
+        self.assertEqual(stats.depth_nodes[self.depth - 1], 1)
+
+    """
+        Tests to check that the threat pre-pass leaves out a move right under a winning cell of the opponent.
+    """
+    def test_threats_under_threat(self):
+        # The player wins on the third row of column 3, right above its next disc
+        for move, disc in [(0, 1), (0, 2), (0, 1), (1, 2), (1, 1), (1, 1), (2, 1), (2, 2), (2, 1), (3, 2)]:
+            self.board.drop_disc(move, disc)
+        self.assertEqual(self.board.moves_under_threats(self.computer_disc), [3])
+        stats = SearchStats()
+        minimax = MiniMax(self.player_disc, self.computer_disc, stats=stats, threats=True)
+        best_move = minimax.mini_max(self.board, -float('inf'), float('inf'), self.depth, self.computer_disc)[0]
+        self.assertNotEqual(best_move, 3)
+        self.assertEqual(stats.depth_nodes[self.depth - 1], len(self.board.get_valid_moves()) - 1)
+
+    """
+        Tests to check that a position and its mirror share the entries of the table.
+    """
+    def test_mirror_table(self):
+        for move, disc in [(1, 1), (3, 2), (1, 1)]:
+            self.board.drop_disc(move, disc)
+        table = TranspositionTable(1 << 12)
+        minimax = MiniMax(self.player_disc, self.computer_disc, table=table)
+        move, score = minimax.mini_max(self.board, -float('inf'), float('inf'), self.depth, self.computer_disc)
+        mirror = Board(self.board.board[:, ::-1].copy(), self.player_disc, self.computer_disc)
+        self.assertEqual(minimax.mini_max(mirror, -float('inf'), float('inf'), self.depth, self.computer_disc), (self.WIDTH - 1 - move, score))
+        self.assertEqual(MiniMax(self.player_disc, self.computer_disc).mini_max(mirror, -float('inf'), float('inf'), self.depth, self.computer_disc)[1], score)
+
+    """
+        Tests to check that only half the moves of a symmetric position are searched.
+    """
+    def test_symmetric_root(self):
+        self.board.drop_disc(3, self.player_disc)
+        stats = SearchStats()
+        minimax = MiniMax(self.player_disc, self.computer_disc, stats=stats)
+        self.assertEqual(minimax.order_moves(self.board, self.computer_disc, self.depth), [3, 2, 1, 0])
+        move, _ = minimax.mini_max(self.board, -float('inf'), float('inf'), self.depth, self.computer_disc)
+        self.assertLessEqual(move, 3)
+        self.assertEqual(stats.depth_nodes[self.depth - 1], 4)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,68 @@
+import unittest
+import numpy as np
+import random
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from bitboard import BitBoard
+from minimax import MiniMax
+from parallel import ParallelMiniMax
+
+"""
+    The TestParallelMiniMax class.
+    The class that tests the ParallelMiniMax class.
+"""
+class TestParallelMiniMax(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.parallel = ParallelMiniMax(1, 2, workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.parallel.close()
+
+    def setUp(self):
+        self.player_disc = 1
+        self.computer_disc = 2
+        self.depth = 4
+        self.minimax = MiniMax(self.player_disc, self.computer_disc, "bitboard")
+
+    """
+        Tests to check that the parallel search chooses the same move as the serial search.
+    """
+    def test_same_move_as_serial(self):
+        rng = random.Random(0)
+        for _ in range(6):
+            board = BitBoard(None, self.player_disc, self.computer_disc)
+            disc = 1
+            for _ in range(rng.randint(0, 10)):
+                board.drop_disc(rng.choice(board.get_valid_moves()), disc)
+                disc = 3 - disc
+            self.minimax.clear_history()
+            expected = self.minimax.mini_max(board, -float('inf'), float('inf'), self.depth, disc)
+            self.assertEqual(self.parallel.mini_max(board, self.depth, disc)[0], expected[0])
+
+    """
+        Tests to check that the parallel search blocks the opponent's win.
+    """
+    def test_block_opponent_win(self):
+        board = BitBoard(None, self.player_disc, self.computer_disc)
+        for i in range(3):
+            board.drop_disc(i, self.player_disc)
+        self.assertEqual(self.parallel.mini_max(board, self.depth, self.computer_disc)[0], 3)
+
+    """
+        Tests to check that there is no move when the board is full.
+    """
+    def test_full_board(self):
+        board = BitBoard(None, self.player_disc, self.computer_disc)
+        for col in range(7):
+            for row in range(6):
+                board.drop_disc(col, 1 if (row + col) % 2 == 0 else 2)
+        self.assertIsNone(self.parallel.mini_max(board, self.depth, self.computer_disc)[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from bitboard import BitBoard
+from minimax import MiniMax
+from ponder import Ponderer
+from game import Game
+from transposition import TranspositionTable
+
+"""
+    The TestPonderer class.
+    The class that tests the Ponderer class.
+"""
+class TestPonderer(unittest.TestCase):
+
+    def setUp(self):
+        self.player_disc = 1
+        self.computer_disc = 2
+        self.depth = 4
+        self.board = BitBoard(None, self.player_disc, self.computer_disc)
+        for move, disc in [(3, 1), (2, 2)]:
+            self.board.drop_disc(move, disc)
+
+    """
+        Tests to check that every reply is searched to the full depth with the result of a search.
+    """
+    def test_ponder_replies(self):
+        ponderer = Ponderer(MiniMax(self.player_disc, self.computer_disc, "bitboard"), self.depth)
+        ponderer.start(self.board, self.player_disc)
+        ponderer.thread.join()
+        for move in self.board.get_valid_moves():
+            self.board.drop_disc(move, self.player_disc)
+            expected = MiniMax(self.player_disc, self.computer_disc, "bitboard").iterative_deepening(self.board, self.computer_disc, self.depth)
+            self.assertEqual(ponderer.lookup(self.board, self.computer_disc), expected)
+            self.board.undo_disc(move)
+        # The board of the game is left as it was
+        self.assertEqual(self.board.moves, 2)
+
+    """
+        Tests to check that the pondering stops at once and its result is then kept.
+    """
+    def test_stop(self):
+        ponderer = Ponderer(MiniMax(self.player_disc, self.computer_disc, "bitboard"), 42)
+        ponderer.start(self.board, self.player_disc)
+        time.sleep(0.05)
+        start = time.perf_counter()
+        ponderer.stop()
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertIsNone(ponderer.thread)
+        self.assertEqual(ponderer.results, {})
+        # A search after the stop isn't stopped
+        self.assertEqual(ponderer.minimax.iterative_deepening(self.board, self.computer_disc, 2)[2], 2)
+
+    """
+        Tests to check that stopping a pondering that already finished doesn't
+        stop the first search of the next one.
+    """
+    def test_stop_after_finish(self):
+        ponderer = Ponderer(MiniMax(self.player_disc, self.computer_disc, "bitboard"), self.depth)
+        replies = len(self.board.get_valid_moves())
+        for _ in range(2):
+            ponderer.start(self.board, self.player_disc)
+            ponderer.thread.join()
+            self.assertEqual(len(ponderer.results), replies)
+            ponderer.stop()
+            self.assertIsNone(ponderer.minimax.deadline)
+
+    """
+        Tests to check that the game plays the pondered move of the player's reply.
+    """
+    def test_game_ponder(self):
+        game = Game("bitboard", book_path=None, cache_path=None, ponder=True)
+        game.DEPTH = game.ponderer.depth = self.depth
+        for move, disc in [(3, 1), (2, 2)]:
+            game.board.drop_disc(move, disc)
+        game.ponderer.start(game.board, self.player_disc)
+        game.ponderer.thread.join()
+        game.board.drop_disc(4, self.player_disc)
+        move, score, depth, source = game.find_computer_move()
+        self.assertEqual(source, "ponder")
+        self.assertEqual(depth, self.depth)
+        self.assertIn(move, game.board.get_valid_moves())
+        # The pondering and the game share the table
+        self.assertIs(game.ponderer.minimax.table, game.minimax.table)
+        self.assertIsInstance(game.minimax.table, TranspositionTable)
+
+if __name__ == '__main__':
+    unittest.main()
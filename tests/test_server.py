@@ -0,0 +1,161 @@
+import unittest
+import asyncio
+import json
+import sys
+import os
+from concurrent.futures import Executor, Future
+from concurrent.futures.process import BrokenProcessPool
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from server import GameServer
+
+"""
+    The BrokenExecutor class.
+    An executor whose tasks all fail, as the pool of a server whose worker died.
+"""
+class BrokenExecutor(Executor):
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future = Future()
+        future.set_exception(BrokenProcessPool("A worker died"))
+        return future
+
+"""
+    The TestGameServer class.
+    The class that tests the GameServer class.
+"""
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = GameServer(port=0, workers=1, time_budget_ms=200, book_path=None, cache_path=None)
+        await self.server.start()
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", self.server.port)
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        await self.server.close()
+
+    """
+        Sends a request and reads its response.
+        @param request: the request.
+        @return: the response.
+    """
+    async def send(self, request: dict) -> dict:
+        self.writer.write((json.dumps(request) + "\n").encode())
+        await self.writer.drain()
+        return json.loads(await self.reader.readline())
+
+    """
+        Tests to check that a move of the player gets a move of the computer.
+    """
+    async def test_play_move(self):
+        game = await self.send({"op": "new", "id": 7})
+        self.assertEqual(game["id"], 7)
+        self.assertEqual(game["status"], "playing")
+        response = await self.send({"op": "move", "game": game["game"], "column": 3, "time_budget_ms": 100})
+        self.assertIn(response["computer_move"], range(7))
+        self.assertEqual(sum(cell != 0 for row in response["board"] for cell in row), 2)
+        state = await self.send({"op": "state", "game": game["game"]})
+        self.assertEqual(state["board"], response["board"])
+
+    """
+        Tests to check that the computer can play first.
+    """
+    async def test_computer_first(self):
+        game = await self.send({"op": "new", "computer_first": True})
+        self.assertIn(game["computer_move"], range(7))
+        self.assertEqual(sum(cell == 2 for row in game["board"] for cell in row), 1)
+        response = await self.send({"op": "move", "game": game["game"], "column": 0})
+        self.assertEqual(sum(cell != 0 for row in response["board"] for cell in row), 3)
+
+    """
+        Tests to check that invalid requests get an error and leave the game unchanged.
+    """
+    async def test_errors(self):
+        self.assertIn("error", await self.send({"op": "jump"}))
+        self.assertIn("error", await self.send({"op": "move", "game": 99, "column": 3}))
+        self.writer.write(b"not json\n")
+        self.assertIn("error", json.loads(await self.reader.readline()))
+        game = await self.send({"op": "new"})
+        self.assertIn("error", await self.send({"op": "move", "game": game["game"], "column": 7}))
+        self.assertIn("error", await self.send({"op": "move", "game": game["game"]}))
+        self.assertEqual((await self.send({"op": "state", "game": game["game"]}))["board"], game["board"])
+        self.assertEqual((await self.send({"op": "close", "game": game["game"]}))["status"], "closed")
+        self.assertIn("error", await self.send({"op": "state", "game": game["game"]}))
+
+    """
+        Tests to check that an invalid time budget or a boolean column gets an error before any disc is played.
+    """
+    async def test_invalid_request_values(self):
+        game = await self.send({"op": "new"})
+        for time_budget_ms in ["fast", None, True, -1]:
+            response = await self.send({"op": "move", "game": game["game"], "column": 3, "time_budget_ms": time_budget_ms})
+            self.assertIn("time budget", response["error"])
+        self.assertIn("column", (await self.send({"op": "move", "game": game["game"], "column": True}))["error"])
+        self.assertEqual((await self.send({"op": "state", "game": game["game"]}))["board"], game["board"])
+        self.assertIn("error", await self.send({"op": "new", "computer_first": True, "time_budget_ms": "fast"}))
+        self.assertEqual(len(self.server.sessions), 1)
+        response = await self.send({"op": "move", "game": game["game"], "column": 3, "time_budget_ms": 50})
+        self.assertEqual(sum(cell != 0 for row in response["board"] for cell in row), 2)
+
+    """
+        Tests to check that a move is refused when the workers and the queue are full.
+    """
+    async def test_busy(self):
+        game = await self.send({"op": "new"})
+        self.server.max_queue = 0
+        await self.server.slots.acquire()
+        response = await self.send({"op": "move", "game": game["game"], "column": 3})
+        self.assertIn("busy", response["error"])
+        self.server.slots.release()
+        # The refused move was taken back, so only the move played again is on the board
+        response = await self.send({"op": "move", "game": game["game"], "column": 3})
+        self.assertIn("computer_move", response)
+        self.assertEqual(sum(cell != 0 for row in response["board"] for cell in row), 2)
+
+    """
+        Tests to check that a new game whose first move is refused isn't kept.
+    """
+    async def test_busy_computer_first(self):
+        self.server.max_queue = 0
+        await self.server.slots.acquire()
+        response = await self.send({"op": "new", "computer_first": True})
+        self.assertIn("busy", response["error"])
+        self.assertEqual(self.server.sessions, {})
+        self.server.slots.release()
+        self.assertIn("computer_move", await self.send({"op": "new", "computer_first": True}))
+        self.assertEqual(len(self.server.sessions), 1)
+
+    """
+        Tests to check that a search that fails in its worker gets an error and the connection goes on.
+    """
+    async def test_broken_workers(self):
+        game = await self.send({"op": "new"})
+        executor, self.server.executor = self.server.executor, BrokenExecutor()
+        try:
+            response = await self.send({"op": "move", "game": game["game"], "column": 3})
+        finally:
+            self.server.executor = executor
+        self.assertIn("workers stopped", response["error"])
+        self.assertEqual((await self.send({"op": "state", "game": game["game"]}))["board"], game["board"])
+        self.assertIn("computer_move", await self.send({"op": "move", "game": game["game"], "column": 3}))
+
+    """
+        Tests to check that the games of a connection end when it closes.
+    """
+    async def test_connection_closed(self):
+        await self.send({"op": "new"})
+        await self.send({"op": "new"})
+        self.assertEqual(len(self.server.sessions), 2)
+        self.writer.close()
+        await self.writer.wait_closed()
+        for _ in range(100):
+            if not self.server.sessions:
+                break
+            await asyncio.sleep(0.01)
+        self.assertEqual(len(self.server.sessions), 0)
+
+if __name__ == '__main__':
+    unittest.main()
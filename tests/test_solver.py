@@ -0,0 +1,120 @@
+import unittest
+import numpy as np
+import random
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from board import Board
+from bitboard import BitBoard
+from solver import Solver
+
+"""
+    The TestSolver class.
+    The class that tests the Solver class.
+"""
+class TestSolver(unittest.TestCase):
+
+    def setUp(self):
+        self.player_disc = 1
+        self.computer_disc = 2
+        self.solver = Solver(1 << 16)
+
+    """
+        Plays a move string from the empty board, the first disc plays first.
+        @param moves: the columns played.
+        @return: the board and the disc to move.
+    """
+    def play(self, moves: str) -> tuple[BitBoard, int]:
+        board = BitBoard(None, self.player_disc, self.computer_disc)
+        disc = 1
+        for move in moves:
+            board.drop_disc(int(move), disc)
+            disc = 3 - disc
+        return board, disc
+
+    """
+        Scores a position by searching the whole game tree.
+        @param board: the board.
+        @param disc: the disc to move.
+        @return: the score.
+    """
+    def full_search(self, board: BitBoard, disc: int) -> int:
+        best = None
+        for move in board.get_valid_moves():
+            board.drop_disc(move, disc)
+            if board.is_winning_move(move):
+                score = (44 - board.moves) // 2
+            elif board.is_board_full():
+                score = 0
+            else:
+                score = -self.full_search(board, 3 - disc)
+            board.undo_disc(move)
+            best = score if best is None else max(best, score)
+        return best
+
+    """
+        Tests to check that a win on this move scores the most.
+    """
+    def test_immediate_win(self):
+        board, disc = self.play("010101")
+        self.assertEqual(self.solver.solve(board, disc), (0, 18))
+        self.assertEqual(self.solver.plies_to_end(18, board.moves), 1)
+
+    """
+        Tests to check that a game already won has no move.
+    """
+    def test_game_over(self):
+        board, disc = self.play("0101010")
+        self.assertEqual(self.solver.solve(board, disc), (None, -18))
+
+    """
+        Tests to check that the solver agrees with a search of the whole game tree.
+    """
+    def test_matches_full_search(self):
+        rng = random.Random(3)
+        solved = 0
+        while solved < 8:
+            board, disc = self.play("")
+            for _ in range(35):
+                move = rng.choice(board.get_valid_moves())
+                board.drop_disc(move, disc)
+                if board.is_winning_move(move):
+                    break
+                disc = 3 - disc
+            else:
+                move, score = Solver(1 << 12).solve(board, disc)
+                self.assertEqual(score, self.full_search(board, disc))
+                # The best move keeps the score
+                board.drop_disc(move, disc)
+                if not board.is_winning_move(move) and not board.is_board_full():
+                    self.assertEqual(-self.full_search(board, 3 - disc), score)
+                solved += 1
+
+    """
+        Tests to check that the NumPy board gets the same result.
+    """
+    def test_numpy_board(self):
+        board, disc = self.play("2135006402404100441215")
+        numpy_board = Board(board.board, self.player_disc, self.computer_disc)
+        self.assertEqual(self.solver.solve(numpy_board, disc), Solver(1 << 16).solve(board, disc))
+
+    """
+        Tests to check that a position and its mirror share their key in the table and their score.
+    """
+    def test_mirror(self):
+        moves = "2135006402404100441215"
+        board, disc = self.play(moves)
+        mirror, _ = self.play("".join(str(board.WIDTH - 1 - int(move)) for move in moves))
+        keys = [self.solver.table_key(position.discs[disc], position.discs[1] | position.discs[2]) for position in [board, mirror]]
+        self.assertEqual(keys[0], keys[1])
+        self.assertEqual(keys[0], min(position.discs[disc] + (position.discs[1] | position.discs[2]) for position in [board, mirror]))
+        move, score = self.solver.solve(board, disc)
+        nodes = self.solver.nodes
+        self.assertEqual(self.solver.solve(mirror, disc), (board.WIDTH - 1 - move, score))
+        # The mirror is solved from the entries of the position
+        self.assertLess(self.solver.nodes - nodes, nodes)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from board import Board
+from bitboard import BitBoard
+from minimax import MiniMax
+from stats import SearchStats
+
+"""
+    A BitBoard that counts the discs dropped on it.
+"""
+class CountingBoard(BitBoard):
+
+    drops: int = 0
+
+    def drop_disc(self, column: int, disc: int) -> None:
+        self.drops += 1
+        super().drop_disc(column, disc)
+
+"""
+    The TestSearchStats class.
+    The class that tests the SearchStats class.
+"""
+class TestSearchStats(unittest.TestCase):
+
+    def setUp(self):
+        self.player_disc = 1
+        self.computer_disc = 2
+        self.depth = 5
+
+    """
+        Tests to check that the stats don't change the result of the search.
+    """
+    def test_same_result(self):
+        board = Board(np.zeros((6, 7), dtype=np.uint8), self.player_disc, self.computer_disc)
+        board.drop_disc(3, self.player_disc)
+        expected = MiniMax(self.player_disc, self.computer_disc).mini_max(board, -float('inf'), float('inf'), self.depth, self.computer_disc)
+        stats = SearchStats()
+        result = MiniMax(self.player_disc, self.computer_disc, stats=stats).mini_max(board, -float('inf'), float('inf'), self.depth, self.computer_disc)
+        self.assertEqual(result, expected)
+        self.assertGreater(stats.nodes, 0)
+
+    """
+        Tests to check that every node, leaf and cutoff is counted.
+    """
+    def test_counters(self):
+        board = CountingBoard(None, self.player_disc, self.computer_disc)
+        stats = SearchStats()
+        MiniMax(self.player_disc, self.computer_disc, stats=stats).mini_max(board, -float('inf'), float('inf'), self.depth, self.computer_disc)
+        # Every node but the root is reached by dropping a disc
+        self.assertEqual(stats.nodes, board.drops + 1)
+        self.assertEqual(stats.nodes, sum(stats.depth_nodes.values()))
+        self.assertEqual(stats.depth_nodes[self.depth], 1)
+        # Nothing wins in five plies, so the leaves are the nodes of depth 0
+        self.assertEqual(stats.leaves, stats.depth_nodes[0])
+        self.assertGreater(stats.cutoffs, 0)
+        self.assertLessEqual(stats.first_move_cutoffs, stats.cutoffs)
+        # The empty board is its own mirror, so only the middle and the columns left of it are searched
+        self.assertEqual(stats.branching_factors()[self.depth], 4)
+        self.assertGreater(stats.winner_time, 0)
+        self.assertGreater(stats.evaluate_time, 0)
+
+    """
+        Tests to check that the children evaluated together are counted as leaves.
+    """
+    def test_batch_leaves(self):
+        board = Board(np.zeros((6, 7), dtype=np.uint8), self.player_disc, self.computer_disc)
+        board.drop_disc(0, self.player_disc)
+        stats = SearchStats()
+        MiniMax(self.player_disc, self.computer_disc, batch_leaves=True, stats=stats).mini_max(board, -float('inf'), float('inf'), 2, self.computer_disc)
+        self.assertEqual(stats.depth_nodes, {2: 1, 1: stats.depth_nodes[1], 0: 7 * stats.depth_nodes[1]})
+        self.assertEqual(stats.leaves, stats.depth_nodes[0])
+
+    """
+        Tests to check that the callbacks are called after each depth of the iterative deepening.
+    """
+    def test_callback(self):
+        board = BitBoard(None, self.player_disc, self.computer_disc)
+        reports = []
+        stats = SearchStats(lambda stats, depth: reports.append((depth, stats.nodes)))
+        MiniMax(self.player_disc, self.computer_disc, "bitboard", stats=stats).iterative_deepening(board, self.computer_disc, 3)
+        self.assertEqual([depth for depth, _ in reports], [1, 2, 3])
+        # The counters add up over the depths until they are cleared
+        self.assertEqual(reports[-1][1], stats.nodes)
+        self.assertLess(reports[0][1], reports[1][1])
+        stats.clear()
+        self.assertEqual(stats.summary()["nodes"], 0)
+        self.assertEqual(stats.first_move_cutoff_rate(), 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import unittest
+import tempfile
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from board import Board
+from bitboard import BitBoard
+from minimax import MiniMax
+from game import Game
+from solver import Solver
+from stats import SearchStats
+from tablebase import (CELLS, build_tablebase, metadata_path, open_tablebase, pack_entry, random_roots, score_bound, search_score,
+                       solve_endgames, unpack_entry, won_score, Tablebase)
+
+"""
+    The TestTablebase class.
+    The class that tests the endgame tablebase against the solver and its use by the search.
+"""
+class TestTablebase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "tablebase.npy")
+        cls.empty = 8
+        cls.roots = random_roots(4, cls.empty, 1)
+        cls.count = build_tablebase(cls.path, cls.roots, cls.empty)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def setUp(self):
+        self.player_disc = 1
+        self.computer_disc = 2
+        self.tablebase = Tablebase(self.path)
+
+    """
+        Tests to check that an entry packs and unpacks, with negative scores.
+    """
+    def test_pack_entry(self):
+        for move, score in [(0, 0), (6, 21), (3, -21), (5, -1)]:
+            entry = pack_entry(123456789 << 2 | 1, move, score)
+            self.assertEqual(unpack_entry(entry), (move, score))
+            self.assertEqual(entry >> 10, 123456789 << 2 | 1)
+
+    """
+        Tests to check that the file holds every solved position once, sorted, and is opened once per path.
+    """
+    def test_file(self):
+        self.assertEqual(len(self.tablebase), self.count)
+        self.assertEqual(len(self.tablebase), len(solve_endgames(self.roots, self.empty)))
+        self.assertTrue(all(self.tablebase.entries[:-1] < self.tablebase.entries[1:]))
+        self.assertEqual(self.tablebase.min_discs, CELLS - self.empty)
+        self.assertFalse(self.tablebase.covers(CELLS - self.empty - 1))
+        # The fewest discs are read from the metadata, or counted from the keys without it
+        self.assertTrue(os.path.exists(metadata_path(self.path)))
+        path = os.path.join(self.directory.name, "no_metadata.npy")
+        build_tablebase(path, self.roots, self.empty)
+        os.remove(metadata_path(path))
+        self.assertEqual(Tablebase(path).min_discs, CELLS - self.empty)
+        self.assertIs(open_tablebase(self.path), open_tablebase(self.path))
+        with self.assertRaises(ValueError):
+            solve_endgames(["33"], self.empty)
+
+    """
+        Tests to check that the entries along the lines of the roots are the results of the solver,
+        with either disc moving first, on both backends and mirrored.
+    """
+    def test_lookup(self):
+        solver = Solver(1 << 16)
+        for moves in self.roots:
+            for first_disc in [self.player_disc, self.computer_disc]:
+                board, token = BitBoard.from_moves(moves, self.player_disc, self.computer_disc, first_disc)
+                while True:
+                    entry = self.tablebase.lookup(board, token)
+                    self.assertIsNotNone(entry)
+                    move, score = entry
+                    self.assertEqual(score, solver.solve(board, token)[1])
+                    self.assertEqual(self.tablebase.lookup(Board(board.board, self.player_disc, self.computer_disc), token), entry)
+                    mirror = BitBoard(board.board[:, ::-1], self.player_disc, self.computer_disc)
+                    self.assertEqual(self.tablebase.lookup(mirror, token), (board.WIDTH - 1 - move, score))
+                    board.drop_disc(move, token)
+                    if board.is_winning_move(move) or board.is_board_full():
+                        break
+                    token = 3 - token
+        self.assertIsNone(self.tablebase.lookup(BitBoard(None, self.player_disc, self.computer_disc), self.player_disc))
+
+    """
+        Tests to check that the search returns the entry of a position of the tablebase
+        at once, scored past the bound of every heuristic score for a win or a loss.
+    """
+    def test_search(self):
+        for moves in self.roots:
+            board, token = BitBoard.from_moves(moves, self.player_disc, self.computer_disc, 1)
+            move, score = self.tablebase.lookup(board, token)
+            stats = SearchStats()
+            minimax = MiniMax(self.player_disc, self.computer_disc, "bitboard", threats=True, stats=stats, tablebase=self.tablebase)
+            self.assertEqual(minimax.mini_max(board, -float('inf'), float('inf'), 7, token), (move, search_score(board, token, score)))
+            self.assertEqual(stats.nodes, 1)
+        board, token = BitBoard.from_moves(self.roots[0], self.player_disc, self.computer_disc, 1)
+        self.assertEqual(search_score(board, self.computer_disc, 3), score_bound(board) + 3)
+        self.assertEqual(search_score(board, self.player_disc, 3), -score_bound(board) - 3)
+        self.assertEqual(search_score(board, self.player_disc, 0), 0)
+        # The bound is the score of a disc with every window of the board
+        self.assertEqual(score_bound(board), board.get_score(board.board_mask))
+
+    """
+        Tests to check that the children a batch of leaves would evaluate are looked up in the tablebase.
+    """
+    def test_batch_leaves(self):
+        for moves in self.roots:
+            # The position before the last move of the root, one of its children is in the tablebase
+            board, token = BitBoard.from_moves(moves[:-1], self.player_disc, self.computer_disc, 1)
+            expected = MiniMax(self.player_disc, self.computer_disc, "bitboard", tablebase=self.tablebase).mini_max(
+                board.copy(), -float('inf'), float('inf'), 1, token)
+            for backend in ["bitboard", "numpy"]:
+                minimax = MiniMax(self.player_disc, self.computer_disc, backend, batch_leaves=True, tablebase=self.tablebase)
+                self.assertEqual(minimax.mini_max(board.copy(), -float('inf'), float('inf'), 1, token), expected)
+
+    """
+        Tests to check that a proven loss ranks above a loss on the next move found by the search,
+        when it is the only move that doesn't lose at once.
+    """
+    def test_proven_loss(self):
+        # Every move but 3 lets the player connect four, and 3 loses later
+        moves = "1644403265502006412131441065156"
+        path = os.path.join(self.directory.name, "proven_loss.npy")
+        build_tablebase(path, [moves + "3"], CELLS - len(moves) - 1)
+        tablebase = Tablebase(path)
+        board, token = BitBoard.from_moves(moves, self.player_disc, self.computer_disc, 1)
+        self.assertEqual(token, self.computer_disc)
+        minimax = MiniMax(self.player_disc, self.computer_disc, "bitboard", tablebase=tablebase)
+        move, score = minimax.mini_max(board.copy(), -float('inf'), float('inf'), 2, token)
+        self.assertEqual(move, 3)
+        # Another move loses to the win of the player on the next move, which scores less
+        board.drop_disc(0, token)
+        win = board.winning_moves(self.player_disc)[0]
+        board.drop_disc(win, self.player_disc)
+        self.assertLess(won_score(board, self.player_disc), score)
+        board.undo_disc(win)
+        board.undo_disc(0)
+        board.drop_disc(3, token)
+        self.assertEqual(score, search_score(board, self.player_disc, tablebase.lookup(board, self.player_disc)[1]))
+
+    """
+        Tests to check that the game plays the move of the tablebase.
+    """
+    def test_game(self):
+        game = Game("bitboard", None, None, tablebase_path=self.path)
+        game.board, token = BitBoard.from_moves(self.roots[0], self.player_disc, self.computer_disc, self.computer_disc)
+        move, score = self.tablebase.lookup(game.board, self.computer_disc)
+        self.assertEqual(token, self.computer_disc)
+        self.assertEqual(game.find_computer_move(), (move, search_score(game.board, self.computer_disc, score), None, "tablebase"))
+        self.assertIsNone(Game("bitboard", None, None, geometry=(8, 7, 4), tablebase_path=self.path).tablebase)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import tempfile
+import json
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from tournament import Engine, init_worker, iter_tournament, load_log, make_openings, run_tournament, schedule_games, summarize, wilson_interval
+import tournament
+
+"""
+    The TestTournament class.
+    The class that tests the self-play tournaments.
+"""
+class TestTournament(unittest.TestCase):
+
+    """
+        Tests to check the Wilson interval against known values and its edge cases.
+    """
+    def test_wilson_interval(self):
+        low, high = wilson_interval(5, 10)
+        self.assertAlmostEqual(low, 0.2366, places=4)
+        self.assertAlmostEqual(high, 0.7634, places=4)
+        low, high = wilson_interval(0, 10)
+        self.assertEqual(low, 0.0)
+        self.assertAlmostEqual(high, 0.2775, places=4)
+        self.assertEqual(wilson_interval(0, 0), (0.0, 1.0))
+
+    """
+        Tests to check that the wins, draws, losses and latencies are summed up for each engine.
+    """
+    def test_summarize(self):
+        records = [{"game": 0, "first": "a", "second": "b", "result": 1, "moves": "", "searches": [4, 3], "ms": [8.0, 3.0]},
+                   {"game": 1, "first": "b", "second": "a", "result": 0, "moves": "", "searches": [5, 5], "ms": [5.0, 2.0]},
+                   {"game": 2, "first": "a", "second": "b", "result": 2, "moves": "", "searches": [2, 2], "ms": [2.0, 2.0]}]
+        summary = summarize(records)
+        self.assertEqual((summary["a"]["wins"], summary["a"]["draws"], summary["a"]["losses"]), (1, 1, 1))
+        self.assertEqual((summary["b"]["wins"], summary["b"]["draws"], summary["b"]["losses"]), (1, 1, 1))
+        self.assertEqual(summary["a"]["score"], 0.5)
+        self.assertAlmostEqual(summary["a"]["ms_per_move"], 12.0 / 11)
+        self.assertEqual(summary["a"]["win_rate_interval"], wilson_interval(1, 3))
+
+    """
+        Tests to check that each opening is played by each pair of engines with both engines first.
+    """
+    def test_schedule(self):
+        openings = make_openings(5, 2, seed=1)
+        self.assertEqual(len(set(openings)), 5)
+        games = schedule_games(3, openings)
+        self.assertEqual(len(games), 3 * 5 * 2)
+        self.assertEqual([game[0] for game in games], list(range(len(games))))
+        for first, second in [(0, 1), (1, 0), (0, 2), (2, 0), (1, 2), (2, 1)]:
+            self.assertEqual(sorted(game[3] for game in games if game[1:3] == (first, second)), sorted(openings))
+
+    """
+        Tests to check that an engine is parsed from the command line and plays on a board with its weights.
+    """
+    def test_engine(self):
+        engine = Engine.parse("tuned:depth=3,weights=10/200/10000,threats=0,time=50")
+        self.assertEqual((engine.name, engine.depth, engine.weights, engine.threats, engine.time_budget_ms), ("tuned", 3, [10, 200, 10000], False, 50))
+        with self.assertRaises(ValueError):
+            Engine.parse("bad:speed=3")
+        init_worker([Engine("plain", 2), engine], (7, 6, 4), None)
+        self.assertEqual(tournament.worker_board_classes[0].weights, [10, 100, 10000])
+        self.assertEqual(tournament.worker_board_classes[1].weights, [10, 200, 10000])
+
+    """
+        Tests to check that the games are the same with workers, and that the deeper engine scores better.
+    """
+    def test_tournament(self):
+        engines = [Engine("shallow", 1), Engine("deep", 4)]
+        serial = sorted(iter_tournament(engines, 3, 1, opening_plies=2, table_size=1 << 10), key=lambda record: record["game"])
+        parallel = sorted(iter_tournament(engines, 3, 2, opening_plies=2, table_size=1 << 10), key=lambda record: record["game"])
+        self.assertEqual([(record["result"], record["moves"]) for record in serial], [(record["result"], record["moves"]) for record in parallel])
+        summary = summarize(serial)
+        self.assertEqual(summary["deep"]["games"], 6)
+        self.assertGreater(summary["deep"]["score"], summary["shallow"]["score"])
+        for record in serial:
+            self.assertEqual(sum(record["searches"]), len(record["moves"]) - 2)
+
+    """
+        Tests to check that each game is appended to the log as one JSON line.
+    """
+    def test_log(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tournament.jsonl")
+            summary = run_tournament([Engine("a", 1), Engine("b", 2)], path, 2, 1, table_size=1 << 10)
+            with open(path) as log:
+                lines = log.read().splitlines()
+            self.assertEqual(len(lines), 4)
+            self.assertNotIn(" ", lines[0])
+            self.assertEqual([json.loads(line) for line in lines], load_log(path))
+            self.assertEqual(summarize(load_log(path)), summary)
+            with self.assertRaises(ValueError):
+                run_tournament([Engine("a", 1), Engine("a", 2)], path, 2, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+import numpy as np
+import random
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from board import Board
+from bitboard import BitBoard
+from minimax import MiniMax
+from transposition import TranspositionTable, EXACT, LOWER, UPPER
+
+"""
+    The TestTranspositionTable class.
+    The class that tests the TranspositionTable class.
+"""
+class TestTranspositionTable(unittest.TestCase):
+
+    def setUp(self):
+        self.player_disc = 1
+        self.computer_disc = 2
+        self.depth = 4
+
+    """
+        Tests to check that a stored entry is found and counted as a hit.
+    """
+    def test_store_and_probe(self):
+        table = TranspositionTable(16)
+        self.assertIsNone(table.probe(5))
+        table.store(5, 3, 42, EXACT, 2)
+        self.assertEqual(table.probe(5), (5, 3, 42, EXACT, 2))
+        self.assertEqual(table.stats(), {"hits": 1, "misses": 1, "collisions": 0, "entries": 1})
+
+    """
+        Tests to check that the depth-preferred policy keeps the deeper entry.
+    """
+    def test_depth_preferred(self):
+        table = TranspositionTable(1, "depth")
+        table.store(5, 4, 1, LOWER, 0)
+        table.store(21, 2, 2, UPPER, 1)
+        self.assertIsNone(table.probe(21))
+        self.assertEqual(table.collisions, 1)
+        self.assertEqual(table.probe(5)[1], 4)
+        table.store(21, 6, 2, UPPER, 1)
+        self.assertEqual(table.probe(21)[1], 6)
+        self.assertEqual(len(table), 1)
+
+    """
+        Tests to check that the two-tier policy keeps both entries of a slot.
+    """
+    def test_two_tier(self):
+        table = TranspositionTable(1, "two-tier")
+        table.store(5, 4, 1, LOWER, 0)
+        table.store(21, 2, 2, UPPER, 1)
+        self.assertIsNotNone(table.probe(5))
+        self.assertIsNotNone(table.probe(21))
+        table.store(37, 1, 3, EXACT, 2)
+        self.assertIsNone(table.probe(21))
+        self.assertEqual(table.probe(5)[1], 4)
+        self.assertEqual(len(table), 2)
+
+    """
+        Tests to check that the table can't grow past its size.
+    """
+    def test_bounded(self):
+        table = TranspositionTable(8, "two-tier")
+        for key in range(100):
+            table.store(key, key % 5, 0, EXACT, 0)
+        self.assertLessEqual(len(table), 16)
+
+    """
+        Tests to check that both boards have the same key and that keys are unique.
+    """
+    def test_keys(self):
+        keys = {}
+        rng = random.Random(0)
+        for _ in range(200):
+            bit_board = BitBoard(None, self.player_disc, self.computer_disc)
+            for _ in range(rng.randint(0, 12)):
+                bit_board.drop_disc(rng.choice(bit_board.get_valid_moves()), rng.randint(1, 2))
+            numpy_board = Board(bit_board.board, self.player_disc, self.computer_disc)
+            self.assertEqual(numpy_board.key(), bit_board.key())
+            grid = bit_board.board.tobytes()
+            self.assertEqual(keys.setdefault(bit_board.key(), grid), grid)
+
+    """
+        Tests to check that the search finds the same score with a table.
+    """
+    def test_same_score(self):
+        rng = random.Random(1)
+        hits = 0
+        for _ in range(5):
+            board = BitBoard(None, self.player_disc, self.computer_disc)
+            disc = 1
+            for _ in range(rng.randint(0, 8)):
+                board.drop_disc(rng.choice(board.get_valid_moves()), disc)
+                disc = 3 - disc
+            if board.is_winner(1) or board.is_winner(2):
+                continue
+            expected = MiniMax(self.player_disc, self.computer_disc).mini_max(board, -float('inf'), float('inf'), self.depth, disc)
+            table = TranspositionTable(1 << 12)
+            minimax = MiniMax(self.player_disc, self.computer_disc, table=table)
+            self.assertEqual(minimax.mini_max(board, -float('inf'), float('inf'), self.depth, disc)[1], expected[1])
+            hits += table.hits
+        self.assertGreater(hits, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import numpy as np
+import random
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from board import Board
+from minimax import MiniMax
+from vectorized import evaluate_boards, evaluate_children
+
+"""
+    The TestVectorized class.
+    The class that tests the vectorized evaluation.
+"""
+class TestVectorized(unittest.TestCase):
+
+    def setUp(self):
+        self.player_disc = 1
+        self.computer_disc = 2
+        self.WIDTH = 7
+        self.HEIGHT = 6
+        self.depth = 4
+
+    """
+        Plays random moves on an empty board.
+        @param rng: the random generator.
+        @param moves: the number of moves to play.
+        @return: the board.
+    """
+    def random_board(self, rng: random.Random, moves: int) -> Board:
+        board = Board(np.zeros((self.HEIGHT, self.WIDTH), dtype=np.uint8), self.player_disc, self.computer_disc)
+        disc = 1
+        for _ in range(moves):
+            board.drop_disc(rng.choice(board.get_valid_moves()), disc)
+            disc = 3 - disc
+        return board
+
+    """
+        Tests to check that a stack of boards gets the same scores as Board.evaluate.
+    """
+    def test_evaluate_boards(self):
+        rng = random.Random(0)
+        boards = [self.random_board(rng, rng.randint(0, 42)) for _ in range(50)]
+        scores = evaluate_boards(np.stack([board.board for board in boards]), self.player_disc, self.computer_disc)
+        self.assertEqual(list(scores), [board.evaluate() for board in boards])
+
+    """
+        Tests to check that the children get the same scores as playing each move.
+    """
+    def test_evaluate_children(self):
+        rng = random.Random(1)
+        for _ in range(20):
+            board = self.random_board(rng, rng.randint(0, 30))
+            moves = board.get_valid_moves()
+            expected = []
+            for move in moves:
+                board.drop_disc(move, 2)
+                expected.append(board.evaluate())
+                board.undo_disc(move)
+            self.assertEqual(list(evaluate_children(board, moves, 2)), expected)
+
+    """
+        Tests to check that the search finds the same move and score with batched leaves.
+    """
+    def test_batch_leaves(self):
+        rng = random.Random(2)
+        for _ in range(5):
+            board = self.random_board(rng, rng.randint(0, 10))
+            expected = MiniMax(self.player_disc, self.computer_disc).mini_max(board, -float('inf'), float('inf'), self.depth, self.computer_disc)
+            result = MiniMax(self.player_disc, self.computer_disc, batch_leaves=True).mini_max(board, -float('inf'), float('inf'), self.depth, self.computer_disc)
+            self.assertEqual(result, expected)
+
+if __name__ == '__main__':
+    unittest.main()
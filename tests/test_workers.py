@@ -0,0 +1,68 @@
+import unittest
+import subprocess
+import tempfile
+import sys
+import os
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC)
+
+import numpy as np
+
+from book import build_book, open_book
+from workers import preload_backend, worker_context
+
+"""
+    Gets the modules of a worker process that the tests look for.
+    @param _: the task, unused.
+    @return: whether SciPy and the search are imported.
+"""
+def imported_modules(_) -> tuple[bool, bool]:
+    return "scipy.signal" in sys.modules, "minimax" in sys.modules
+
+"""
+    The TestWorkers class.
+    The class that tests the start of the program and of the worker processes.
+"""
+class TestWorkers(unittest.TestCase):
+
+    """
+        Tests to check that the game and the bitboard search start without importing SciPy.
+    """
+    def test_startup_without_scipy(self):
+        for module in ["game", "bitboard", "minimax", "server"]:
+            code = f"import sys; import {module}; print('scipy' in sys.modules)"
+            output = subprocess.run([sys.executable, "-c", code], cwd=SRC, capture_output=True, text=True, check=True).stdout
+            self.assertEqual(output.strip(), "False", module)
+
+    """
+        Tests to check that the NumPy board imports SciPy on its first convolution.
+    """
+    def test_numpy_board_imports_scipy(self):
+        code = ("import sys, numpy as np; from board import Board; board = Board(np.zeros((6, 7), dtype=np.uint8), 1, 2); "
+                "before = 'scipy' in sys.modules; board.drop_disc(3, 1); print(before, board.is_winner(1), 'scipy' in sys.modules)")
+        output = subprocess.run([sys.executable, "-c", code], cwd=SRC, capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.split(), ["False", "False", "True"])
+
+    """
+        Tests to check that forked workers start with the modules preloaded by their parent.
+    """
+    @unittest.skipUnless(worker_context().get_start_method() == "fork", "Workers aren't forked on this platform")
+    def test_workers_start_preloaded(self):
+        preload_backend("numpy")
+        with worker_context().Pool(2) as pool:
+            self.assertEqual(pool.map(imported_modules, range(2)), [(True, True)] * 2)
+
+    """
+        Tests to check that a book file is mapped once per process.
+    """
+    def test_open_book_once(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "book.npy")
+            build_book(path, 1, 2, 1)
+            book = open_book(path)
+            self.assertIs(open_book(os.path.join(directory, ".", "book.npy")), book)
+            self.assertEqual(len(book), len(np.load(path)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import sys
+import os
+import argparse
+import json
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from minimax import MiniMax
+from batch import parse_position
+from stats import SearchStats
+from transposition import TranspositionTable
+
+"""
+    The benchmark of the search on fixed sets of positions.
+
+    Each position is a move string from the empty board with disc 1 playing
+    first, none of them won. Each set is searched to its own depth with the
+    iterative deepening, so the time to reach each depth is measured on the way.
+    The results can be written as JSON and compared with a stored baseline, to
+    gate changes of the engine on performance. A baseline is only comparable
+    on the same machine.
+"""
+
+# The positions of each set and the depth they are searched to.
+POSITION_SETS : dict[str, tuple[int, list[str]]] = {
+    "opening": (9, ["", "3", "33", "3324", "2344"]),
+    "midgame": (10, ["311323133235", "344411334133", "23222133413322134044", "32144133124124413125"]),
+    "endgame": (18, ["145232215553422334112331", "452422135455444000212216",
+                     "134114232152215332102306", "151151324255112420300405"]),
+}
+
+"""
+    Parses the size of the transposition table of the command line.
+    @param value: the number of slots, "0" or "none" for no table.
+    @return: the number of slots, None for no table.
+    @raises argparse.ArgumentTypeError: if the value isn't a number of slots.
+"""
+def parse_table_size(value: str) -> int:
+    if value.lower() == "none":
+        return None
+    if not value.isdigit():
+        raise argparse.ArgumentTypeError(f"{value} isn't a number of slots")
+    return int(value) or None
+
+"""
+    Searches one position.
+    @param moves: the move string of the position.
+    @param depth: the depth of the search.
+    @param backend: the backend the position is searched on.
+    @param table_size: the number of slots of the transposition table, None for no table.
+    @param threats: whether the search uses the threat pre-pass.
+    @return: the best move, score, nodes, time and time to each depth of the search.
+"""
+def run_position(moves: str, depth: int, backend: str, table_size: int, threats: bool) -> dict:
+    board, token = parse_position(moves, 1, 2, backend, 1)
+    time_to_depth = {}
+    stats = SearchStats(lambda stats, depth: time_to_depth.__setitem__(str(depth), time.perf_counter() - start))
+    table = TranspositionTable(table_size) if table_size is not None else None
+    minimax = MiniMax(1, 2, backend, table, batch_leaves=backend == "numpy", stats=stats, threats=threats)
+    start = time.perf_counter()
+    best_move, score, _ = minimax.iterative_deepening(board, token, depth)
+    seconds = time.perf_counter() - start
+    return {"moves": moves, "depth": depth, "best_move": best_move, "score": score, "nodes": stats.nodes,
+            "seconds": seconds, "nodes_per_second": stats.nodes / seconds, "time_to_depth": time_to_depth}
+
+"""
+    Runs the benchmark.
+    @param sets: the names of the position sets to run.
+    @param backend: the backend the positions are searched on.
+    @param table_size: the number of slots of the transposition table, None for no table.
+    @param repeat: the number of runs of each position, the fastest is kept.
+    @param threats: whether the search uses the threat pre-pass.
+    @param depth: the depth every set is searched to, None for the depth of each set.
+    @return: the results of each position and the totals of each set.
+"""
+def run_benchmark(sets: list[str], backend: str = "bitboard", table_size: int = 1 << 18, repeat: int = 1, threats: bool = False,
+                  depth: int = None) -> dict:
+    results = {"backend": backend, "table_size": table_size, "threats": threats, "positions": {}, "sets": {}}
+    for name in sets:
+        set_depth, positions = POSITION_SETS[name]
+        if depth is not None:
+            set_depth = depth
+        runs = []
+        for moves in positions:
+            run = min((run_position(moves, set_depth, backend, table_size, threats) for _ in range(repeat)), key=lambda x: x["seconds"])
+            runs.append(run)
+            print(f"{name} '{moves}': depth {set_depth}, move {run['best_move']}, {run['nodes']} nodes "
+                  f"in {run['seconds']:.3f} seconds ({run['nodes_per_second']:.0f} nodes/s)")
+        nodes = sum(run["nodes"] for run in runs)
+        seconds = sum(run["seconds"] for run in runs)
+        results["positions"][name] = runs
+        results["sets"][name] = {"depth": set_depth, "nodes": nodes, "seconds": seconds, "nodes_per_second": nodes / seconds}
+        print(f"{name}: {nodes} nodes in {seconds:.3f} seconds ({nodes / seconds:.0f} nodes/s)")
+    return results
+
+"""
+    Compares results with a baseline.
+    A set regresses when its nodes per second drop or its time grows by more
+    than the threshold. A position whose best move or node count changed is
+    flagged too, as the search no longer does the same work.
+    @param results: the results of run_benchmark.
+    @param baseline: the results of an earlier run.
+    @param threshold: the relative change allowed, 0.1 for 10%.
+    @return: the regressions and the changes found.
+"""
+def compare(results: dict, baseline: dict, threshold: float = 0.1) -> tuple[list[str], list[str]]:
+    regressions, changes = [], []
+    for name, totals in results["sets"].items():
+        if name not in baseline["sets"]:
+            continue
+        old = baseline["sets"][name]
+        if totals["nodes_per_second"] < old["nodes_per_second"] * (1 - threshold):
+            regressions.append(f"{name}: {totals['nodes_per_second']:.0f} nodes/s, was {old['nodes_per_second']:.0f}")
+        if totals["seconds"] > old["seconds"] * (1 + threshold):
+            regressions.append(f"{name}: {totals['seconds']:.3f} seconds, was {old['seconds']:.3f}")
+        old_runs = {run["moves"]: run for run in baseline["positions"][name]}
+        for run in results["positions"][name]:
+            old_run = old_runs.get(run["moves"])
+            if old_run is None or old_run["depth"] != run["depth"]:
+                continue
+            if old_run["best_move"] != run["best_move"]:
+                changes.append(f"{name} '{run['moves']}': best move {run['best_move']}, was {old_run['best_move']}")
+            if old_run["nodes"] != run["nodes"]:
+                changes.append(f"{name} '{run['moves']}': {run['nodes']} nodes, was {old_run['nodes']}")
+    return regressions, changes
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks the search on fixed sets of positions.")
+    parser.add_argument("--sets", nargs="+", choices=list(POSITION_SETS), default=list(POSITION_SETS), help="the position sets to run")
+    parser.add_argument("--backend", default="bitboard", help="the backend of the search, \"numpy\" or \"bitboard\"")
+    parser.add_argument("--table-size", type=parse_table_size, default=1 << 18,
+                        help="the number of slots of the transposition table, 0 or \"none\" to search without one")
+    parser.add_argument("--depth", type=int, help="the depth every set is searched to, instead of the depth of each set")
+    parser.add_argument("--repeat", type=int, default=3, help="the number of runs of each position, the fastest is kept")
+    parser.add_argument("--threats", action="store_true", help="search with the threat pre-pass, as the game does")
+    parser.add_argument("--output", help="the JSON file the results are written to")
+    parser.add_argument("--baseline", help="a JSON file of earlier results to compare with")
+    parser.add_argument("--threshold", type=float, default=0.1, help="the relative slowdown allowed against the baseline")
+    args = parser.parse_args()
+    results = run_benchmark(args.sets, args.backend, args.table_size, args.repeat, args.threats, args.depth)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions, changes = compare(results, json.load(file), args.threshold)
+        for change in changes:
+            print(f"Changed: {change}")
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regression")
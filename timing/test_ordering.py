@@ -0,0 +1,46 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from minimax import MiniMax
+from bitboard import BitBoard
+
+"""
+    A BitBoard that counts the moves played on it, one for each node searched.
+"""
+class CountingBoard(BitBoard):
+
+    nodes: int = 0
+
+    def drop_disc(self, column: int, disc: int) -> None:
+        self.nodes += 1
+        super().drop_disc(column, disc)
+
+# The empty board of test_time.py and a few positions after some moves.
+POSITIONS : list[str] = ["", "33", "3324", "332415", "33241502"]
+
+"""
+    Displays the number of nodes searched with the static order
+    and with the killer moves and history.
+"""
+def count_nodes(depth: int = 8):
+    total_before, total_after = 0, 0
+    for moves in POSITIONS:
+        counts = []
+        for move_ordering in [False, True]:
+            board = CountingBoard(None, 1, 2)
+            disc = 1
+            for move in moves:
+                board.drop_disc(int(move), disc)
+                disc = 3 - disc
+            board.nodes = 0
+            MiniMax(1, 2, move_ordering=move_ordering).mini_max(board, -float('inf'), float('inf'), depth, disc)
+            counts.append(board.nodes)
+        total_before += counts[0]
+        total_after += counts[1]
+        print(f"Position '{moves}': {counts[0]} nodes before, {counts[1]} nodes after ({counts[1] / counts[0]:.0%})")
+    print(f"Total: {total_before} nodes before, {total_after} nodes after ({total_after / total_before:.0%})")
+
+if __name__ == "__main__":
+    count_nodes()
@@ -0,0 +1,41 @@
+import sys
+import os
+import subprocess
+import multiprocessing
+import time
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC)
+
+from batch import analyse_position, init_worker
+from workers import preload_backend, worker_context
+
+"""
+    Displays the time to import each entry point in a new interpreter, and
+    whether it imported SciPy, then the time of a first analysis with workers
+    started with spawn and with the context of the pools.
+"""
+def time_imports(modules: list[str] = ["bitboard", "minimax", "game", "server", "board"]):
+    for module in modules:
+        code = f"import sys, time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start, 'scipy' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", code], cwd=SRC, capture_output=True, text=True, check=True).stdout.split()
+        print(f"import {module}: {float(output[0]):.3f} seconds, SciPy imported: {output[1]}")
+
+"""
+    Displays the time to start workers and analyse a few positions on the
+    numpy backend, whose search needs SciPy, with workers started with spawn
+    and with the context of the pools.
+"""
+def time_workers(workers: int = 2):
+    positions = ["33", "3324", "2344", "3342"] * workers
+    settings = (1, 2, "numpy", 1, 1, None)
+    for context in [multiprocessing.get_context("spawn"), worker_context()]:
+        start_time = time.perf_counter()
+        preload_backend("numpy")
+        with context.Pool(workers, initializer=init_worker, initargs=settings) as pool:
+            pool.map(analyse_position, positions, 1)
+        print(f"Workers started with {context.get_start_method()}: {time.perf_counter() - start_time:.3f} seconds to start and analyse")
+
+if __name__ == "__main__":
+    time_imports()
+    time_workers()
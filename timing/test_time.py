@@ -8,19 +8,26 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "s
 
 from minimax import MiniMax
 from board import Board
+from stats import SearchStats
 
 """
-    Displays the time of the minimax to search through the search tree.
+    Displays the time of the minimax to search through the search tree,
+    with the nodes searched and the share of the time in evaluate and the win checks.
 """
 def time_minimax():
     board = Board(np.zeros((6, 7), dtype=np.uint8), 1, 2)
-    minimax = MiniMax(1, 2)
+    stats = SearchStats()
+    minimax = MiniMax(1, 2, stats=stats)
     depths = [depth for depth in range(1, 16)]
     for depth in depths:
+        stats.clear()
         start_time = time.time()
         minimax.mini_max(board, -float('inf'), float('inf'), depth, 2)
         end_time = time.time()
-        print(f"Depth {depth}: {end_time - start_time:.4f} seconds")
+        elapsed = end_time - start_time
+        print(f"Depth {depth}: {elapsed:.4f} seconds, {stats.nodes} nodes ({stats.nodes / elapsed:.0f} nodes/s), "
+              f"first move cutoffs {stats.first_move_cutoff_rate():.0%}, "
+              f"evaluate {stats.evaluate_time / elapsed:.0%}, win checks {stats.winner_time / elapsed:.0%}")
 
 if __name__ == "__main__":
     time_minimax()
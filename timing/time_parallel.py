@@ -0,0 +1,37 @@
+import sys
+import os
+import numpy as np
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from minimax import MiniMax
+from parallel import ParallelMiniMax
+from bitboard import BitBoard
+
+"""
+    Displays the speedup of the parallel search for each number of workers
+    against the serial search at the same depth.
+"""
+def time_parallel(depth: int = 9):
+    board = BitBoard(np.zeros((6, 7), dtype=np.uint8), 1, 2)
+    for move, disc in [(3, 1), (3, 2), (2, 1), (4, 2)]:
+        board.drop_disc(move, disc)
+    minimax = MiniMax(1, 2, "bitboard")
+    start_time = time.perf_counter()
+    serial_move, _ = minimax.mini_max(board, -float('inf'), float('inf'), depth, 1 if board.moves % 2 else 2)
+    serial_time = time.perf_counter() - start_time
+    print(f"Serial: {serial_time:.4f} seconds, move {serial_move}")
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        with ParallelMiniMax(1, 2, workers) as parallel:
+            # Starts the workers before timing
+            parallel.mini_max(board, 1, 2)
+            start_time = time.perf_counter()
+            move, _ = parallel.mini_max(board, depth, 1 if board.moves % 2 else 2)
+            parallel_time = time.perf_counter() - start_time
+        print(f"Workers {workers}: {parallel_time:.4f} seconds, speedup {serial_time / parallel_time:.2f}x, move {move}")
+        workers *= 2
+
+if __name__ == "__main__":
+    time_parallel()